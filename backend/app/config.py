@@ -11,14 +11,57 @@ class Settings(BaseSettings):
     
     # Chroma Vector Store
     CHROMA_DIR: str = str(BASE_DIR.parent / "data" / "chroma_store")
+    # How often the in-process chunk count is re-read from Chroma (picks up ingests from other processes)
+    COLLECTION_COUNT_REFRESH_SECONDS: int = 60
     
     # Embedding Model (local sentence-transformers)
     EMBEDDING_MODEL: str = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+
+    # Embedding backend: "torch" (full precision PyTorch) or "onnx" (ONNX Runtime)
+    EMBEDDING_BACKEND: str = "torch"
+    # int8 dynamic quantization for the ONNX backend: "", "avx512_vnni", "avx2" or "arm64"
+    EMBEDDING_ONNX_QUANTIZATION: str = ""
+    # Where locally exported/quantized ONNX models are kept
+    EMBEDDING_ONNX_DIR: str = str(BASE_DIR.parent / "data" / "onnx_models")
+
+    # Query embedding cache (EMBEDDING_CACHE_PATH empty = in-memory only)
+    EMBEDDING_CACHE_SIZE: int = 2048
+    EMBEDDING_CACHE_TTL_SECONDS: int = 3600
+    EMBEDDING_CACHE_PATH: str = ""
+
+    # Micro-batching of concurrent embed calls
+    EMBEDDING_BATCHING_ENABLED: bool = True
+    EMBEDDING_BATCH_MAX_SIZE: int = 32
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0
     
     # LLM Configuration (Ollama local)
     LLM_ENDPOINT: str = "http://localhost:11434"
     LLM_MODEL: str = "mistral:instruct"
+    # How long Ollama keeps the model (and its cached system-prompt prefix) loaded after a request
+    LLM_KEEP_ALIVE: str = "30m"
     
+    # Prompt context budget, counted with the LLM's tokenizer (Hugging Face id, e.g.
+    # "mistralai/Mistral-7B-Instruct-v0.2"); empty uses a character-based estimate
+    LLM_TOKENIZER: str = ""
+    CONTEXT_TOKEN_BUDGET: int = 1200
+    CONTEXT_OCR_MAX_TOKENS: int = 400
+    
+    # Shared HTTP connection pools for Ollama / OpenRouter (HTTP/2 used when the h2 package is installed)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 60.0
+    OLLAMA_READ_TIMEOUT: float = 120.0
+    HTTP2_ENABLED: bool = True
+
+    # How often a streaming chat checks whether the client is still connected
+    DISCONNECT_POLL_INTERVAL_MS: int = 250
+
+    # Streamed answer tokens are coalesced into one NDJSON frame per this many chars / milliseconds
+    STREAM_FLUSH_MAX_CHARS: int = 64
+    STREAM_FLUSH_INTERVAL_MS: int = 50
+
     # Groq Configuration for Transcription
     GROQ_API_KEY: str
 
@@ -30,6 +73,85 @@ class Settings(BaseSettings):
     def openrouter_models_list(self) -> List[str]:
         return json.loads(self.OPENROUTER_MODELS)
 
+    # Circuit breaker for OpenRouter models (cool-down doubles on repeated failures)
+    OPENROUTER_CIRCUIT_FAILURE_THRESHOLD: int = 2
+    OPENROUTER_CIRCUIT_COOLDOWN_SECONDS: float = 30.0
+    OPENROUTER_CIRCUIT_MAX_COOLDOWN_SECONDS: float = 600.0
+
+    # Hedged streaming: race the next model if no first token arrives within the delay
+    OPENROUTER_HEDGING_ENABLED: bool = False
+    OPENROUTER_HEDGE_DELAY_MS: int = 2000
+    OPENROUTER_HEDGE_MAX_EXTRA: int = 1
+    OPENROUTER_HEDGE_MAX_RATIO: float = 0.3
+
+    # LLM admission control: concurrent requests per backend and the wait queue bound
+    LLM_MAX_CONCURRENCY_OLLAMA: int = 2
+    LLM_MAX_CONCURRENCY_OPENROUTER: int = 16
+    LLM_MAX_QUEUE: int = 32
+
+    # Semantic answer cache (replays answers to near-identical questions without calling the LLM)
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_SIMILARITY: float = 0.95
+    ANSWER_CACHE_SIZE: int = 512
+    ANSWER_CACHE_TTL_SECONDS: int = 86400
+
+    # Retrieval: "dense" (Chroma only) or "hybrid" (Chroma plus an in-process BM25 index,
+    # fused with reciprocal rank fusion); candidates are taken from each side before fusing
+    RETRIEVAL_MODE: str = "hybrid"
+    RETRIEVAL_CANDIDATES: int = 20
+    RRF_K: int = 60
+    # Narrow retrieval to the topic a keyword classifier finds in the query (telecom, financial, ...),
+    # falling back to the whole collection when fewer than RETRIEVAL_FILTER_MIN_RESULTS chunks match
+    RETRIEVAL_INTENT_FILTER: bool = True
+    RETRIEVAL_FILTER_MIN_RESULTS: int = 3
+
+    # Batch retrieval API: queries per embed/search round and per request
+    RETRIEVE_BATCH_SIZE: int = 256
+    RETRIEVE_BATCH_MAX_QUERIES: int = 50000
+
+    # Cross-encoder reranking of RERANK_CANDIDATES retrieved chunks; the retrieval order is kept
+    # when scoring does not finish within RERANK_BUDGET_MS or all RERANK_WORKERS are busy
+    RERANK_ENABLED: bool = False
+    RERANK_MODEL: str = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+    RERANK_CANDIDATES: int = 30
+    RERANK_BUDGET_MS: int = 150
+    RERANK_BATCH_SIZE: int = 16
+    RERANK_WORKERS: int = 1
+    RERANK_CACHE_SIZE: int = 4096
+
+    # Dense retrieval engine: "chroma" (HNSW) or "snapshot" (exact search over a memory-mapped copy
+    # of all embeddings, rewritten after each ingest; Chroma is used until a snapshot exists)
+    RETRIEVAL_ENGINE: str = "chroma"
+    VECTOR_SNAPSHOT_DIR: str = str(BASE_DIR.parent / "data" / "vector_snapshot")
+    # How often a process checks for a snapshot written elsewhere
+    VECTOR_SNAPSHOT_CHECK_SECONDS: int = 5
+
+    # Chunking: "sentence" packs whole sentences/steps up to the embedding model's max sequence
+    # length (128 tokens for the default model); "fixed" is the old 1000-char window
+    CHUNKER: str = "sentence"
+    CHUNK_MAX_TOKENS: int = 128
+    CHUNK_OVERLAP_TOKENS: int = 32
+
+    # Bulk ingestion: texts per embedding call, Chroma write cap, documents per lookup / SQL commit
+    INGEST_EMBED_BATCH_SIZE: int = 256
+    INGEST_WRITE_BATCH_SIZE: int = 5000
+    INGEST_DOCUMENT_GROUP_SIZE: int = 100
+    INGEST_SQL_BATCH_SIZE: int = 500
+
+    # Knowledge refresh crawler (conditional GETs; validators persisted between runs)
+    CRAWLER_CACHE_PATH: str = str(BASE_DIR.parent / "data" / "crawler_cache.json")
+    CRAWLER_MAX_CONCURRENCY: int = 16
+    CRAWLER_PER_HOST_CONCURRENCY: int = 2
+    CRAWLER_HOST_DELAY_SECONDS: float = 0.5
+    CRAWLER_TIMEOUT_SECONDS: float = 30.0
+    CRAWLER_VERIFY_SSL: bool = False  # several government portals serve incomplete certificate chains
+
+    # Preload the embedding model / Chroma and ping Ollama at startup; /api/ready returns 503 until done
+    WARMUP_ON_STARTUP: bool = True
+    # Failed required warm-up steps are retried with exponential backoff until they succeed
+    WARMUP_RETRY_INITIAL_SECONDS: float = 2.0
+    WARMUP_RETRY_MAX_SECONDS: float = 60.0
+
     # CORS Origins
     CORS_ORIGINS: str = '["http://localhost:5173"]'
     
@@ -4,11 +4,14 @@ Cyber-SOP Assistant - Indian Cybercrime Reporting & Guidance System
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from .config import settings
 from .db import init_db
+from .services.llm_limiter import LLMQueueFull
 from .routers import chat, resources, police, admin
 
 # Configure logging
@@ -57,9 +60,23 @@ async def lifespan(app: FastAPI):
     logger.info(f"Chroma DB path: {settings.CHROMA_DIR}")
     logger.info(f"LLM Endpoint: {settings.LLM_ENDPOINT}")
     logger.info(f"LLM Model: {settings.LLM_MODEL}")
+
+    # Warm up in the background so /api/health answers while models load
+    from .services.warmup import run_warmup, mark_ready
+    warmup_task = None
+    if settings.WARMUP_ON_STARTUP:
+        warmup_task = asyncio.create_task(run_warmup())
+    else:
+        mark_ready()
     yield
     # Shutdown
     logger.info("Shutting down Cyber-SOP Assistant API...")
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    from .services.embedding_client import get_query_cache
+    from .services.http_pool import close_clients
+    get_query_cache().save()
+    await close_clients()
 
 app = FastAPI(
     title="Cyber-SOP Assistant API",
@@ -77,6 +94,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(LLMQueueFull)
+async def llm_queue_full_handler(request, exc: LLMQueueFull):
+    """LLM backend is saturated: tell clients when to retry instead of queueing forever"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "backend": exc.backend},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # Include routers
 # Include routers
 app.include_router(chat.router, prefix="/api/chat", tags=["Chat"])
@@ -88,9 +114,10 @@ app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
 from .routers import auth
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 
-from .routers import transcription, playground
+from .routers import transcription, playground, rag
 app.include_router(transcription.router, prefix="/api/utils", tags=["Utils"])
 app.include_router(playground.router, prefix="/api/playground", tags=["Playground"])
+app.include_router(rag.router, prefix="/api/rag", tags=["RAG"])
 
 @app.get("/")
 async def root():
@@ -108,7 +135,7 @@ async def health_check():
     from .services.llm_client import check_ollama_health
     from .services.rag import get_collection_stats
     
-    ollama_status = check_ollama_health()
+    ollama_status = await check_ollama_health()
     chroma_stats = get_collection_stats()
     
     return {
@@ -118,6 +145,14 @@ async def health_check():
         "vector_store": chroma_stats
     }
 
+@app.get("/api/ready")
+async def readiness_check():
+    """Readiness probe - 503 until warm-up has finished"""
+    from .services.warmup import get_warmup_state
+    
+    state = get_warmup_state()
+    return JSONResponse(status_code=200 if state["ready"] else 503, content=state)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
@@ -63,6 +63,143 @@ async def create_document(document: DocumentCreate, db: Session = Depends(get_db
     db.refresh(db_document)
     return db_document
 
+@router.get("/embedding-cache")
+async def embedding_cache_stats():
+    """
+    Query embedding cache statistics
+    """
+    from ..services.embedding_client import get_query_cache_stats
+    
+    return get_query_cache_stats()
+
+@router.get("/embedding-batcher")
+async def embedding_batcher_stats():
+    """
+    Embedding micro-batcher statistics
+    """
+    from ..services.embedding_client import get_batcher_stats
+    
+    return get_batcher_stats()
+
+@router.get("/answer-cache")
+async def answer_cache_stats():
+    """
+    Semantic answer cache statistics
+    """
+    from ..services.rag import get_answer_cache, get_kb_version
+    
+    return {**get_answer_cache().stats(), "kb_version": get_kb_version()}
+
+@router.delete("/answer-cache")
+async def clear_answer_cache():
+    """
+    Drop all cached answers
+    """
+    from ..services.rag import get_answer_cache
+    
+    get_answer_cache().clear()
+    return {"message": "Answer cache cleared"}
+
+@router.get("/http-pool")
+async def http_pool_stats():
+    """
+    Upstream connection pool statistics
+    """
+    from ..services.http_pool import get_pool_stats
+    
+    return get_pool_stats()
+
+@router.get("/llm/models")
+async def llm_model_router_state():
+    """
+    OpenRouter model routing state (success rate, time-to-first-token, circuit breakers)
+    """
+    from ..config import settings
+    from ..services.llm_client import get_model_router, get_hedge_stats
+    
+    router_ = get_model_router()
+    return {
+        "configured_order": settings.openrouter_models_list,
+        "current_order": router_.ordered_models(settings.openrouter_models_list),
+        "models": router_.state(),
+        "hedging": get_hedge_stats()
+    }
+
+@router.get("/llm/streams")
+async def llm_stream_stats():
+    """
+    Completed, failed and abandoned (client disconnected) generations
+    """
+    from ..services.llm_client import get_abandon_stats
+    
+    return get_abandon_stats()
+
+
+@router.get("/llm/context")
+async def llm_context_stats():
+    """
+    Prompt token counts and how much retrieved context the token budget trimmed
+    """
+    from ..services.context_packer import get_packer_stats
+    
+    return get_packer_stats()
+
+
+@router.get("/llm/prompt-eval")
+async def llm_prompt_eval_stats():
+    """
+    Ollama prompt evaluation per request (lower when the system prefix is reused)
+    """
+    from ..services.llm_client import get_prompt_eval_stats
+    
+    return get_prompt_eval_stats()
+
+
+@router.get("/llm/queues")
+async def llm_queue_stats():
+    """
+    Per-backend admission control: active requests, queue depth, wait times and rejections
+    """
+    from ..services.llm_limiter import get_limiter_stats
+    
+    return get_limiter_stats()
+
+@router.get("/retrieval/lexical")
+async def lexical_index_stats():
+    """
+    Retrieval mode and BM25 index size, freshness and search latency
+    """
+    from ..services.rag import get_lexical_stats
+    
+    return get_lexical_stats()
+
+@router.get("/retrieval/intent")
+async def retrieval_intent_stats():
+    """
+    Topic-filtered retrieval: queries narrowed by the intent classifier and fallbacks
+    """
+    from ..services.rag import get_intent_stats
+    
+    return get_intent_stats()
+
+@router.get("/retrieval/snapshot")
+async def vector_snapshot_stats():
+    """
+    Dense retrieval engine and the loaded vector snapshot's size and search latency
+    """
+    from ..services.vector_snapshot import get_snapshot_stats
+    
+    return get_snapshot_stats()
+
+@router.get("/retrieval/rerank")
+async def rerank_stats():
+    """
+    Cross-encoder reranking: requests reranked, fallbacks (over budget / busy), timing and score cache
+    """
+    from ..services.reranker import get_rerank_stats
+    
+    return get_rerank_stats()
+
 @router.get("/health")
 async def admin_health():
     """
@@ -70,7 +207,7 @@ async def admin_health():
     """
     from ..services.llm_client import check_ollama_health
     
-    ollama_status = check_ollama_health()
+    ollama_status = await check_ollama_health()
     chroma_stats = get_collection_stats()
     
     return {
@@ -1,12 +1,14 @@
 """
 Chat Router - Handles chat conversations and RAG queries
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List
+import anyio
 import logging
 
 
+from ..config import settings
 from ..dependencies import get_db
 from ..schemas import ChatMessageRequest, ChatMessageResponse, ChatOut, ChatListItem, ChatCreate
 from ..models import Chat, Message, User
@@ -19,28 +21,98 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from ..services.rag import answer_query_stream
+from ..services.llm_client import check_admission
+from ..services.llm_limiter import LLMQueueFull
+from ..services.context_packer import truncate_to_tokens
+
+
+LANG_MAP = {
+    "hi": "Hindi",
+    "ta": "Tamil",
+    "te": "Telugu",
+    "ml": "Malayalam",
+    "mr": "Marathi",
+    "kn": "Kannada",
+    "bn": "Bengali",
+    "gu": "Gujarati",
+    "en": "English"
+}
+
+# Blocking helpers below run in the threadpool so the event loop stays free for streams
+
+def _get_or_create_chat(db: Session, chat_id: int, message: str, user: User) -> Chat:
+    """Load the user's chat or start a new one"""
+    if chat_id:
+        chat = db.query(Chat).filter(Chat.id == chat_id, Chat.user_id == user.id).first()
+        if not chat:
+            raise HTTPException(status_code=404, detail="Chat not found or access denied")
+        return chat
+
+    # Create new chat
+    title = message[:50] + "..." if len(message) > 50 else message
+    chat = Chat(title=title, user_id=user.id)
+    db.add(chat)
+    db.commit()
+    db.refresh(chat)
+    logger.info(f"Created new chat: {chat.id} for user {user.username}")
+    return chat
+
+def _extract_image_text(image: str) -> str:
+    """Decode a base64 image (optionally a data URL) and OCR it"""
+    import base64
+    from ..services.ocr import extract_text_from_image
+
+    # Check if it has a header like "data:image/png;base64,"
+    image_data = image
+    if "," in image_data:
+        image_data = image_data.split(",")[1]
+
+    image_bytes = base64.b64decode(image_data)
+    return extract_text_from_image(image_bytes)
+
+def _detect_language(text: str) -> str:
+    """Map langdetect's code to the language names used in prompts"""
+    try:
+        from langdetect import detect
+        lang_code = detect(text)
+        language = LANG_MAP.get(lang_code, "English")
+        logger.info(f"Detected language: {language} ({lang_code})")
+        return language
+    except:
+        return "English"
+
+def _save_message(chat_id: int, role: str, content: str, language: str = None, touch_chat: bool = False):
+    """Persist a message in its own session (the request session may already be closed)"""
+    from ..db import SessionLocal
+    db_bg = SessionLocal()
+    try:
+        db_bg.add(Message(
+            chat_id=chat_id,
+            role=role,
+            content=content,
+            language=language
+        ))
+        if touch_chat:
+            # Update chat timestamp
+            chat_ref = db_bg.query(Chat).filter(Chat.id == chat_id).first()
+            if chat_ref:
+                from datetime import datetime
+                chat_ref.updated_at = datetime.utcnow()
+        db_bg.commit()
+    finally:
+        db_bg.close()
 
 
 @router.post("/message")
-async def send_message(request: ChatMessageRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def send_message(request: ChatMessageRequest, http_request: Request, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """
     Send a message and get AI response with RAG (Streaming)
     """
     try:
         # Get or create chat
-        if request.chat_id:
-            chat = db.query(Chat).filter(Chat.id == request.chat_id, Chat.user_id == current_user.id).first()
-            if not chat:
-                raise HTTPException(status_code=404, detail="Chat not found or access denied")
-        else:
-            # Create new chat
-            title = request.message[:50] + "..." if len(request.message) > 50 else request.message
-            chat = Chat(title=title, user_id=current_user.id)
-            db.add(chat)
-            db.commit()
-            db.refresh(chat)
-            logger.info(f"Created new chat: {chat.id} for user {current_user.username}")
+        chat = await run_in_threadpool(_get_or_create_chat, db, request.chat_id, request.message, current_user)
         
         # Save user message
         user_message_content = request.message
@@ -49,18 +121,10 @@ async def send_message(request: ChatMessageRequest, db: Session = Depends(get_db
         # Handle Image/OCR
         if request.image:
             try:
-                import base64
-                from ..services.ocr import extract_text_from_image
-                
-                # Check if it has a header like "data:image/png;base64,"
-                image_data = request.image
-                if "," in image_data:
-                    image_data = image_data.split(",")[1]
-                
-                image_bytes = base64.b64decode(image_data)
-                ocr_text = extract_text_from_image(image_bytes)
+                ocr_text = await run_in_threadpool(_extract_image_text, request.image)
                 if ocr_text:
-                    extra_context = ocr_text
+                    # Long screenshots are capped for the prompt; the saved message keeps the full text
+                    extra_context = await run_in_threadpool(truncate_to_tokens, ocr_text, settings.CONTEXT_OCR_MAX_TOKENS)
                     # Append OCR text to the content that will be saved to DB
                     user_message_content += f"\n\n[Image Content: {ocr_text}]"
                     
@@ -71,84 +135,48 @@ async def send_message(request: ChatMessageRequest, db: Session = Depends(get_db
             except Exception as e:
                 logger.error(f"Error processing image: {e}")
         
-        # Detect Language
+        # Detect Language (from message + extra_context)
         language = request.language
         if not language:
-            try:
-                from langdetect import detect
-                # Detect from message + extra_context
-                text_to_detect = request.message + " " + extra_context
-                lang_code = detect(text_to_detect)
-                lang_map = {
-                    "hi": "Hindi",
-                    "ta": "Tamil",
-                    "te": "Telugu",
-                    "ml": "Malayalam",
-                    "mr": "Marathi",
-                    "kn": "Kannada",
-                    "bn": "Bengali",
-                    "gu": "Gujarati",
-                    "en": "English"
-                }
-                language = lang_map.get(lang_code, "English")
-                logger.info(f"Detected language: {language} ({lang_code})")
-            except:
-                language = "English"
-
-        user_message = Message(
-            chat_id=chat.id,
-            role="user",
-            content=user_message_content,
-            language=language
-        )
-        db.add(user_message)
-        db.commit()
+            language = await run_in_threadpool(_detect_language, request.message + " " + extra_context)
+
+        # Reject with 503 before saving anything if the LLM backend's queue is full
+        check_admission(language)
+
+        await run_in_threadpool(_save_message, chat.id, "user", user_message_content, language)
 
         # Generator to stream response AND save to DB
         async def stream_and_save(chat_id: int):
-            full_response = ""
-            import json
-            
-            # Helper to save
-            def save_assistant_message(text: str):
-                try:
-                    # Create new session for background save (since original might be closed or in different state)
-                    from ..db import SessionLocal
-                    db_bg = SessionLocal()
-                    
-                    asst_msg = Message(
-                        chat_id=chat_id,
-                        role="assistant",
-                        content=text,
-                    )
-                    db_bg.add(asst_msg)
-                    # Update chat timestamp
-                    chat_ref = db_bg.query(Chat).filter(Chat.id == chat_id).first()
-                    if chat_ref:
-                        from datetime import datetime
-                        chat_ref.updated_at = datetime.utcnow()
-                        
-                    db_bg.commit()
-                    db_bg.close()
-                    logger.info(f"Saved assistant message for chat {chat_id}")
-                except Exception as ex:
-                    logger.error(f"Failed to save assistant message: {ex}")
-
-            # Stream chunks
-            for chunk in answer_query_stream(request.message, language=language, extra_context=extra_context, chat_id=chat_id):
-                yield chunk
-                
-                # Parse chunk to accumulate text content
-                try:
-                    data = json.loads(chunk)
-                    if data.get("type") == "content":
-                        full_response += data.get("data", "")
-                except:
-                    pass
-            
-            # After stream ends, save to DB
-            if full_response:
-                save_assistant_message(full_response)
+            # Answer text is collected as it is sent, without parsing the frames again
+            answer_parts = []
+
+            # The disconnect check lets the LLM client close the upstream stream as soon as the tab is closed
+            answer_stream = answer_query_stream(
+                request.message,
+                language=language,
+                extra_context=extra_context,
+                chat_id=chat_id,
+                is_disconnected=http_request.is_disconnected,
+                on_content=answer_parts.append
+            )
+            try:
+                # Stream chunks
+                async for chunk in answer_stream:
+                    yield chunk
+            finally:
+                # Also reached when the response task is cancelled on disconnect
+                await answer_stream.aclose()
+
+                # After stream ends (or is abandoned), save what was generated.
+                # Shielded so a cancelled response task can still finish the write.
+                full_response = "".join(answer_parts)
+                if full_response:
+                    with anyio.CancelScope(shield=True):
+                        try:
+                            await run_in_threadpool(_save_message, chat_id, "assistant", full_response, None, True)
+                            logger.info(f"Saved assistant message for chat {chat_id}")
+                        except Exception as ex:
+                            logger.error(f"Failed to save assistant message: {ex}")
 
         # Return streaming response
         return StreamingResponse(
@@ -156,6 +184,8 @@ async def send_message(request: ChatMessageRequest, db: Session = Depends(get_db
             media_type="application/x-ndjson"
         )
         
+    except (HTTPException, LLMQueueFull):
+        raise
     except Exception as e:
         logger.error(f"Error in send_message: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
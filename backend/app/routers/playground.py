@@ -2,7 +2,8 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List
 import logging
-from ..services.llm_client import generate_response
+from ..services.llm_client import generate_response, openrouter_completion
+from ..services.llm_limiter import LLMQueueFull, Priority
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -57,31 +58,19 @@ Make the message convincing but clearly a simulation.
         response_text = ""
         used_model = "Local"
         
-        # 1. Try OpenRouter First (Better creativity)
+        # 1. Try OpenRouter First (Better creativity), routed around failing models
         try:
-            from ..config import settings
-            from ..services.llm_client import query_openrouter
-            
-            models = settings.openrouter_models_list
-            for model in models:
-                try:
-                    logger.info(f"Playground: Trying OpenRouter {model}")
-                    res = query_openrouter(prompt, model, temperature=0.8)
-                    if res.status_code == 200:
-                        data = res.json()
-                        response_text = data["choices"][0]["message"]["content"]
-                        used_model = f"OpenRouter ({model})"
-                        break
-                except Exception as e:
-                    logger.warning(f"Playground OpenRouter try failed: {e}")
-                    
+            answer, model = await openrouter_completion(prompt, temperature=0.8, priority=Priority.SCENARIO)
+            if answer:
+                response_text = answer
+                used_model = f"OpenRouter ({model})"
         except Exception as e:
-            logger.error(f"Playground OpenRouter Init Error: {e}")
+            logger.error(f"Playground OpenRouter Error: {e}")
 
         # 2. Fallback to Local LLM if OpenRouter failed
         if not response_text:
             logger.info("Playground: Falling back to Local LLM")
-            response_text = generate_response(prompt, temperature=0.7, max_tokens=300, language=req.language)
+            response_text = await generate_response(prompt, temperature=0.7, max_tokens=300, language=req.language, priority=Priority.SCENARIO)
 
         # Parse Response
         sender = "Unknown"
@@ -107,6 +96,8 @@ Make the message convincing but clearly a simulation.
             context_notes=context
         )
 
+    except LLMQueueFull:
+        raise # answered with 503 + Retry-After by the app's exception handler
     except Exception as e:
         logger.error(f"Error generating scenario: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -135,25 +126,15 @@ Return ONLY a JSON string (no markdown). BE CONCISE.
         
         # 1. Try OpenRouter First
         try:
-            from ..config import settings
-            from ..services.llm_client import query_openrouter
-            
-            models = settings.openrouter_models_list
-            for model in models:
-                try:
-                    res = query_openrouter(prompt, model, temperature=0.2)
-                    if res.status_code == 200:
-                        data = res.json()
-                        response_text = data["choices"][0]["message"]["content"]
-                        break
-                except:
-                    pass
+            answer, _ = await openrouter_completion(prompt, temperature=0.2, priority=Priority.EVALUATION)
+            if answer:
+                response_text = answer
         except:
              pass
 
         # 2. Fallback
         if not response_text:
-             response_text = generate_response(prompt, temperature=0.2, max_tokens=200, language=req.language)
+             response_text = await generate_response(prompt, temperature=0.2, max_tokens=200, language=req.language, priority=Priority.EVALUATION)
         
         # Clean up code blocks
         clean_text = response_text.replace("```json", "").replace("```", "").strip()
@@ -176,6 +157,8 @@ Return ONLY a JSON string (no markdown). BE CONCISE.
                 tips=["Always verify sender identity.", "Don't click suspicious links."]
             )
 
+    except LLMQueueFull:
+        raise # answered with 503 + Retry-After by the app's exception handler
     except Exception as e:
         logger.error(f"Error evaluating action: {e}")
         raise HTTPException(status_code=500, detail=str(e))
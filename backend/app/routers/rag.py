@@ -0,0 +1,83 @@
+"""
+RAG Router - Direct access to retrieval (offline evaluation, bulk triage)
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import Dict
+import asyncio
+import logging
+import time
+
+from ..config import settings
+from ..models import User
+from ..schemas import RetrieveBatchRequest
+from ..services.rag import encode_frame, retrieve_batch
+from .auth import get_current_user
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def _result(chunk: Dict, include_content: bool) -> Dict:
+    result = {
+        "id": chunk["id"],
+        "distance": chunk.get("distance"),
+        "score": chunk.get("score"),
+        "metadata": chunk["metadata"]
+    }
+    if include_content:
+        result["content"] = chunk["content"]
+    return result
+
+
+@router.post("/retrieve/batch")
+async def retrieve_batch_endpoint(request: RetrieveBatchRequest, current_user: User = Depends(get_current_user)):
+    """
+    Retrieve chunks for many queries, streamed back as NDJSON
+
+    Queries are processed RETRIEVE_BATCH_SIZE at a time (one batched encode
+    and one multi-query search each); the next batch is computed while the
+    current one is streamed. One line per query, in input order:
+    {"type": "result", "index": i, "results": [...]}, then
+    {"type": "done", "count": n, "elapsed_ms": ...}. A failure ends the
+    stream with {"type": "error", "index": first query of the failed batch, "error": ...}.
+    """
+    queries = request.queries
+    if len(queries) > settings.RETRIEVE_BATCH_MAX_QUERIES:
+        raise HTTPException(status_code=413, detail=f"At most {settings.RETRIEVE_BATCH_MAX_QUERIES} queries per request")
+
+    batch_size = settings.RETRIEVE_BATCH_SIZE
+    offsets = range(0, len(queries), batch_size)
+
+    def start_batch(offset: int):
+        batch = queries[offset:offset + batch_size]
+        return asyncio.create_task(asyncio.to_thread(retrieve_batch, batch, request.top_k, request.filters))
+
+    async def stream():
+        start = time.perf_counter()
+        pending = start_batch(offsets[0])
+        try:
+            for n, offset in enumerate(offsets):
+                try:
+                    results = await pending
+                except Exception as e:
+                    logger.error(f"Batch retrieval failed at query {offset}: {e}")
+                    yield encode_frame({"type": "error", "index": offset, "error": str(e)})
+                    return
+                pending = start_batch(offsets[n + 1]) if n + 1 < len(offsets) else None
+                for index, chunks in enumerate(results, offset):
+                    yield encode_frame({
+                        "type": "result",
+                        "index": index,
+                        "results": [_result(chunk, request.include_content) for chunk in chunks]
+                    })
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.info(f"Batch retrieval: {len(queries)} queries in {elapsed_ms:.0f} ms")
+            yield encode_frame({"type": "done", "count": len(queries), "elapsed_ms": round(elapsed_ms, 1)})
+        finally:
+            # Client gone or failure: don't leave the prefetched batch unobserved
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
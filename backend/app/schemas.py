@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Union
 from datetime import datetime
 
 # Message Schemas
@@ -140,6 +140,14 @@ class DocumentCreate(BaseModel):
     content: str
     chunk_id: Optional[str] = None
 
+# RAG Schemas
+class RetrieveBatchRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1)
+    top_k: int = Field(5, ge=1, le=50)
+    # Metadata filters for every query, e.g. {"topic": ["telecom", "general"], "source": "CEIR"}
+    filters: Optional[Dict[str, Union[str, int, List[str]]]] = None
+    include_content: bool = False
+
 # Admin Schemas
 class StatsResponse(BaseModel):
     total_chats: int
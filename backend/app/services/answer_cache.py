@@ -0,0 +1,105 @@
+"""
+Semantic Answer Cache - Replays answers for near-duplicate RAG questions
+Entries are keyed by query embedding neighbourhood, language, retrieved chunk ids
+and knowledge base version
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import itertools
+import logging
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticAnswerCache:
+    """Bounded LRU cache of generated answers, matched by cosine similarity"""
+
+    def __init__(self, max_size: int = 512, similarity_threshold: float = 0.95, ttl_seconds: float = 86400):
+        self.max_size = max_size
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, dict]" = OrderedDict()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @staticmethod
+    def _unit(embedding: np.ndarray) -> np.ndarray:
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    def lookup(self, embedding: np.ndarray, language: str, chunk_ids: Tuple[str, ...], kb_version: int) -> Optional[dict]:
+        """
+        Find a cached answer for a semantically equivalent question
+
+        Only entries with the same language, the same retrieved chunks and the
+        same knowledge base version are considered; among those the closest
+        one above the similarity threshold wins.
+        """
+        query = self._unit(embedding)
+        bucket = (language.lower(), tuple(chunk_ids), kb_version)
+        now = time.monotonic()
+        best_id, best_score = None, self.similarity_threshold
+
+        with self._lock:
+            expired = []
+            for entry_id, entry in self._entries.items():
+                if self.ttl_seconds and now - entry["stored_at"] > self.ttl_seconds:
+                    expired.append(entry_id)
+                    continue
+                if entry["bucket"] != bucket:
+                    continue
+                score = float(np.dot(entry["embedding"], query))
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+            for entry_id in expired:
+                del self._entries[entry_id]
+
+            if best_id is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            entry = self._entries[best_id]
+            return {"sources": entry["sources"], "answer": entry["answer"], "similarity": best_score}
+
+    def store(self, embedding: np.ndarray, language: str, chunk_ids: Tuple[str, ...], kb_version: int, sources: List[Dict], answer: str):
+        """Cache a completed answer"""
+        if self.max_size <= 0:
+            return
+        entry = {
+            "embedding": self._unit(np.asarray(embedding, dtype=np.float32)),
+            "bucket": (language.lower(), tuple(chunk_ids), kb_version),
+            "sources": sources,
+            "answer": answer,
+            "stored_at": time.monotonic()
+        }
+        with self._lock:
+            self._entries[next(self._ids)] = entry
+            self.stores += 1
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "similarity_threshold": self.similarity_threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
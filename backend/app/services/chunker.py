@@ -0,0 +1,206 @@
+"""
+Chunker - Splits documents into chunks for embedding
+Sentence/step-aware packing sized to the embedding model's token limit
+"""
+from typing import List, Optional
+from ..config import settings
+from .context_packer import estimate_tokens
+import logging
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Abbreviations whose period does not end a sentence ("Pay Rs. 500", "e.g. UPI", "FIR No. 12")
+# (case-sensitive, so "no." at the end of a sentence still splits)
+_ABBREVIATIONS = ("Rs", "rs", "No", "Nos", "Dr", "Mr", "Mrs", "Ms", "Sec", "St", "vs", "Govt", "Dept", "e.g", "E.g", "i.e", "I.e")
+# One fixed-width lookbehind per abbreviation (Python lookbehinds cannot vary in width)
+_NOT_ABBREVIATION = "".join(rf"(?<!\b{re.escape(a)}\.)" for a in _ABBREVIATIONS)
+# Sentence ends: Latin terminators, the Devanagari danda / double danda, line breaks
+_SENTENCE_END_RE = re.compile(rf"(?<=[.!?।॥]){_NOT_ABBREVIATION}\s+|\s*\n+\s*")
+# Start of a numbered step ("2. Enter", "3) Upload") inside running text
+_STEP_START_RE = re.compile(r"\s+(?=\(?\d{1,2}[.)]\s)")
+# A piece that is only a step marker ("2.") belongs to the following text
+_STEP_MARKER_RE = re.compile(r"^\(?\d{1,2}[.)]$")
+
+# Tokens the model adds around every input ([CLS]/[SEP] or <s>/</s>)
+_SPECIAL_TOKENS = 2
+
+_tokenizer = None
+_tokenizer_failed = False
+_tokenizer_lock = threading.Lock()
+
+
+def _get_embedding_tokenizer():
+    """Tokenizer of the embedding model, or None to fall back to estimates"""
+    global _tokenizer, _tokenizer_failed
+    if _tokenizer is not None or _tokenizer_failed:
+        return _tokenizer
+    with _tokenizer_lock:
+        if _tokenizer is None and not _tokenizer_failed:
+            try:
+                from transformers import AutoTokenizer
+                _tokenizer = AutoTokenizer.from_pretrained(settings.EMBEDDING_MODEL)
+            except Exception as e:
+                _tokenizer_failed = True
+                logger.warning(f"Could not load embedding tokenizer ({e}). Using estimated token counts for chunking.")
+    return _tokenizer
+
+
+def count_embedding_tokens(texts: List[str]) -> List[int]:
+    """Token counts of `texts` under the embedding model's tokenizer (without special tokens)"""
+    if not texts:
+        return []
+    tokenizer = _get_embedding_tokenizer()
+    if tokenizer is None:
+        return [estimate_tokens(text) for text in texts]
+    encoded = tokenizer(texts, add_special_tokens=False)["input_ids"]
+    return [len(ids) for ids in encoded]
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences and numbered steps
+
+    Handles ". ! ?", the danda (।) and double danda (॥) used in Hindi and
+    other Indic scripts, line breaks, and "1. ... 2. ..." step lists written
+    on one line. Step markers stay attached to their step.
+    """
+    pieces = []
+    for part in _STEP_START_RE.split(text):
+        pieces.extend(p for p in _SENTENCE_END_RE.split(part) if p and p.strip())
+
+    sentences = []
+    carry = ""
+    for piece in pieces:
+        piece = piece.strip()
+        if _STEP_MARKER_RE.match(piece):
+            carry = f"{carry}{piece} "
+            continue
+        sentences.append(carry + piece)
+        carry = ""
+    if carry.strip():
+        sentences.append(carry.strip())
+    return sentences
+
+
+def _split_long_word(word: str, max_tokens: int) -> List[str]:
+    """Hard-split one word over the budget (a URL, an ID list, text without spaces)"""
+    tokenizer = _get_embedding_tokenizer()
+    if tokenizer is not None and getattr(tokenizer, "is_fast", False):
+        # Cut at token boundaries, max_tokens tokens per piece
+        offsets = tokenizer(word, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"]
+        starts = [0] + [start for start, _ in offsets[max_tokens::max_tokens]]
+        pieces = [word[a:b] for a, b in zip(starts, starts[1:] + [len(word)])]
+    else:
+        tokens = count_embedding_tokens([word])[0]
+        size = max(1, len(word) * max_tokens // max(1, tokens))
+        pieces = [word[i:i + size] for i in range(0, len(word), size)]
+
+    # A piece can tokenize differently on its own; halve any that still don't fit
+    result = []
+    for piece, tokens in zip(pieces, count_embedding_tokens(pieces)):
+        if tokens > max_tokens and len(piece) > 1:
+            middle = len(piece) // 2
+            result.extend(_split_long_word(piece[:middle], max_tokens))
+            result.extend(_split_long_word(piece[middle:], max_tokens))
+        elif piece:
+            result.append(piece)
+    return result
+
+
+def _split_long_sentence(sentence: str, max_tokens: int) -> List[str]:
+    """Split a sentence longer than the budget at word boundaries, and inside words that alone exceed it"""
+    words = sentence.split()
+    counts = count_embedding_tokens(words)
+    parts = []
+    current = []
+    used = 0
+    for word, tokens in zip(words, counts):
+        if current and used + tokens > max_tokens:
+            parts.append(" ".join(current))
+            current = []
+            used = 0
+        if tokens > max_tokens:
+            parts.extend(_split_long_word(word, max_tokens))
+            continue
+        current.append(word)
+        used += tokens
+    if current:
+        parts.append(" ".join(current))
+    return parts
+
+
+def chunk_sentences(text: str, max_tokens: Optional[int] = None, overlap_tokens: Optional[int] = None) -> List[str]:
+    """
+    Pack whole sentences into chunks that fit the embedding model
+
+    Args:
+        text: Document text
+        max_tokens: Token budget per chunk, special tokens included
+            (default settings.CHUNK_MAX_TOKENS, the model's max sequence length)
+        overlap_tokens: A chunk's last sentence is repeated at the start of
+            the next one if it is at most this long (default settings.CHUNK_OVERLAP_TOKENS)
+
+    Returns:
+        List of chunk strings
+    """
+    if not text:
+        return []
+    budget = (max_tokens or settings.CHUNK_MAX_TOKENS) - _SPECIAL_TOKENS
+    overlap_tokens = settings.CHUNK_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+
+    units = []
+    sentences = split_sentences(text)
+    for sentence, tokens in zip(sentences, count_embedding_tokens(sentences)):
+        if tokens <= budget:
+            units.append((sentence, tokens))
+        else:
+            parts = _split_long_sentence(sentence, budget)
+            units.extend(zip(parts, count_embedding_tokens(parts)))
+
+    chunks = []
+    current = []
+    used = 0
+    for sentence, tokens in units:
+        # +1 for the joining space, roughly one token
+        if current and used + tokens + 1 > budget:
+            chunks.append(" ".join(s for s, _ in current))
+            last_sentence, last_tokens = current[-1]
+            if 0 < last_tokens <= overlap_tokens and last_tokens + tokens + 1 <= budget:
+                current = [(last_sentence, last_tokens)]
+                used = last_tokens
+            else:
+                current = []
+                used = 0
+        current.append((sentence, tokens))
+        used += tokens + (1 if len(current) > 1 else 0)
+    if current:
+        chunks.append(" ".join(s for s, _ in current))
+    return chunks
+
+
+def chunk_fixed(text: str, chunk_size: int = 1000, overlap: int = 100) -> List[str]:
+    """Split text into fixed-width character windows (the original chunker)"""
+    if not text:
+        return []
+
+    chunks = []
+    start = 0
+    text_len = len(text)
+
+    while start < text_len:
+        end = start + chunk_size
+        chunk = text[start:end]
+        chunks.append(chunk)
+        start += (chunk_size - overlap)
+
+    return chunks
+
+
+def chunk_text(text: str, strategy: Optional[str] = None) -> List[str]:
+    """Split text with the configured chunker (settings.CHUNKER: "sentence" or "fixed")"""
+    strategy = strategy or settings.CHUNKER
+    if strategy == "fixed":
+        return chunk_fixed(text)
+    return chunk_sentences(text)
@@ -0,0 +1,228 @@
+"""
+Context Packer - Fits retrieved chunks into a token budget before prompting
+Merges overlapping neighbour chunks and keeps the most relevant text first
+"""
+from typing import Dict, List, Optional
+from ..config import settings
+import logging
+import math
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Smallest remainder worth filling with a truncated chunk
+MIN_PARTIAL_TOKENS = 48
+# Longest overlap searched for between neighbouring chunks (fixed chunker: 100 chars,
+# sentence chunker: one short sentence)
+MAX_OVERLAP_CHARS = 300
+MIN_OVERLAP_CHARS = 20
+
+_tokenizer = None
+_tokenizer_failed = False
+_tokenizer_lock = threading.Lock()
+
+# Packing runs in worker threads, so counter updates are locked
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,
+    "prompt_tokens": 0,
+    "max_prompt_tokens": 0,
+    "chunks_in": 0,
+    "chunks_packed": 0,
+    "chunks_merged": 0,
+    "chunks_truncated": 0,
+    "context_tokens_in": 0,
+    "context_tokens_packed": 0
+}
+
+
+def get_tokenizer():
+    """
+    Get the tokenizer for the target LLM (settings.LLM_TOKENIZER)
+
+    Returns None when no tokenizer is configured or it cannot be loaded;
+    token counts then fall back to a character-based estimate.
+    """
+    global _tokenizer, _tokenizer_failed
+    if _tokenizer is not None or _tokenizer_failed or not settings.LLM_TOKENIZER:
+        return _tokenizer
+    with _tokenizer_lock:
+        if _tokenizer is None and not _tokenizer_failed:
+            try:
+                from transformers import AutoTokenizer
+                logger.info(f"Loading LLM tokenizer: {settings.LLM_TOKENIZER}")
+                _tokenizer = AutoTokenizer.from_pretrained(settings.LLM_TOKENIZER)
+            except Exception as e:
+                _tokenizer_failed = True
+                logger.warning(f"Could not load tokenizer {settings.LLM_TOKENIZER} ({e}). Using estimated token counts.")
+    return _tokenizer
+
+
+def estimate_tokens(text: str) -> int:
+    """Character-based token estimate: ~4 chars per token for Latin text, Indic scripts split much finer"""
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return math.ceil((len(text) - non_ascii) / 4 + non_ascii / 1.5)
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens `text` occupies in the LLM prompt"""
+    if not text:
+        return 0
+    tokenizer = get_tokenizer()
+    if tokenizer is not None:
+        return len(tokenizer.encode(text, add_special_tokens=False))
+    return estimate_tokens(text)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` to at most `max_tokens`, preferring a word boundary"""
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    cut = int(len(text) * max_tokens / tokens)
+    while cut > 0:
+        candidate = text[:cut]
+        space = candidate.rfind(" ")
+        if space > cut * 0.8:
+            candidate = candidate[:space]
+        candidate = candidate.rstrip() + " ..."
+        if count_tokens(candidate) <= max_tokens:
+            return candidate
+        cut = int(cut * 0.9)
+    return ""
+
+
+def _overlap(previous: str, following: str) -> int:
+    """Length of the longest suffix of `previous` that starts `following`"""
+    longest = min(MAX_OVERLAP_CHARS, len(previous), len(following))
+    for size in range(longest, MIN_OVERLAP_CHARS - 1, -1):
+        if previous.endswith(following[:size]):
+            return size
+    return 0
+
+
+def merge_overlapping(chunks: List[Dict]) -> List[Dict]:
+    """
+    Merge retrieved chunks that are neighbours in the same document
+
+    The chunker repeats the tail of each chunk at the start of the next one,
+    so two adjacent hits would put that text in the prompt twice. Runs of
+    adjacent chunks become one chunk with the overlap removed; it takes the
+    best rank of its parts. Exact duplicate texts are dropped.
+
+    Chunks are expected most relevant first and come back in that order.
+    """
+    groups: Dict[object, List[Dict]] = {}
+    passthrough = []
+    rank = {}
+    for position, chunk in enumerate(chunks):
+        rank.setdefault(chunk["id"], position)
+        meta = chunk.get("metadata") or {}
+        if meta.get("doc_id") is None or meta.get("chunk_index") is None:
+            passthrough.append(chunk)
+        else:
+            groups.setdefault(meta["doc_id"], []).append(chunk)
+
+    merged = list(passthrough)
+    for doc_chunks in groups.values():
+        doc_chunks.sort(key=lambda c: c["metadata"]["chunk_index"])
+        current = dict(doc_chunks[0])
+        current["merged_ids"] = [current["id"]]
+        for chunk in doc_chunks[1:]:
+            last_index = current["metadata"]["chunk_index"] + len(current["merged_ids"]) - 1
+            if chunk["metadata"]["chunk_index"] == last_index + 1:
+                overlap = _overlap(current["content"], chunk["content"])
+                current["content"] += chunk["content"][overlap:]
+                current["merged_ids"].append(chunk["id"])
+            else:
+                merged.append(current)
+                current = dict(chunk)
+                current["merged_ids"] = [current["id"]]
+        merged.append(current)
+
+    unique = []
+    seen = set()
+    for chunk in sorted(merged, key=lambda c: min(rank[i] for i in c.get("merged_ids", [c["id"]]))):
+        key = " ".join(chunk["content"].split())
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(chunk)
+    return unique
+
+
+def pack_chunks(chunks: List[Dict], budget_tokens: Optional[int] = None) -> List[Dict]:
+    """
+    Select chunk text for the prompt within a token budget
+
+    Args:
+        chunks: Retrieved chunks, most relevant first
+        budget_tokens: Token budget for chunk text (default settings.CONTEXT_TOKEN_BUDGET)
+
+    Returns:
+        Chunks to put in the prompt, most relevant first. The last one may
+        be truncated to fill the remaining budget.
+    """
+    if budget_tokens is None:
+        budget_tokens = settings.CONTEXT_TOKEN_BUDGET
+
+    merged = merge_overlapping(chunks)
+    packed = []
+    used = 0
+    tokens_in = 0
+    truncated = 0
+    for chunk in merged:
+        tokens = count_tokens(chunk["content"])
+        tokens_in += tokens
+        remaining = budget_tokens - used
+        if tokens <= remaining:
+            packed.append(chunk)
+            used += tokens
+        elif remaining >= MIN_PARTIAL_TOKENS:
+            partial = dict(chunk)
+            partial["content"] = truncate_to_tokens(chunk["content"], remaining)
+            if partial["content"]:
+                packed.append(partial)
+                used += count_tokens(partial["content"])
+                truncated += 1
+
+    with _stats_lock:
+        _stats["chunks_in"] += len(chunks)
+        _stats["chunks_merged"] += len(chunks) - len(merged)  # absorbed into a neighbour or duplicates
+        _stats["chunks_packed"] += len(packed)
+        _stats["chunks_truncated"] += truncated
+        _stats["context_tokens_in"] += tokens_in
+        _stats["context_tokens_packed"] += used
+    return packed
+
+
+def record_prompt_tokens(tokens: int):
+    """Record the size of one assembled prompt (system + user parts)"""
+    with _stats_lock:
+        _stats["requests"] += 1
+        _stats["prompt_tokens"] += tokens
+        _stats["max_prompt_tokens"] = max(_stats["max_prompt_tokens"], tokens)
+
+
+def get_packer_stats() -> Dict:
+    """Prompt sizes and how much retrieved context the budget removed"""
+    with _stats_lock:
+        stats = dict(_stats)
+    requests = stats["requests"]
+    return {
+        "tokenizer": settings.LLM_TOKENIZER if get_tokenizer() is not None else "estimate",
+        "context_token_budget": settings.CONTEXT_TOKEN_BUDGET,
+        "ocr_max_tokens": settings.CONTEXT_OCR_MAX_TOKENS,
+        "requests": requests,
+        "avg_prompt_tokens": round(stats["prompt_tokens"] / requests, 1) if requests else 0.0,
+        "max_prompt_tokens": stats["max_prompt_tokens"],
+        "chunks_in": stats["chunks_in"],
+        "chunks_packed": stats["chunks_packed"],
+        "chunks_merged": stats["chunks_merged"],
+        "chunks_truncated": stats["chunks_truncated"],
+        "context_tokens_in": stats["context_tokens_in"],
+        "context_tokens_packed": stats["context_tokens_packed"]
+    }
@@ -0,0 +1,195 @@
+"""
+Knowledge Crawler - Concurrent page fetching for the knowledge refresh job
+Conditional GETs (ETag / Last-Modified) skip pages that have not changed
+"""
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+from ..config import settings
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+
+class ValidatorCache:
+    """
+    Per-URL HTTP validators (ETag, Last-Modified) and body hash, persisted as JSON
+
+    Entries are only recorded once the caller has processed a page, so a
+    page whose ingestion failed is fetched in full again on the next run.
+    Unchanged pages are recorded too: a server may add or rotate validators
+    without changing the body, and the next run should send the new ones.
+    """
+
+    def __init__(self, path: str = ""):
+        self.path = path
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Dict:
+        with self._lock:
+            return dict(self._entries.get(url, {}))
+
+    def record(self, url: str, validators: Dict):
+        """Remember the validators of a successfully processed page"""
+        with self._lock:
+            self._entries[url] = dict(validators, checked_at=time.time())
+
+    def record_results(self, results: Iterable[Dict], skip: Iterable[str] = ()):
+        """Remember the validators of every changed or unchanged result, except `skip`ped URLs"""
+        skip = set(skip)
+        for result in results:
+            if result["status"] in ("changed", "unchanged") and result["url"] not in skip and result.get("validators"):
+                self.record(result["url"], result["validators"])
+
+    def forget(self, url: str):
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            with self._lock:
+                self._entries = data.get("entries", {})
+            logger.info(f"Loaded validators for {len(self._entries)} pages from {self.path}")
+        except Exception as e:
+            logger.error(f"Failed to load crawler cache: {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        try:
+            with self._lock:
+                data = {"entries": dict(self._entries)}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to save crawler cache: {e}")
+
+
+def extract_text(html: str) -> str:
+    """Visible text of an HTML page, one phrase per line"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return "\n".join(chunk for chunk in chunks if chunk)
+
+
+async def fetch_page(client: httpx.AsyncClient, url: str, cached: Dict) -> Dict:
+    """
+    Fetch one page, conditionally if validators are known
+
+    Returns:
+        Dict with "url", "status" ("changed", "unchanged" or "error"), the new
+        "validators", and "html" for changed pages or "error" for failures
+    """
+    headers = {"User-Agent": USER_AGENT}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    try:
+        response = await client.get(url, headers=headers)
+        if response.status_code == 304:
+            # A 304 may carry updated validators
+            validators = {
+                "etag": response.headers.get("ETag") or cached.get("etag", ""),
+                "last_modified": response.headers.get("Last-Modified") or cached.get("last_modified", ""),
+                "body_hash": cached.get("body_hash", "")
+            }
+            return {"url": url, "status": "unchanged", "validators": validators}
+        response.raise_for_status()
+
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        validators = {
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+            "body_hash": body_hash
+        }
+        # Servers without validators still send the full page; an identical body needs no parsing
+        if cached.get("body_hash") == body_hash:
+            return {"url": url, "status": "unchanged", "validators": validators}
+        return {"url": url, "status": "changed", "validators": validators, "html": response.text}
+    except Exception as e:
+        logger.error(f"Error fetching {url}: {e}")
+        return {"url": url, "status": "error", "error": str(e)}
+
+
+async def crawl(
+    urls: Iterable[str],
+    cache: ValidatorCache,
+    force_urls: Iterable[str] = (),
+    client: Optional[httpx.AsyncClient] = None
+) -> List[Dict]:
+    """
+    Fetch pages concurrently, at most CRAWLER_PER_HOST_CONCURRENCY per host
+
+    Each request to a host is followed by a CRAWLER_HOST_DELAY_SECONDS pause
+    before that host's slot is released. URLs in `force_urls` are fetched
+    without validators (e.g. their document is missing from the database).
+
+    Returns:
+        One fetch_page result per distinct URL, in input order
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    force = set(force_urls)
+    total = asyncio.Semaphore(settings.CRAWLER_MAX_CONCURRENCY)
+    per_host: Dict[str, asyncio.Semaphore] = {}
+
+    own_client = client is None
+    if own_client:
+        client = httpx.AsyncClient(
+            timeout=settings.CRAWLER_TIMEOUT_SECONDS,
+            verify=settings.CRAWLER_VERIFY_SSL,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=settings.CRAWLER_MAX_CONCURRENCY)
+        )
+
+    async def fetch(url: str) -> Dict:
+        host = urlparse(url).netloc
+        host_slot = per_host.setdefault(host, asyncio.Semaphore(settings.CRAWLER_PER_HOST_CONCURRENCY))
+        async with host_slot:
+            async with total:
+                cached = {} if url in force else cache.get(url)
+                result = await fetch_page(client, url, cached)
+            # Politeness pause holds only this host's slot
+            if settings.CRAWLER_HOST_DELAY_SECONDS:
+                await asyncio.sleep(settings.CRAWLER_HOST_DELAY_SECONDS)
+            return result
+
+    try:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(fetch(url) for url in unique_urls))
+        counts = {status: sum(1 for r in results if r["status"] == status) for status in ("changed", "unchanged", "error")}
+        logger.info(
+            f"Crawled {len(results)} pages in {time.perf_counter() - start:.1f}s: "
+            f"{counts['changed']} changed, {counts['unchanged']} unchanged, {counts['error']} errors"
+        )
+        return list(results)
+    finally:
+        if own_client:
+            await client.aclose()
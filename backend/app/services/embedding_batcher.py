@@ -0,0 +1,115 @@
+"""
+Embedding Micro-Batcher - Coalesces concurrent embed requests into one encode call
+"""
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """
+    Collects embedding requests arriving within a short window and runs them
+    through a single encode call on a background worker thread.
+
+    Callers block on a Future, so the batcher can be used from request
+    handlers running in FastAPI's threadpool.
+    """
+
+    def __init__(self, encode_fn: Callable, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._carry: Optional[tuple] = None
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.max_observed_batch = 0
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._worker.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        """Queue texts for embedding and return a Future for their vectors"""
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((list(texts), future))
+        return future
+
+    def embed(self, texts: List[str]):
+        """Blocking helper: submit texts and wait for the result"""
+        return self.submit(texts).result()
+
+    def _collect_batch(self) -> List[tuple]:
+        """Block for the first request, then gather more until the batch is full or the window closes"""
+        first = self._carry if self._carry is not None else self._queue.get()
+        self._carry = None
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if size + len(item[0]) > self.max_batch_size:
+                # Keep the overflowing request for the next batch instead of splitting it
+                self._carry = item
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            all_texts = [text for texts, _ in batch for text in texts]
+            try:
+                embeddings = self.encode_fn(all_texts)
+            except Exception as e:
+                logger.error(f"Batched embedding failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for texts, future in batch:
+                future.set_result(embeddings[offset:offset + len(texts)])
+                offset += len(texts)
+
+            with self._stats_lock:
+                self.requests += len(batch)
+                self.texts += len(all_texts)
+                self.batches += 1
+                self.max_observed_batch = max(self.max_observed_batch, len(all_texts))
+
+    def stats(self) -> Dict:
+        """Batching efficiency counters"""
+        with self._stats_lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "requests": self.requests,
+                "texts": self.texts,
+                "batches": self.batches,
+                "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+                "max_observed_batch": self.max_observed_batch,
+                "queued": self._queue.qsize()
+            }
@@ -0,0 +1,153 @@
+"""
+Query Embedding Cache - Bounded LRU/TTL cache for query embeddings
+Repeated chat questions skip the embedding model entirely
+"""
+from collections import OrderedDict
+from typing import Dict, Optional
+import logging
+import os
+import pickle
+import re
+import string
+import threading
+import time
+import unicodedata
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Punctuation stripped from both ends of a query (includes the Devanagari danda)
+_EDGE_PUNCTUATION = string.punctuation + "।॥？！"
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize a query into a cache key
+
+    Applies NFKC normalization, case folding, whitespace collapsing and
+    strips surrounding punctuation, so "UPI fraud what to do?" and
+    "upi  fraud what to do" share one entry. Inner characters are left
+    untouched to keep Indic vowel signs intact.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _WHITESPACE_RE.sub(" ", text)
+    return text.strip().strip(_EDGE_PUNCTUATION).strip()
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU cache with per-entry TTL and optional on-disk persistence"""
+
+    def __init__(self, max_size: int = 2048, ttl_seconds: float = 3600, path: str = "", model_name: str = ""):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.model_name = model_name
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, query: str) -> Optional[np.ndarray]:
+        """Return the cached embedding for a query, or None on a miss"""
+        key = normalize_query(query)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            embedding, stored_at = entry
+            if self.ttl_seconds and now - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, query: str, embedding: np.ndarray):
+        """Store an embedding, evicting the least recently used entry when full"""
+        if self.max_size <= 0:
+            return
+        key = normalize_query(query)
+        with self._lock:
+            self._entries[key] = (embedding, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "persistent": bool(self.path)
+            }
+
+    def save(self):
+        """Persist entries to disk (no-op when no path is configured)"""
+        if not self.path:
+            return
+        try:
+            # Store ages rather than monotonic timestamps, which are meaningless across processes
+            now = time.monotonic()
+            with self._lock:
+                items = [(key, emb, now - stored_at) for key, (emb, stored_at) in self._entries.items()]
+
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"model": self.model_name, "items": items}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            logger.info(f"Saved {len(items)} cached query embeddings to {self.path}")
+        except Exception as e:
+            logger.error(f"Failed to save embedding cache: {e}")
+
+    def load(self):
+        """Load persisted entries, skipping expired ones and caches built by another model"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+
+            if data.get("model") != self.model_name:
+                logger.info("Embedding cache on disk was built with a different model. Ignoring it.")
+                return
+
+            now = time.monotonic()
+            loaded = 0
+            with self._lock:
+                for key, embedding, age in data.get("items", []):
+                    if self.ttl_seconds and age > self.ttl_seconds:
+                        continue
+                    embedding = np.asarray(embedding, dtype=np.float32)
+                    embedding.setflags(write=False)
+                    self._entries[key] = (embedding, now - age)
+                    loaded += 1
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+            logger.info(f"Loaded {loaded} cached query embeddings from {self.path}")
+        except Exception as e:
+            logger.error(f"Failed to load embedding cache: {e}")
@@ -2,33 +2,156 @@
 Embedding Service - Uses local sentence-transformers model
 """
 from sentence_transformers import SentenceTransformer
+from pathlib import Path
 from typing import List
+import numpy as np
 from ..config import settings
+from .embedding_cache import QueryEmbeddingCache
+from .embedding_batcher import EmbeddingBatcher
 import logging
 
 logger = logging.getLogger(__name__)
 
 _embedding_model = None
+_query_cache = None
+_batcher = None
+
+def _load_quantized_onnx_model(model_name: str, quantization: str) -> SentenceTransformer:
+    """
+    Load an int8 dynamically quantized ONNX model
+
+    Uses the quantized file published with the model if there is one,
+    otherwise exports and quantizes it once into EMBEDDING_ONNX_DIR.
+    """
+    file_name = f"onnx/model_qint8_{quantization}.onnx"
+    try:
+        return SentenceTransformer(model_name, backend="onnx", model_kwargs={"file_name": file_name})
+    except Exception as e:
+        logger.info(f"No published {file_name} for {model_name} ({e}). Exporting locally...")
+
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    local_dir = Path(settings.EMBEDDING_ONNX_DIR) / model_name.replace("/", "__")
+    if not (local_dir / file_name).exists():
+        onnx_model = SentenceTransformer(model_name, backend="onnx")
+        onnx_model.save_pretrained(str(local_dir))
+        export_dynamic_quantized_onnx_model(onnx_model, quantization, str(local_dir))
+        logger.info(f"Exported quantized ONNX model to {local_dir / file_name}")
+    return SentenceTransformer(str(local_dir), backend="onnx", model_kwargs={"file_name": file_name})
+
+def load_embedding_model(backend: str = "torch", quantization: str = "") -> SentenceTransformer:
+    """
+    Load the configured embedding model with the requested backend
+    
+    Args:
+        backend: "torch" or "onnx"
+        quantization: int8 quantization config for ONNX ("" for fp32)
+        
+    Returns:
+        SentenceTransformer instance
+    """
+    backend = backend.lower()
+    if backend == "torch":
+        return SentenceTransformer(settings.EMBEDDING_MODEL)
+    if backend == "onnx":
+        if quantization:
+            return _load_quantized_onnx_model(settings.EMBEDDING_MODEL, quantization)
+        return SentenceTransformer(settings.EMBEDDING_MODEL, backend="onnx")
+    raise ValueError(f"Unknown EMBEDDING_BACKEND: {backend}")
 
 def get_embedding_model():
     """Lazy load the embedding model"""
     global _embedding_model
     if _embedding_model is None:
-        logger.info(f"Loading embedding model: {settings.EMBEDDING_MODEL}")
-        _embedding_model = SentenceTransformer(settings.EMBEDDING_MODEL)
+        logger.info(f"Loading embedding model: {settings.EMBEDDING_MODEL} (backend={settings.EMBEDDING_BACKEND}, quantization={settings.EMBEDDING_ONNX_QUANTIZATION or 'none'})")
+        _embedding_model = load_embedding_model(settings.EMBEDDING_BACKEND, settings.EMBEDDING_ONNX_QUANTIZATION)
         logger.info("Embedding model loaded successfully")
     return _embedding_model
 
-def embed_text(texts: List[str]) -> List[List[float]]:
+def get_query_cache() -> QueryEmbeddingCache:
+    """Get or create the query embedding cache (loads persisted entries once)"""
+    global _query_cache
+    if _query_cache is None:
+        _query_cache = QueryEmbeddingCache(
+            max_size=settings.EMBEDDING_CACHE_SIZE,
+            ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+            path=settings.EMBEDDING_CACHE_PATH,
+            # Vectors differ slightly between backends, so they must not share cache entries
+            model_name=f"{settings.EMBEDDING_MODEL}|{settings.EMBEDDING_BACKEND}|{settings.EMBEDDING_ONNX_QUANTIZATION}"
+        )
+        _query_cache.load()
+    return _query_cache
+
+def _encode(texts: List[str]) -> np.ndarray:
+    """Run the embedding model on a list of texts"""
+    model = get_embedding_model()
+    return model.encode(texts, convert_to_numpy=True)
+
+def l2_normalize(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize embedding rows (zero vectors are left as-is)"""
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return embeddings / norms
+
+def get_batcher() -> EmbeddingBatcher:
+    """Get or create the shared embedding micro-batcher"""
+    global _batcher
+    if _batcher is None:
+        _batcher = EmbeddingBatcher(
+            _encode,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS
+        )
+    return _batcher
+
+def embed_text(texts: List[str], normalize: bool = False) -> np.ndarray:
     """
     Generate embeddings for a list of texts
     
+    Small requests (e.g. chat queries) are coalesced with concurrent callers
+    by the micro-batcher; large ingest batches are encoded directly.
+    
     Args:
         texts: List of text strings to embed
+        normalize: L2-normalize each row
         
     Returns:
-        List of embedding vectors (each is a list of floats)
+        C-contiguous float32 array of shape (len(texts), dim)
     """
-    model = get_embedding_model()
-    embeddings = model.encode(texts, convert_to_numpy=True)
-    return embeddings.tolist()
+    if settings.EMBEDDING_BATCHING_ENABLED and 0 < len(texts) < settings.EMBEDDING_BATCH_MAX_SIZE:
+        embeddings = get_batcher().embed(texts)
+    else:
+        embeddings = _encode(texts)
+    if normalize:
+        embeddings = l2_normalize(embeddings)
+    return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+def embed_query(query: str, normalize: bool = False) -> np.ndarray:
+    """
+    Embed a single search query, served from the query cache when possible
+    
+    Args:
+        query: User query text
+        normalize: L2-normalize the vector
+        
+    Returns:
+        Read-only float32 vector of shape (dim,)
+    """
+    cache = get_query_cache()
+    embedding = cache.get(query)
+    if embedding is None:
+        embedding = embed_text([query])[0].copy()
+        # Cached vectors are shared between requests, so guard against in-place edits
+        embedding.setflags(write=False)
+        cache.put(query, embedding)
+    if normalize:
+        embedding = l2_normalize(embedding)
+    return embedding
+
+def get_query_cache_stats() -> dict:
+    """Hit/miss counters for the query embedding cache"""
+    return get_query_cache().stats()
+
+def get_batcher_stats() -> dict:
+    """Batch size counters for the embedding micro-batcher"""
+    return get_batcher().stats()
@@ -0,0 +1,123 @@
+"""
+HTTP Connection Pools - Shared keep-alive clients for upstream LLM APIs
+One httpx.AsyncClient per upstream host, with connection reuse metrics
+"""
+from typing import Dict
+from ..config import settings
+import importlib.util
+import logging
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+OPENROUTER = "openrouter"
+OLLAMA = "ollama"
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+_metrics: Dict[str, dict] = {}
+
+
+def _http2_available() -> bool:
+    return settings.HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+
+
+def _new_metrics() -> dict:
+    return {
+        "requests": 0,
+        "new_connections": 0,
+        "connect_ms_total": 0.0,
+        "tls_ms_total": 0.0
+    }
+
+
+def _make_trace_hook(name: str):
+    """
+    Request hook that attaches an httpcore trace callback to every request,
+    recording when a new TCP/TLS connection had to be opened
+    """
+    metrics = _metrics[name]
+
+    async def on_request(request: httpx.Request):
+        metrics["requests"] += 1
+        started = {}
+
+        async def trace(event_name: str, info: dict):
+            if event_name.endswith(".started"):
+                started[event_name[:-len(".started")]] = time.perf_counter()
+            elif event_name == "connection.connect_tcp.complete":
+                metrics["new_connections"] += 1
+                metrics["connect_ms_total"] += (time.perf_counter() - started.get("connection.connect_tcp", time.perf_counter())) * 1000
+            elif event_name == "connection.start_tls.complete":
+                metrics["tls_ms_total"] += (time.perf_counter() - started.get("connection.start_tls", time.perf_counter())) * 1000
+
+        request.extensions["trace"] = trace
+
+    return on_request
+
+
+def _build_client(name: str, read_timeout: float) -> httpx.AsyncClient:
+    _metrics.setdefault(name, _new_metrics())
+    http2 = _http2_available()
+    logger.info(f"Creating HTTP pool '{name}' (max_connections={settings.HTTP_MAX_CONNECTIONS}, http2={http2})")
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            read=read_timeout,
+            write=settings.HTTP_CONNECT_TIMEOUT,
+            pool=settings.HTTP_CONNECT_TIMEOUT
+        ),
+        http2=http2,
+        event_hooks={"request": [_make_trace_hook(name)]}
+    )
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    """
+    Get the shared client for an upstream ("openrouter" or "ollama")
+
+    Clients are created lazily on the running event loop and reused for
+    every request to that host.
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        read_timeout = settings.OLLAMA_READ_TIMEOUT if name == OLLAMA else settings.HTTP_READ_TIMEOUT
+        client = _build_client(name, read_timeout)
+        _clients[name] = client
+    return client
+
+
+async def close_clients():
+    """Close all pooled connections (called on shutdown)"""
+    for name, client in list(_clients.items()):
+        await client.aclose()
+        logger.info(f"Closed HTTP pool '{name}'")
+    _clients.clear()
+
+
+def get_pool_stats() -> Dict:
+    """Per-upstream request and connection reuse counters"""
+    stats = {}
+    for name, m in _metrics.items():
+        reused = max(0, m["requests"] - m["new_connections"])
+        stats[name] = {
+            "requests": m["requests"],
+            "new_connections": m["new_connections"],
+            "reused_connections": reused,
+            "reuse_ratio": round(reused / m["requests"], 4) if m["requests"] else 0.0,
+            "avg_connect_ms": round(m["connect_ms_total"] / m["new_connections"], 2) if m["new_connections"] else 0.0,
+            "avg_tls_ms": round(m["tls_ms_total"] / m["new_connections"], 2) if m["new_connections"] else 0.0,
+            "open": name in _clients and not _clients[name].is_closed
+        }
+    return {
+        "http2": _http2_available(),
+        "max_connections": settings.HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        "pools": stats
+    }
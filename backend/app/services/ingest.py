@@ -12,75 +12,294 @@ sys.path.append(str(backend_dir))
 
 from app.db import SessionLocal, init_db, engine
 from app.models import PoliceStation, Document, Resource
+from app.services.chunker import chunk_text
 from app.services.embedding_client import embed_text
-from app.services.rag import get_collection
-import uuid
+from app.services.query_intent import GENERAL_TOPIC, classify_topic, detect_script_language
+from app.config import settings
+from app.services.rag import get_chroma_client, get_collection, get_loaded_lexical_index, note_chunks_changed
+from app.services.vector_snapshot import build_snapshot
+from typing import Dict, Iterable, Iterator, List, Optional
+import hashlib
 import logging
 
+import numpy as np
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 100) -> list[str]:
-    """Split text into chunks"""
-    if not text:
-        return []
+def chunk_id(doc_id: int, index: int) -> str:
+    """Deterministic Chroma id for a document chunk, so re-ingesting overwrites it"""
+    return f"doc{doc_id}-{index}"
+
+def content_hash(text: str) -> str:
+    """Hash of a chunk's text, stored in its metadata to detect changes"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+def document_tags(doc: Document) -> Dict:
+    """
+    Filterable metadata shared by all chunks of a document: its category,
+    language (by script) and topic (from its labels, else its text)
+    """
+    category = getattr(doc, "category", None) or ""
+    labels = f"{doc.source} {doc.title or ''} {doc.section or ''} {category}"
+    return {
+        "category": category,
+        "language": detect_script_language(doc.content[:2000]),
+        "topic": classify_topic(labels) or classify_topic(doc.content) or GENERAL_TOPIC
+    }
+
+def _document_metadata(doc: Document, index: int, chunk: str, tags: Dict) -> Dict:
+    return {
+        "source": doc.source,
+        "title": doc.title or "",
+        "section": doc.section or "",
+        "url": doc.url or "",
+        **tags,
+        "doc_id": doc.id,
+        "chunk_index": index,
+        "content_hash": content_hash(chunk)
+    }
+
+def chroma_max_batch_size(client=None) -> int:
+    """Largest batch Chroma accepts in one add/upsert/delete, capped by INGEST_WRITE_BATCH_SIZE"""
+    client = client or get_chroma_client()
+    try:
+        limit = client.get_max_batch_size()
+    except AttributeError:
+        limit = getattr(client, "max_batch_size", settings.INGEST_WRITE_BATCH_SIZE)
+    return max(1, min(settings.INGEST_WRITE_BATCH_SIZE, limit))
+
+class _ChunkWriter:
+    """
+    Buffers chunk writes across documents
+
+    Texts are embedded in fixed-size batches regardless of which document
+    they came from; upserts and deletes go to Chroma in batches of up to
+    `write_batch_size`. If a lexical index is given, every Chroma write is
+    applied to it too.
+    """
+
+    def __init__(self, collection, embed_batch_size: int, write_batch_size: int, lexical_index=None):
+        self.collection = collection
+        self.lexical_index = lexical_index
+        self.embed_batch_size = embed_batch_size
+        self.write_batch_size = write_batch_size
+        self._to_embed = []   # (id, text, metadata, is_new)
+        self._ready = []      # (id, text, metadata, embedding, is_new)
+        self._deletes = []
+        self.written_added = 0
+        self.written_removed = 0
+        self.embedded = 0
+        self.embed_calls = 0
+        self.write_calls = 0
+
+    def upsert(self, chunk_id: str, text: str, metadata: Dict, is_new: bool, embedding=None):
+        if embedding is None:
+            self._to_embed.append((chunk_id, text, metadata, is_new))
+            if len(self._to_embed) >= self.embed_batch_size:
+                self._embed_pending()
+        else:
+            self._ready.append((chunk_id, text, metadata, embedding, is_new))
+            self._write_ready()
+
+    def delete(self, ids: List[str]):
+        self._deletes.extend(ids)
+        while len(self._deletes) >= self.write_batch_size:
+            self._delete(self._deletes[:self.write_batch_size])
+            self._deletes = self._deletes[self.write_batch_size:]
+
+    def _embed_pending(self):
+        if not self._to_embed:
+            return
+        embeddings = embed_text([text for _, text, _, _ in self._to_embed])
+        self.embedded += len(self._to_embed)
+        self.embed_calls += 1
+        for (chunk_id, text, metadata, is_new), embedding in zip(self._to_embed, embeddings):
+            self._ready.append((chunk_id, text, metadata, embedding, is_new))
+        self._to_embed = []
+        self._write_ready()
+
+    def _write_ready(self, force: bool = False):
+        while len(self._ready) >= self.write_batch_size or (force and self._ready):
+            batch = self._ready[:self.write_batch_size]
+            self._ready = self._ready[self.write_batch_size:]
+            ids = [row[0] for row in batch]
+            documents = [row[1] for row in batch]
+            metadatas = [row[2] for row in batch]
+            # float32 (n_chunks, dim) array, handed to Chroma without a Python list round-trip
+            self.collection.upsert(
+                ids=ids,
+                embeddings=np.asarray([row[3] for row in batch], dtype=np.float32),
+                documents=documents,
+                metadatas=metadatas
+            )
+            if self.lexical_index is not None:
+                self.lexical_index.upsert(ids, documents, metadatas)
+            self.written_added += sum(1 for row in batch if row[4])
+            self.write_calls += 1
+
+    def _delete(self, ids: List[str]):
+        self.collection.delete(ids=ids)
+        if self.lexical_index is not None:
+            self.lexical_index.remove(ids)
+        self.written_removed += len(ids)
+        self.write_calls += 1
+
+    def flush(self):
+        self._embed_pending()
+        self._write_ready(force=True)
+        if self._deletes:
+            self._delete(self._deletes)
+            self._deletes = []
+
+def _batched(items: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def ingest_documents(docs: Iterable[Document], collection=None, embed_batch_size: Optional[int] = None, write_batch_size: Optional[int] = None) -> Dict[str, int]:
+    """
+    Ingest many documents into ChromaDB (assuming they're already in SQL)
+    
+    Documents are consumed as a stream. Their currently indexed chunks are
+    looked up INGEST_DOCUMENT_GROUP_SIZE documents at a time, and chunks
+    from consecutive documents share embedding and write batches.
+    
+    Incremental: chunks whose text and metadata are unchanged are left alone,
+    new or changed chunks are upserted, and chunks a document no longer has
+    are deleted. Embeddings are only computed for chunk texts that are not
+    already indexed for the document (a chunk that merely moved keeps its
+    stored embedding).
     
-    chunks = []
-    start = 0
-    text_len = len(text)
+    Args:
+        docs: Documents (anything with id/source/title/section/url/content)
+        collection: Target collection (default: the app's collection)
+        embed_batch_size: Texts per embedding call (default INGEST_EMBED_BATCH_SIZE)
+        write_batch_size: Chunks per Chroma write (default: Chroma's max batch size,
+            see chroma_max_batch_size for other collections)
     
-    while start < text_len:
-        end = start + chunk_size
-        chunk = text[start:end]
-        chunks.append(chunk)
-        start += (chunk_size - overlap)
+    When RETRIEVAL_ENGINE is "snapshot", the vector snapshot of the app's
+    collection is rewritten after any change.
+    
+    Returns:
+        Counts of documents and added/updated/removed/unchanged/embedded chunks
+    """
+    default_collection = collection is None
+    if default_collection:
+        collection = get_collection()
+    # Keep this process's BM25 index (if built) in step with the collection
+    lexical_index = get_loaded_lexical_index() if default_collection else None
+    writer = _ChunkWriter(
+        collection,
+        embed_batch_size or settings.INGEST_EMBED_BATCH_SIZE,
+        write_batch_size or (chroma_max_batch_size() if default_collection else settings.INGEST_WRITE_BATCH_SIZE),
+        lexical_index
+    )
+    stats = {"documents": 0, "added": 0, "updated": 0, "removed": 0, "unchanged": 0, "embedded": 0}
+    
+    try:
+        for group in _batched(docs, settings.INGEST_DOCUMENT_GROUP_SIZE):
+            # What is indexed for these documents now (including chunks with legacy random ids)
+            doc_ids = [doc.id for doc in group]
+            existing = collection.get(
+                where={"doc_id": {"$in": doc_ids}} if len(doc_ids) > 1 else {"doc_id": doc_ids[0]},
+                include=["metadatas", "embeddings"]
+            )
+            existing_embeddings = existing["embeddings"] if existing.get("embeddings") is not None else [None] * len(existing["ids"])
+            indexed: Dict[int, Dict] = {doc_id: {"meta": {}, "embeddings": {}} for doc_id in doc_ids}
+            for existing_id, meta, embedding in zip(existing["ids"], existing["metadatas"], existing_embeddings):
+                entry = indexed[meta["doc_id"]]
+                entry["meta"][existing_id] = meta
+                if meta.get("content_hash") and embedding is not None:
+                    entry["embeddings"].setdefault(meta["content_hash"], embedding)
+            
+            for doc in group:
+                entry = indexed[doc.id]
+                chunks = chunk_text(doc.content)
+                ids = [chunk_id(doc.id, i) for i in range(len(chunks))]
+                new_ids = set(ids)
+                tags = document_tags(doc)
+                
+                for i, chunk in enumerate(chunks):
+                    metadata = _document_metadata(doc, i, chunk, tags)
+                    previous = entry["meta"].get(ids[i])
+                    if previous == metadata:
+                        stats["unchanged"] += 1
+                        continue
+                    stats["added" if previous is None else "updated"] += 1
+                    reuse = entry["embeddings"].get(metadata["content_hash"])
+                    writer.upsert(ids[i], chunk, metadata, previous is None, reuse)
+                
+                removed_ids = [cid for cid in entry["meta"] if cid not in new_ids]
+                stats["removed"] += len(removed_ids)
+                writer.delete(removed_ids)
+                stats["documents"] += 1
         
-    return chunks
+        writer.flush()
+    finally:
+        stats["embedded"] = writer.embedded
+        if default_collection and (writer.written_added or writer.written_removed or writer.write_calls):
+            note_chunks_changed(writer.written_added - writer.written_removed, lexical_index)
+    
+    if default_collection and settings.RETRIEVAL_ENGINE == "snapshot" and writer.write_calls:
+        try:
+            build_snapshot(collection)
+        except Exception as e:
+            logger.error(f"Could not rebuild the vector snapshot: {e}")
+    
+    logger.info(
+        f"Ingested {stats['documents']} documents: {stats['added']} added, {stats['updated']} updated, "
+        f"{stats['removed']} removed, {stats['unchanged']} unchanged chunks "
+        f"({stats['embedded']} embedded in {writer.embed_calls} batches, {writer.write_calls} Chroma writes)"
+    )
+    return stats
 
-def ingest_document(doc: Document):
+def ingest_document(doc: Document, collection=None) -> Optional[Dict[str, int]]:
     """
     Ingest a document into ChromaDB (assuming it's already in SQL)
+    
+    Single-document form of ingest_documents.
+    
+    Returns:
+        Counts of added/updated/removed/unchanged/embedded chunks, or None on error
     """
     try:
-        collection = get_collection()
-        chunks = chunk_text(doc.content)
-        
-        if not chunks:
-            return
-            
-        ids = []
-        embeddings = []
-        documents = []
-        metadatas = []
-        
-        batch_embeddings = embed_text(chunks)
-        
-        for i, chunk in enumerate(chunks):
-            chunk_id = str(uuid.uuid4())
-            ids.append(chunk_id)
-            documents.append(chunk)
-            # embeddings.append(batch_embeddings[i]) # handled by collection.add usually, but we pre-computed
-            
-            metadatas.append({
-                "source": doc.source,
-                "title": doc.title or "",
-                "section": doc.section or "",
-                "url": doc.url or "",
-                "doc_id": doc.id,
-                "chunk_index": i
-            })
-            
-        collection.add(
-            ids=ids,
-            embeddings=batch_embeddings,
-            documents=documents,
-            metadatas=metadatas
-        )
-        logger.info(f"Ingested document {doc.id} with {len(chunks)} chunks")
-        
+        return ingest_documents([doc], collection=collection)
     except Exception as e:
         logger.error(f"Error ingesting document {doc.id}: {e}")
+        return None
+
+def load_documents(records: Iterable[Dict], batch_size: Optional[int] = None) -> Dict[str, int]:
+    """
+    Bulk-load documents into SQL and ChromaDB
+    
+    Records (Document column values) are inserted INGEST_SQL_BATCH_SIZE at a
+    time with one commit per batch, and streamed straight into ingest_documents.
+    
+    Returns:
+        ingest_documents counts
+    """
+    batch_size = batch_size or settings.INGEST_SQL_BATCH_SIZE
+    # Committed rows keep their loaded values, so chunking them doesn't re-select each one
+    db = SessionLocal(expire_on_commit=False)
+    
+    def inserted():
+        for batch in _batched(records, batch_size):
+            docs = [Document(**record) for record in batch]
+            db.add_all(docs)
+            db.commit()
+            yield from docs
+    
+    try:
+        return ingest_documents(inserted())
+    finally:
+        db.close()
 
 def ingest_sops():
     """Ingest standard Cyber SOPs into ChromaDB"""
@@ -126,29 +345,18 @@ def ingest_sops():
         }
     ]
     
+    # Check which already exist in DB to avoid duplicates
     db = SessionLocal()
-    count = 0
+    try:
+        titles = [sop["title"] for sop in sops]
+        existing = {title for (title,) in db.query(Document.title).filter(Document.title.in_(titles))}
+    finally:
+        db.close()
     
-    for sop in sops:
-        # Check if already exists in DB to avoid duplicates
-        existing = db.query(Document).filter(Document.title == sop["title"]).first()
-        if existing:
-            continue
-            
-        # Add to SQL DB
-        doc = Document(
-            source=sop["source"],
-            title=sop["title"],
-            section=sop["section"],
-            content=sop["content"],
-            category="SOP"
-        )
-        db.add(doc)
-        db.commit() # Commit to get ID
-        db.refresh(doc)
-        
-        ingest_document(doc)
-        count += 1
+    new_sops = [dict(sop, category="SOP") for sop in sops if sop["title"] not in existing]
+    count = len(new_sops)
+    if new_sops:
+        load_documents(new_sops)
     
     logger.info(f"Ingested {count} new SOP documents")
 
@@ -0,0 +1,159 @@
+"""
+Lexical Index - In-process BM25 over the indexed chunks
+Catches exact tokens dense retrieval misses ("1930", "CEIR", "UTR", "TAFCOP")
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+# Word characters plus Indic letters and vowel signs (U+0900-U+0DFF, minus the dandas),
+# which \w alone would split words on
+_TOKEN_RE = re.compile(r"[\w\u0900-\u0963\u0966-\u0DFF]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from has have how i if in is it me my of on or "
+    "so that the this to was what when where which who why will with you your".split()
+)
+
+
+def matches_filters(metadata: Dict, filters: Optional[Dict]) -> bool:
+    """Whether chunk metadata satisfies retrieval filters ({key: value or list of values}, as rag.where_clause)"""
+    if not filters:
+        return True
+    for key, wanted in filters.items():
+        if wanted is None or wanted == "" or wanted == []:
+            continue
+        value = metadata.get(key)
+        if isinstance(wanted, (list, tuple, set)):
+            if value not in wanted:
+                return False
+        elif value != wanted:
+            return False
+    return True
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens (NFKC), English stopwords removed"""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return [t for t in _TOKEN_RE.findall(text) if t not in _STOPWORDS and t != "_"]
+
+
+class LexicalIndex:
+    """
+    BM25 inverted index over chunk texts, updated in place on upsert/remove
+
+    Also keeps each chunk's text and metadata so lexical-only hits can be
+    returned without a vector store round-trip.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._chunks: Dict[str, Tuple[str, Dict]] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+        self.version: Optional[int] = None  # knowledge-base version the index reflects
+        self.built_at = 0.0
+        self.searches = 0
+        self.search_us_total = 0.0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def _remove(self, chunk_id: str):
+        if chunk_id not in self._lengths:
+            return
+        text, _ = self._chunks.pop(chunk_id)
+        for term in set(tokenize(text)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(chunk_id)
+
+    def upsert(self, ids: Iterable[str], texts: Iterable[str], metadatas: Iterable[Dict]):
+        """Add or replace chunks"""
+        with self._lock:
+            for chunk_id, text, metadata in zip(ids, texts, metadatas):
+                self._remove(chunk_id)
+                terms = tokenize(text)
+                for term, tf in Counter(terms).items():
+                    self._postings.setdefault(term, {})[chunk_id] = tf
+                self._lengths[chunk_id] = len(terms)
+                self._total_length += len(terms)
+                self._chunks[chunk_id] = (text, metadata or {})
+
+    def remove(self, ids: Iterable[str]):
+        """Drop chunks (unknown ids are ignored)"""
+        with self._lock:
+            for chunk_id in ids:
+                self._remove(chunk_id)
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._lengths.clear()
+            self._chunks.clear()
+            self._total_length = 0
+
+    def search(self, query: str, top_k: int = 20, filters: Optional[Dict] = None) -> List[Tuple[str, float]]:
+        """(chunk id, BM25 score) pairs, best first, optionally only chunks matching `filters`"""
+        start = time.perf_counter()
+        with self._lock:
+            n = len(self._lengths)
+            if n == 0:
+                return []
+            avg_length = self._total_length / n
+            scores: Dict[str, float] = {}
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for chunk_id, tf in postings.items():
+                    if filters and not matches_filters(self._chunks[chunk_id][1], filters):
+                        continue
+                    norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[chunk_id] / avg_length)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+        results = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        self.searches += 1
+        self.search_us_total += (time.perf_counter() - start) * 1e6
+        return results
+
+    def get(self, chunk_id: str) -> Optional[Tuple[str, Dict]]:
+        """Stored (text, metadata) of a chunk"""
+        return self._chunks.get(chunk_id)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "chunks": len(self._lengths),
+                "terms": len(self._postings),
+                "version": self.version,
+                "built_at": self.built_at,
+                "searches": self.searches,
+                "avg_search_us": round(self.search_us_total / self.searches, 1) if self.searches else 0.0
+            }
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked id lists: score(id) = sum over lists of 1 / (k + rank)
+
+    Returns:
+        (id, fused score) pairs, best first; ties keep first-list order
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, 1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -1,15 +1,50 @@
 """
 LLM Client - Connects to Ollama for local LLM inference and OpenRouter for Multi-language
 """
-import requests
+import asyncio
+import httpx
 import json
+from typing import Awaitable, Callable, Optional, Tuple
 from ..config import settings
+from .http_pool import get_client, OPENROUTER, OLLAMA
+from .model_router import ModelRouter
+from .llm_limiter import get_limiter, LLMQueueFull, Priority
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
-def query_openrouter(prompt: str, model: str, stream: bool = False, temperature: float = 0.2):
-    """Query OpenRouter API"""
+_model_router = None
+
+def get_model_router() -> ModelRouter:
+    """Get or create the OpenRouter model router (per-process circuit breaker state)"""
+    global _model_router
+    if _model_router is None:
+        _model_router = ModelRouter(
+            failure_threshold=settings.OPENROUTER_CIRCUIT_FAILURE_THRESHOLD,
+            base_cooldown=settings.OPENROUTER_CIRCUIT_COOLDOWN_SECONDS,
+            max_cooldown=settings.OPENROUTER_CIRCUIT_MAX_COOLDOWN_SECONDS
+        )
+    return _model_router
+
+def check_admission(language: str, priority: Priority = Priority.CHAT):
+    """
+    Fail fast with LLMQueueFull if the backend serving `language` cannot take
+    another request, so streaming endpoints can answer 503 before they start
+    """
+    backend = OLLAMA if language.lower() in ["english", "en"] else OPENROUTER
+    get_limiter(backend).check(priority)
+
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+def _messages(prompt: str, system: str = "") -> list:
+    """Chat messages with the (stable, cacheable) system prompt first"""
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+def _openrouter_request(prompt: str, model: str, stream: bool, temperature: float, system: str = ""):
+    """Headers and payload for an OpenRouter chat completion"""
     headers = {
         "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
         "Content-Type": "application/json",
@@ -19,43 +54,112 @@ def query_openrouter(prompt: str, model: str, stream: bool = False, temperature:
     
     payload = {
         "model": model,
-        "messages": [{"role": "user", "content": prompt}],
+        "messages": _messages(prompt, system),
         "temperature": temperature,
         "stream": stream
     }
+    return headers, payload
+
+def _ollama_payload(prompt: str, temperature: float, max_tokens: int, language: str, stream: bool, system: str = "") -> dict:
+    """
+    Request body for Ollama /api/chat
+    
+    The system message goes first and does not vary between requests, so
+    Ollama can reuse its evaluated tokens while the model is kept loaded
+    (keep_alive); only the context and query are evaluated per request.
+    """
+    # Add system instruction for language if local LLM is used (end of the system message, keeping the prefix stable)
+    if language.lower() not in ["english", "en"]:
+        system = f"{system}\n\n[SYSTEM: Respond strictly in {language} language.]".lstrip()
+
+    return {
+        "model": settings.LLM_MODEL,
+        "messages": _messages(prompt, system),
+        "stream": stream,
+        "keep_alive": settings.LLM_KEEP_ALIVE,
+        "options": {
+            "temperature": temperature,
+            "num_predict": max_tokens,
+            "repeat_penalty": 1.1,
+        }
+    }
+
+_prompt_eval_stats = {
+    "requests": 0,
+    "prompt_tokens": 0,
+    "prompt_eval_ms": 0.0
+}
+
+def _record_prompt_eval(result: dict):
+    """Accumulate Ollama's prompt evaluation counters from a final response"""
+    if "prompt_eval_duration" not in result:
+        return
+    # Tokens served from the cached prefix are not counted in prompt_eval_count
+    _prompt_eval_stats["requests"] += 1
+    _prompt_eval_stats["prompt_tokens"] += result.get("prompt_eval_count", 0)
+    _prompt_eval_stats["prompt_eval_ms"] += result["prompt_eval_duration"] / 1e6
+
+def get_prompt_eval_stats() -> dict:
+    """Average prompt tokens evaluated and prompt evaluation time per Ollama request"""
+    requests = _prompt_eval_stats["requests"]
+    return {
+        "requests": requests,
+        "keep_alive": settings.LLM_KEEP_ALIVE,
+        "avg_prompt_tokens_evaluated": round(_prompt_eval_stats["prompt_tokens"] / requests, 1) if requests else 0.0,
+        "avg_prompt_eval_ms": round(_prompt_eval_stats["prompt_eval_ms"] / requests, 2) if requests else 0.0
+    }
+
+async def query_openrouter(prompt: str, model: str, temperature: float = 0.2, system: str = "") -> httpx.Response:
+    """Query OpenRouter API (non-streaming) over the shared connection pool"""
+    headers, payload = _openrouter_request(prompt, model, False, temperature, system)
+    return await get_client(OPENROUTER).post(OPENROUTER_URL, headers=headers, json=payload)
+
+async def openrouter_completion(prompt: str, temperature: float = 0.2, priority: Priority = Priority.CHAT, system: str = "") -> Tuple[Optional[str], Optional[str]]:
+    """
+    Try OpenRouter models (best recent performers first) until one answers
+    
+    Raises:
+        LLMQueueFull: if the OpenRouter admission queue is full
     
-    return requests.post(
-        "https://openrouter.ai/api/v1/chat/completions",
-        headers=headers,
-        json=payload,
-        stream=stream,
-        timeout=60
-    )
+    Returns:
+        (answer, model) or (None, None) if every model failed
+    """
+    router = get_model_router()
+    for model in router.ordered_models(settings.openrouter_models_list):
+        async with get_limiter(OPENROUTER).slot(priority):
+            start = time.perf_counter()
+            try:
+                logger.info(f"Trying OpenRouter model: {model}")
+                response = await query_openrouter(prompt, model, temperature=temperature, system=system)
+                
+                if response.status_code == 200:
+                    data = response.json()
+                    answer = data["choices"][0]["message"]["content"]
+                    router.record_success(model, time.perf_counter() - start)
+                    logger.info(f"OpenRouter Success ({model})")
+                    return answer, model
+                else:
+                    router.record_failure(model, response.status_code)
+                    logger.warning(f"OpenRouter Error ({model}): {response.status_code} - {response.text}")
+            except Exception as e:
+                router.record_failure(model, error=str(e))
+                logger.error(f"OpenRouter Exception ({model}): {e}")
+    return None, None
 
-def generate_response(prompt: str, temperature: float = 0.2, max_tokens: int = 2000, language: str = "English") -> str:
+async def generate_response(prompt: str, temperature: float = 0.2, max_tokens: int = 2000, language: str = "English", priority: Priority = Priority.CHAT, system: str = "") -> str:
     """
     Generate a response using OpenRouter (Non-English) or Ollama (English/Fallback)
+    
+    Raises:
+        LLMQueueFull: if the local LLM's admission queue is full
     """
     # 1. Try OpenRouter for Non-English
     if language.lower() not in ["english", "en"]:
         try:
             logger.info(f"Non-English ({language}) detected. Attempting OpenRouter...")
-            models_to_try = settings.openrouter_models_list
-            
-            for model in models_to_try:
-                try:
-                    logger.info(f"Trying OpenRouter model: {model}")
-                    response = query_openrouter(prompt, model, stream=False, temperature=temperature)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        answer = data["choices"][0]["message"]["content"]
-                        logger.info(f"OpenRouter Success ({model})")
-                        return answer
-                    else:
-                        logger.warning(f"OpenRouter Error ({model}): {response.status_code} - {response.text}")
-                except Exception as e:
-                    logger.error(f"OpenRouter Exception ({model}): {e}")
+            answer, _ = await openrouter_completion(prompt, temperature, priority, system)
+            if answer is not None:
+                return answer
             
             logger.warning("All OpenRouter models failed. Falling back to Local LLM.")
         except Exception as e:
@@ -63,140 +167,335 @@ def generate_response(prompt: str, temperature: float = 0.2, max_tokens: int = 2
 
     # 2. Local LLM (Ollama) - Default / Fallback
     try:
-        url = f"{settings.LLM_ENDPOINT}/api/generate"
-        
-        # Add system instruction for language if local LLM is used
-        final_prompt = prompt
-        if language.lower() not in ["english", "en"]:
-            final_prompt = f"[SYSTEM: Respond strictly in {language} language.]\n\n{prompt}"
-
-        payload = {
-            "model": settings.LLM_MODEL,
-            "prompt": final_prompt,
-            "stream": False,
-            "options": {
-                "temperature": temperature,
-                "num_predict": max_tokens,
-                "repeat_penalty": 1.1,
-            }
-        }
+        url = f"{settings.LLM_ENDPOINT}/api/chat"
+        payload = _ollama_payload(prompt, temperature, max_tokens, language, stream=False, system=system)
         
         logger.info(f"Sending request to Ollama: {settings.LLM_MODEL}")
-        response = requests.post(url, json=payload, timeout=120)
+        async with get_limiter(OLLAMA).slot(priority):
+            response = await get_client(OLLAMA).post(url, json=payload)
         response.raise_for_status()
         
         result = response.json()
-        answer = result.get("response", "").strip()
+        _record_prompt_eval(result)
+        answer = result.get("message", {}).get("content", "").strip()
         
         logger.info(f"Received response from Ollama ({len(answer)} chars)")
         return answer
         
-    except requests.exceptions.ConnectionError:
+    except LLMQueueFull:
+        raise
+    except httpx.ConnectError:
         logger.error("Cannot connect to Ollama.")
         return "Error: Cannot connect to the local LLM. Please ensure Ollama is running."
     except Exception as e:
         logger.error(f"Error generating response: {str(e)}")
         return f"Error generating response: {str(e)}"
 
-def generate_streaming_response(prompt: str, temperature: float = 0.2, max_tokens: int = 4000, language: str = "English"):
+class _StreamFailed(Exception):
+    """An OpenRouter stream failed before producing any token"""
+
+class GenerationFailed(Exception):
+    """The upstream LLM stream failed; any text already yielded is incomplete"""
+
+async def _stream_openrouter_model(prompt: str, model: str, temperature: float, priority: Priority = Priority.CHAT, system: str = ""):
     """
-    Generate a streaming response using OpenRouter or Ollama
+    Stream tokens from one OpenRouter model, recording the outcome with the model router
+    
+    Holds an OpenRouter admission slot while streaming. Raises _StreamFailed
+    if the model errors out before its first token, so callers can move on
+    to another model.
+    """
+    router = get_model_router()
+    async with get_limiter(OPENROUTER).slot(priority):
+        start = time.perf_counter()
+        first_token = False
+        try:
+            headers, payload = _openrouter_request(prompt, model, True, temperature, system)
+            async with get_client(OPENROUTER).stream("POST", OPENROUTER_URL, headers=headers, json=payload) as response:
+                if response.status_code != 200:
+                    await response.aread() # read the error body so the connection is reused
+                    router.record_failure(model, response.status_code)
+                    raise _StreamFailed(f"HTTP {response.status_code}")
+
+                logger.info(f"OpenRouter Stream Connected ({model})")
+                async for decoded in response.aiter_lines():
+                    if decoded.startswith('data: '):
+                        try:
+                            json_str = decoded[6:] # key 'data: '
+                            if json_str.strip() == '[DONE]': continue # drain so the connection can be reused
+                        
+                            chunk = json.loads(json_str)
+                            content = chunk['choices'][0]['delta'].get('content', '')
+                        except (ValueError, KeyError, IndexError):
+                            continue
+                        if content:
+                            if not first_token:
+                                first_token = True
+                                router.record_success(model, time.perf_counter() - start)
+                            yield content
+                    elif decoded.startswith(':') or not decoded.strip():
+                        continue # Keep-alive or empty
+                    else:
+                        logger.warning(f"Unexpected Line format: {decoded}")
+
+                if not first_token:
+                    router.record_failure(model, error="empty stream")
+                    raise _StreamFailed("empty stream")
+        except _StreamFailed:
+            raise
+        except Exception as e:
+            if first_token:
+                raise
+            router.record_failure(model, error=str(e))
+            raise _StreamFailed(str(e)) from e
+
+_hedge_stats = {
+    "requests": 0,
+    "hedged_requests": 0,
+    "hedges_launched": 0,
+    "hedge_wins": 0,
+    "primary_wins": 0,
+    "losers_cancelled": 0
+}
+
+def get_hedge_stats() -> dict:
+    """Counters for hedged OpenRouter streaming"""
+    hedged = _hedge_stats["hedged_requests"]
+    return {
+        **_hedge_stats,
+        "enabled": settings.OPENROUTER_HEDGING_ENABLED,
+        "hedge_win_rate": round(_hedge_stats["hedge_wins"] / hedged, 4) if hedged else 0.0
+    }
+
+async def _hedged_openrouter_stream(prompt: str, models: list, temperature: float, priority: Priority = Priority.CHAT, system: str = ""):
+    """
+    Stream from OpenRouter, racing a backup model when the first one is slow
+    
+    If no token arrives within OPENROUTER_HEDGE_DELAY_MS, the next model is
+    started in parallel (at most OPENROUTER_HEDGE_MAX_EXTRA extra requests,
+    and overall no more than OPENROUTER_HEDGE_MAX_RATIO hedges per request).
+    Whichever model produces a token first wins; the others are cancelled,
+    which closes their upstream connections.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    pending = list(models)
+    tasks = {}
+    active = set()
+    hedged_models = set()
+    delay = settings.OPENROUTER_HEDGE_DELAY_MS / 1000
+    _hedge_stats["requests"] += 1
+
+    async def run(model: str):
+        try:
+            async for content in _stream_openrouter_model(prompt, model, temperature, priority, system):
+                await queue.put((model, "token", content))
+            await queue.put((model, "done", None))
+        except Exception as e:
+            await queue.put((model, "failed", e))
+
+    def launch() -> str:
+        model = pending.pop(0)
+        logger.info(f"Trying OpenRouter Stream: {model}")
+        tasks[model] = asyncio.create_task(run(model))
+        active.add(model)
+        return model
+
+    def can_hedge() -> bool:
+        within_ratio = _hedge_stats["hedges_launched"] < settings.OPENROUTER_HEDGE_MAX_RATIO * _hedge_stats["requests"]
+        return bool(pending) and len(hedged_models) < settings.OPENROUTER_HEDGE_MAX_EXTRA and within_ratio
+
+    launch()
+    winner = None
+    try:
+        while True:
+            timeout = delay if winner is None and can_hedge() else None
+            try:
+                model, kind, value = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                hedge = launch()
+                hedged_models.add(hedge)
+                _hedge_stats["hedges_launched"] += 1
+                if len(hedged_models) == 1:
+                    _hedge_stats["hedged_requests"] += 1
+                logger.info(f"No first token after {delay:.1f}s, hedging with {hedge}")
+                continue
+
+            if winner is None:
+                if kind == "token":
+                    winner = model
+                    for loser in active - {model}:
+                        tasks[loser].cancel()
+                        _hedge_stats["losers_cancelled"] += 1
+                    if hedged_models:
+                        _hedge_stats["hedge_wins" if model in hedged_models else "primary_wins"] += 1
+                    yield value
+                    continue
+
+                # Failed before its first token: fall back to the next model (not counted as a hedge)
+                logger.warning(f"OpenRouter Stream Failed ({model}): {value}")
+                active.discard(model)
+                if pending:
+                    launch()
+                elif not active:
+                    raise _StreamFailed("all OpenRouter models failed")
+            elif model == winner:
+                if kind == "token":
+                    yield value
+                elif kind == "done":
+                    return
+                else:
+                    raise value
+    finally:
+        for task in tasks.values():
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+async def _generate_stream(prompt: str, temperature: float, max_tokens: int, language: str, priority: Priority, system: str):
+    """
+    Stream tokens from OpenRouter (Non-English) or Ollama (English/Fallback)
+    
+    Upstream streams are read over the shared keep-alive connection pools
+    so a single worker can serve many concurrent chats.
     """
     # 1. Try OpenRouter for Non-English
     if language.lower() not in ["english", "en"]:
+        streamed = False
         try:
             logger.info(f"Non-English ({language}) Stream. Attempting OpenRouter...")
             
-            # Iterate through models for fallback
-            models_to_try = settings.openrouter_models_list
-            stream_connected = False
+            # Best recent performers first, failing models skipped
+            models_to_try = get_model_router().ordered_models(settings.openrouter_models_list)
             
+            if settings.OPENROUTER_HEDGING_ENABLED:
+                async for content in _hedged_openrouter_stream(prompt, models_to_try, temperature, priority, system):
+                    streamed = True
+                    yield content
+                return
+
+            # Iterate through models for fallback
             for model in models_to_try:
-                if stream_connected: break
-                
                 try:
                     logger.info(f"Trying OpenRouter Stream: {model}")
-                    response = query_openrouter(prompt, model, stream=True, temperature=temperature)
-                    
-                    if response.status_code == 200:
-                        logger.info(f"OpenRouter Stream Connected ({model})")
-                        stream_connected = True
-                        
-                        for line in response.iter_lines():
-                            if line:
-                                decoded = line.decode('utf-8')
-                                # logger.info(f"RAW CHUNK: {decoded}") # DEBUG LOG
-                                
-                                if decoded.startswith('data: '):
-                                    try:
-                                        json_str = decoded[6:] # key 'data: '
-                                        if json_str.strip() == '[DONE]': break
-                                        
-                                        chunk = json.loads(json_str)
-                                        content = chunk['choices'][0]['delta'].get('content', '')
-                                        if content:
-                                            yield content
-                                    except:
-                                        pass
-                                elif decoded.startswith(':') or not decoded.strip():
-                                    continue # Keep-alive or empty
-                                else:
-                                    logger.warning(f"Unexpected Line format: {decoded}")
-                        return # Exit if successful (generator exhausted)
-                    else:
-                        logger.warning(f"OpenRouter Stream Failed ({model}): {response.status_code}")
-                except Exception as e:
-                    logger.error(f"OpenRouter Stream Exception ({model}): {e}")
+                    async for content in _stream_openrouter_model(prompt, model, temperature, priority, system):
+                        streamed = True
+                        yield content
+                    return # Exit if successful (generator exhausted)
+                except _StreamFailed as e:
+                    logger.warning(f"OpenRouter Stream Failed ({model}): {e}")
             
-            if not stream_connected:
-                logger.warning("All OpenRouter streaming models failed. Falling back to Local LLM.")
-
+        except _StreamFailed:
+            pass
         except Exception as e:
             logger.error(f"OpenRouter Stream Error: {e}")
+            if streamed:
+                # Don't append a second answer from the local model to a partial one;
+                # the caller must not treat the truncated text as a complete answer
+                raise GenerationFailed(f"OpenRouter stream failed: {e}") from e
+
+        logger.warning("All OpenRouter streaming models failed. Falling back to Local LLM.")
         
     # 2. Local LLM Fallback / Default
     try:
-        url = f"{settings.LLM_ENDPOINT}/api/generate"
-        
-        final_prompt = prompt
-        if language.lower() not in ["english", "en"]:
-            final_prompt = f"[SYSTEM: Respond strictly in {language} language.]\n\n{prompt}"
-
-        payload = {
-            "model": settings.LLM_MODEL,
-            "prompt": final_prompt,
-            "stream": True,
-            "options": {
-                "temperature": temperature,
-                "num_predict": max_tokens,
-                "repeat_penalty": 1.1,
-            }
-        }
+        url = f"{settings.LLM_ENDPOINT}/api/chat"
+        payload = _ollama_payload(prompt, temperature, max_tokens, language, stream=True, system=system)
         
         logger.info(f"Stream request to Ollama: {settings.LLM_MODEL}")
         
-        with requests.post(url, json=payload, stream=True, timeout=120) as response:
+        # The slot is held for the whole stream: Ollama generates one response per slot
+        async with get_limiter(OLLAMA).slot(priority), get_client(OLLAMA).stream("POST", url, json=payload) as response:
             response.raise_for_status()
             
-            for line in response.iter_lines():
+            async for line in response.aiter_lines():
                 if line:
                     try:
                         chunk = json.loads(line)
-                        if "response" in chunk:
-                            yield chunk["response"]
-                        if chunk.get("done", False):
-                            break
+                        content = chunk.get("message", {}).get("content")
+                        if content:
+                            yield content
+                        if chunk.get("done"):
+                            _record_prompt_eval(chunk)
+                        # No break on "done": reading to the end of the body returns the connection to the pool
                     except json.JSONDecodeError:
                         continue
                         
+    except LLMQueueFull:
+        raise
+    except httpx.ConnectError as e:
+        logger.error("Cannot connect to Ollama.")
+        raise GenerationFailed("Cannot connect to the local LLM. Please ensure Ollama is running.") from e
     except Exception as e:
         logger.error(f"Error streaming response: {str(e)}")
-        yield f"Error: {str(e)}"
+        raise GenerationFailed(f"Error streaming response: {str(e)}") from e
+
+class GenerationAbandoned(Exception):
+    """The client disconnected, so generation was stopped early"""
+
+_abandon_stats = {
+    "completed_generations": 0,
+    "abandoned_generations": 0,
+    "failed_generations": 0,
+    "tokens_streamed_before_abandon": 0,
+    "estimated_tokens_saved": 0
+}
+
+def get_abandon_stats() -> dict:
+    """Counters for completed, failed and abandoned (client went away) generations"""
+    return dict(_abandon_stats)
+
+def _record_abandoned(tokens: int, max_tokens: int):
+    _abandon_stats["abandoned_generations"] += 1
+    _abandon_stats["tokens_streamed_before_abandon"] += tokens
+    # Upper bound: the model could have generated up to max_tokens
+    _abandon_stats["estimated_tokens_saved"] += max(0, max_tokens - tokens)
+
+async def generate_streaming_response(prompt: str, temperature: float = 0.2, max_tokens: int = 4000, language: str = "English", is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None, priority: Priority = Priority.CHAT, system: str = ""):
+    """
+    Generate a streaming response using OpenRouter or Ollama
+    
+    Args:
+        system: Stable system prompt, sent as a separate message so it can be
+            cached as a prompt prefix
+        is_disconnected: Optional coroutine function (e.g. Request.is_disconnected)
+            polled between tokens; when it reports a disconnect the upstream
+            stream is closed and GenerationAbandoned is raised
+    
+    Closing or cancelling this generator also closes the upstream HTTP stream.
+    
+    Raises:
+        GenerationFailed: if the upstream stream failed (failures are never
+            yielded as answer text)
+        LLMQueueFull: if the local LLM's queue filled up after the stream was requested
+    """
+    stream = _generate_stream(prompt, temperature, max_tokens, language, priority, system)
+    poll_interval = settings.DISCONNECT_POLL_INTERVAL_MS / 1000
+    last_poll = time.monotonic()
+    tokens = 0
+    try:
+        async for content in stream:
+            if is_disconnected is not None and time.monotonic() - last_poll >= poll_interval:
+                last_poll = time.monotonic()
+                if await is_disconnected():
+                    logger.info(f"Client disconnected after {tokens} tokens. Stopping generation.")
+                    raise GenerationAbandoned()
+            tokens += 1
+            yield content
+        _abandon_stats["completed_generations"] += 1
+    except (GenerationAbandoned, asyncio.CancelledError, GeneratorExit):
+        # The client went away: disconnect check, cancelled response task or aclose()
+        _record_abandoned(tokens, max_tokens)
+        raise
+    except Exception:
+        # Upstream failures and LLMQueueFull are not abandons; they save no tokens
+        _abandon_stats["failed_generations"] += 1
+        raise
+    finally:
+        await stream.aclose()
 
-def check_ollama_health() -> dict:
+async def check_ollama_health() -> dict:
     """Check if Ollama is running and accessible"""
     try:
-        response = requests.get(f"{settings.LLM_ENDPOINT}/api/tags", timeout=5)
+        response = await get_client(OLLAMA).get(f"{settings.LLM_ENDPOINT}/api/tags", timeout=5)
         if response.status_code == 200:
             models = response.json().get("models", [])
             model_names = [m["name"] for m in models]
@@ -205,6 +504,11 @@ def check_ollama_health() -> dict:
                 "available_models": model_names,
                 "configured_model": settings.LLM_MODEL
             }
+        return {
+            "status": "unhealthy",
+            "error": f"HTTP {response.status_code}",
+            "configured_model": settings.LLM_MODEL
+        }
     except Exception as e:
         return {
             "status": "unhealthy",
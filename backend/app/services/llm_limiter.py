@@ -0,0 +1,173 @@
+"""
+LLM Admission Control - Per-backend concurrency limits with a bounded priority queue
+Keeps Ollama from being overloaded by bursts and rejects early when the queue is full
+"""
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Dict
+from ..config import settings
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Lower value is served first"""
+    CHAT = 0
+    SCENARIO = 1
+    EVALUATION = 2
+
+
+class LLMQueueFull(Exception):
+    """Raised when a backend's wait queue is full; maps to 503 + Retry-After"""
+
+    def __init__(self, backend: str, retry_after: int):
+        super().__init__(f"LLM backend '{backend}' is busy, retry after {retry_after}s")
+        self.backend = backend
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Allows at most `max_concurrency` requests into a backend at once
+
+    Further requests wait in a priority queue (victim chat before playground
+    scenarios before evaluations, FIFO within a priority). When `max_queue`
+    requests are already waiting, a new request displaces the newest waiter
+    of lower priority, or is rejected with LLMQueueFull if there is none.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.active = 0
+        self._waiters = []  # heap of (priority, seq, future)
+        self._seq = itertools.count()
+        self.admitted = 0
+        self.rejected = 0
+        self.queued_total = 0
+        self.queue_ms_total = 0.0
+        self.queue_ms_max = 0.0
+        self.service_s_ewma = None
+        self.by_priority = {p.name.lower(): {"admitted": 0, "rejected": 0, "queue_ms_total": 0.0} for p in Priority}
+
+    def _queued(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    def retry_after(self) -> int:
+        """Rough seconds until a queue slot frees up"""
+        service = self.service_s_ewma or 5.0
+        return max(1, math.ceil(service * (self._queued() + 1) / max(1, self.max_concurrency)))
+
+    def _sheddable(self, priority: Priority):
+        """The newest waiter with a strictly lower priority than `priority`, if any"""
+        candidates = [w for w in self._waiters if not w[2].done() and w[0] > priority]
+        return max(candidates) if candidates else None
+
+    def _reject(self, priority: Priority) -> LLMQueueFull:
+        self.rejected += 1
+        self.by_priority[Priority(priority).name.lower()]["rejected"] += 1
+        return LLMQueueFull(self.name, self.retry_after())
+
+    def check(self, priority: Priority = Priority.CHAT):
+        """Raise LLMQueueFull now if a request would be rejected (used before streaming starts)"""
+        if self.active >= self.max_concurrency and self._queued() >= self.max_queue and self._sheddable(priority) is None:
+            raise self._reject(priority)
+
+    async def acquire(self, priority: Priority = Priority.CHAT):
+        if self.active < self.max_concurrency and not self._queued():
+            self.active += 1
+            self._admit(priority, 0.0)
+            return
+
+        self.check(priority)
+        if self._queued() >= self.max_queue:
+            # Full queue but a lower-priority request is waiting: it gives up its place
+            victim = self._sheddable(priority)
+            victim[2].set_exception(self._reject(victim[0]))
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), future))
+        self.queued_total += 1
+        start = time.perf_counter()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # The slot was handed to us just as we were cancelled; pass it on
+                # (a waiter shed with LLMQueueFull never held one)
+                self.release()
+            raise
+        self._admit(priority, (time.perf_counter() - start) * 1000)
+
+    def _admit(self, priority: Priority, queue_ms: float):
+        self.admitted += 1
+        self.queue_ms_total += queue_ms
+        self.queue_ms_max = max(self.queue_ms_max, queue_ms)
+        stats = self.by_priority[priority.name.lower()]
+        stats["admitted"] += 1
+        stats["queue_ms_total"] += queue_ms
+
+    def release(self):
+        # Hand the slot straight to the highest-priority live waiter
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(True)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.CHAT):
+        """Hold one concurrency slot for the duration of the block"""
+        await self.acquire(priority)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.service_s_ewma = elapsed if self.service_s_ewma is None else 0.2 * elapsed + 0.8 * self.service_s_ewma
+            self.release()
+
+    def stats(self) -> Dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": self._queued(),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "queued_total": self.queued_total,
+            "avg_queue_ms": round(self.queue_ms_total / self.admitted, 2) if self.admitted else 0.0,
+            "max_queue_ms": round(self.queue_ms_max, 2),
+            "avg_service_s": round(self.service_s_ewma, 3) if self.service_s_ewma is not None else None,
+            "by_priority": {
+                name: {
+                    "admitted": s["admitted"],
+                    "rejected": s["rejected"],
+                    "avg_queue_ms": round(s["queue_ms_total"] / s["admitted"], 2) if s["admitted"] else 0.0
+                }
+                for name, s in self.by_priority.items()
+            }
+        }
+
+
+_limiters: Dict[str, AdmissionController] = {}
+
+
+def get_limiter(backend: str) -> AdmissionController:
+    """Get the admission controller for "ollama" or "openrouter" """
+    limiter = _limiters.get(backend)
+    if limiter is None:
+        concurrency = settings.LLM_MAX_CONCURRENCY_OLLAMA if backend == "ollama" else settings.LLM_MAX_CONCURRENCY_OPENROUTER
+        limiter = _limiters[backend] = AdmissionController(backend, concurrency, settings.LLM_MAX_QUEUE)
+    return limiter
+
+
+def get_limiter_stats() -> Dict:
+    return {name: limiter.stats() for name, limiter in _limiters.items()}
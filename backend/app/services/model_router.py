@@ -0,0 +1,126 @@
+"""
+Model Router - Latency-aware ordering of OpenRouter models with circuit breakers
+Tracks per-model success rate, time-to-first-token and 429/5xx counts
+"""
+from typing import Dict, List, Optional
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class _ModelStats:
+    def __init__(self):
+        self.successes = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.server_errors = 0
+        self.consecutive_failures = 0
+        self.ttft_ewma: Optional[float] = None
+        self.success_ewma = 1.0
+        self.open_until = 0.0
+        self.cooldown = 0.0
+        self.last_error: Optional[str] = None
+
+
+class ModelRouter:
+    """
+    Orders candidate models by recent performance and skips failing ones
+
+    A model's circuit opens after `failure_threshold` consecutive failures
+    (or immediately on a 429) and stays open for a cool-down that doubles on
+    every further failure, up to `max_cooldown`. Once the cool-down expires
+    the model is tried again (half-open); a success closes the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 2, base_cooldown: float = 30.0, max_cooldown: float = 600.0, ewma_alpha: float = 0.3):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.alpha = ewma_alpha
+        self._stats: Dict[str, _ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, model: str) -> _ModelStats:
+        stats = self._stats.get(model)
+        if stats is None:
+            stats = self._stats[model] = _ModelStats()
+        return stats
+
+    def _score(self, stats: _ModelStats) -> float:
+        """Lower is better: expected time to first token, penalised by failure rate"""
+        # Unknown models get a neutral 2s estimate so they are explored early
+        ttft = stats.ttft_ewma if stats.ttft_ewma is not None else 2.0
+        return ttft / max(stats.success_ewma, 0.05)
+
+    def ordered_models(self, models: List[str]) -> List[str]:
+        """
+        Candidates with closed (or half-open) circuits, best first
+
+        Configured order breaks ties. If every circuit is open, the model whose
+        cool-down ends soonest is returned so requests are never refused outright.
+        """
+        now = time.monotonic()
+        with self._lock:
+            available = []
+            blocked = []
+            for position, model in enumerate(models):
+                stats = self._get(model)
+                if stats.open_until > now:
+                    blocked.append((stats.open_until, model))
+                else:
+                    available.append((self._score(stats), position, model))
+
+        if not available:
+            return [min(blocked)[1]] if blocked else []
+        return [model for _, _, model in sorted(available)]
+
+    def record_success(self, model: str, ttft: float):
+        """Record a request that produced its first token after `ttft` seconds"""
+        with self._lock:
+            stats = self._get(model)
+            stats.successes += 1
+            stats.consecutive_failures = 0
+            stats.open_until = 0.0
+            stats.cooldown = 0.0
+            stats.success_ewma = self.alpha + (1 - self.alpha) * stats.success_ewma
+            stats.ttft_ewma = ttft if stats.ttft_ewma is None else self.alpha * ttft + (1 - self.alpha) * stats.ttft_ewma
+
+    def record_failure(self, model: str, status_code: Optional[int] = None, error: str = ""):
+        """Record a failed request (HTTP status or transport error)"""
+        with self._lock:
+            stats = self._get(model)
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            stats.success_ewma = (1 - self.alpha) * stats.success_ewma
+            stats.last_error = error or (f"HTTP {status_code}" if status_code else "error")
+            if status_code == 429:
+                stats.rate_limited += 1
+            elif status_code is not None and status_code >= 500:
+                stats.server_errors += 1
+
+            if status_code == 429 or stats.consecutive_failures >= self.failure_threshold:
+                stats.cooldown = min(self.max_cooldown, stats.cooldown * 2 if stats.cooldown else self.base_cooldown)
+                stats.open_until = time.monotonic() + stats.cooldown
+                logger.warning(f"Circuit opened for {model} for {stats.cooldown:.0f}s ({stats.last_error})")
+
+    def state(self) -> Dict:
+        """Per-model statistics and circuit state"""
+        now = time.monotonic()
+        with self._lock:
+            result = {}
+            for model, stats in self._stats.items():
+                total = stats.successes + stats.failures
+                result[model] = {
+                    "circuit": "open" if stats.open_until > now else ("half-open" if stats.cooldown else "closed"),
+                    "open_for_seconds": round(max(0.0, stats.open_until - now), 1),
+                    "successes": stats.successes,
+                    "failures": stats.failures,
+                    "success_rate": round(stats.successes / total, 4) if total else None,
+                    "rate_limited": stats.rate_limited,
+                    "server_errors": stats.server_errors,
+                    "ttft_ewma_ms": round(stats.ttft_ewma * 1000, 1) if stats.ttft_ewma is not None else None,
+                    "last_error": stats.last_error
+                }
+            return result
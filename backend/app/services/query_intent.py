@@ -0,0 +1,109 @@
+"""
+Query Intent - Keyword topic classifier and script-based language tagging
+Used to tag chunks at ingest and to narrow retrieval to a query's topic
+"""
+from typing import Dict, List, Optional
+import re
+import unicodedata
+
+# Topic -> keywords (case-insensitive whole words, plural "s" allowed; Indic keywords as substrings)
+TOPIC_KEYWORDS: Dict[str, List[str]] = {
+    "telecom": [
+        "ceir", "imei", "tafcop", "sanchar saathi", "sancharsaathi", "sim", "lost phone", "stolen phone",
+        "lost mobile", "stolen mobile", "mobile connection", "telecom", "chakshu",
+        "फोन चोरी", "मोबाइल खो", "सिम", "கைபேசி", "சிம்"
+    ],
+    "financial": [
+        "upi", "1930", "bank", "credit card", "debit card", "card fraud", "utr", "transaction", "money",
+        "refund", "loan", "payment", "wallet", "cfcfrms", "otp", "net banking", "investment",
+        "यूपीआई", "बैंक", "पैसे", "लेनदेन", "வங்கி", "பணம்"
+    ],
+    "malware": [
+        "ransomware", "malware", "virus", "trojan", "spyware", "cert-in", "antivirus", "encrypted my files",
+        "infected", "वायरस", "வைரஸ்"
+    ],
+    "social_media": [
+        "instagram", "facebook", "whatsapp", "twitter", "telegram", "fake profile", "social media",
+        "morphed", "sextortion", "harassment", "सोशल मीडिया", "फर्जी प्रोफाइल"
+    ],
+}
+
+# Chunks whose document matched no topic; kept in every topic-filtered search
+GENERAL_TOPIC = "general"
+
+# Unicode blocks -> language names used in prompts
+_SCRIPT_LANGUAGES = [
+    (0x0900, 0x097F, "Hindi"),
+    (0x0980, 0x09FF, "Bengali"),
+    (0x0A80, 0x0AFF, "Gujarati"),
+    (0x0B80, 0x0BFF, "Tamil"),
+    (0x0C00, 0x0C7F, "Telugu"),
+    (0x0C80, 0x0CFF, "Kannada"),
+    (0x0D00, 0x0D7F, "Malayalam"),
+]
+
+_PATTERNS = {
+    topic: [
+        re.compile(re.escape(keyword)) if not keyword.isascii() else re.compile(rf"(?<![a-z0-9]){re.escape(keyword)}s?(?![a-z0-9])")
+        for keyword in keywords
+    ]
+    for topic, keywords in TOPIC_KEYWORDS.items()
+}
+
+
+def topic_scores(text: str) -> Dict[str, int]:
+    """Number of distinct keywords of each topic found in the text"""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    scores = {}
+    for topic, patterns in _PATTERNS.items():
+        score = sum(1 for pattern in patterns if pattern.search(text))
+        if score:
+            scores[topic] = score
+    return scores
+
+
+def classify_topic(text: str) -> Optional[str]:
+    """
+    Most likely topic of a text, or None when no keyword matches or the top
+    two topics tie (too ambiguous to filter on)
+    """
+    scores = topic_scores(text)
+    if not scores:
+        return None
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    if len(ranked) > 1 and ranked[0][1] == ranked[1][1]:
+        return None
+    return ranked[0][0]
+
+
+def detect_script_language(text: str) -> str:
+    """Language of a text judged by its dominant Indic script ("English" if mostly Latin)"""
+    counts: Dict[str, int] = {}
+    latin = 0
+    for char in text:
+        code = ord(char)
+        if code < 0x0900:
+            latin += char.isalpha()
+            continue
+        for start, end, language in _SCRIPT_LANGUAGES:
+            if start <= code <= end:
+                counts[language] = counts.get(language, 0) + 1
+                break
+    if counts:
+        language, count = max(counts.items(), key=lambda item: item[1])
+        if count >= latin:
+            return language
+    return "English"
+
+
+def intent_filters(query: str) -> Optional[Dict]:
+    """
+    Retrieval filters implied by a query: its topic plus general chunks
+
+    Returns:
+        Filters for retrieve_relevant_chunks, or None to search everything
+    """
+    topic = classify_topic(query)
+    if topic is None:
+        return None
+    return {"topic": [topic, GENERAL_TOPIC]}
@@ -3,18 +3,56 @@ RAG Service - Retrieval Augmented Generation
 Handles vector search and response generation
 """
 import chromadb
-from typing import List, Dict
+import numpy as np
+from typing import Callable, Dict, List, Optional
 from ..config import settings
-from .embedding_client import embed_text
-from .llm_client import generate_response
+from .embedding_client import embed_query, embed_text
+from .llm_client import generate_response, GenerationAbandoned
+from .answer_cache import SemanticAnswerCache
+from .context_packer import pack_chunks, count_tokens, record_prompt_tokens
+from .lexical_index import LexicalIndex, reciprocal_rank_fusion
+from .query_intent import intent_filters
+from .vector_snapshot import get_vector_snapshot
+from .llm_limiter import LLMQueueFull
+from .reranker import rerank
+import asyncio
+import json
 import logging
 import os
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:  # optional: faster frame encoding
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 _chroma_client = None
 _collection = None
 
+# In-process view of the collection size, so queries don't pay for collection.count()
+_count_lock = threading.Lock()
+_collection_count = None
+_count_refreshed_at = 0.0
+# Bumped whenever the indexed chunks change, invalidating cached answers
+_kb_version = 0
+# Persisted KB revision (written by every ingest, in any process) as last seen here
+_kb_revision = None
+# Sidecar file in CHROMA_DIR holding the persisted revision
+_KB_REVISION_FILE = "kb_revision"
+
+_answer_cache = None
+
+_lexical_index = None
+_lexical_lock = threading.Lock()
+# Chunks read per collection.get() page when building the lexical index
+_LEXICAL_PAGE_SIZE = 5000
+
+_intent_lock = threading.Lock()
+_intent_stats = {"queries": 0, "filtered": 0, "fallbacks": 0}
+
 def get_chroma_client():
     """Get or create ChromaDB client"""
     global _chroma_client
@@ -39,49 +77,278 @@ def get_collection():
         logger.info("ChromaDB collection ready")
     return _collection
 
-def retrieve_relevant_chunks(query: str, top_k: int = 5) -> List[Dict]:
+def read_kb_revision() -> int:
+    """The persisted KB revision (0 before the first ingest)"""
+    try:
+        with open(os.path.join(settings.CHROMA_DIR, _KB_REVISION_FILE)) as f:
+            return int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+def bump_kb_revision() -> int:
+    """Increment the persisted KB revision (replaced atomically); returns the new value"""
+    os.makedirs(settings.CHROMA_DIR, exist_ok=True)
+    revision = read_kb_revision() + 1
+    path = os.path.join(settings.CHROMA_DIR, _KB_REVISION_FILE)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(str(revision))
+    os.replace(tmp, path)
+    return revision
+
+def _check_kb_revision() -> bool:
+    """Move kb_version if another process ingested since we last looked (caller holds _count_lock)"""
+    global _kb_version, _kb_revision
+    revision = read_kb_revision()
+    moved = _kb_revision is not None and revision != _kb_revision
+    if moved:
+        _kb_version += 1
+    _kb_revision = revision
+    return moved
+
+def refresh_kb_version() -> int:
+    """Re-read the persisted KB revision now; returns the current kb_version"""
+    with _count_lock:
+        _check_kb_revision()
+    return _kb_version
+
+def get_collection_count(force_refresh: bool = False) -> int:
+    """
+    Number of chunks in the collection, re-read from Chroma at most every
+    COLLECTION_COUNT_REFRESH_SECONDS (or when forced)
+    
+    The persisted KB revision is re-read at the same time: an ingest in
+    another process bumps it even when it only changed chunk texts (same
+    ids, same count), so the knowledge base version moves and cached
+    answers and the lexical index are invalidated.
+    """
+    global _collection_count, _count_refreshed_at, _kb_version
+    refresh_every = settings.COLLECTION_COUNT_REFRESH_SECONDS
+    with _count_lock:
+        stale = (
+            _collection_count is None
+            or force_refresh
+            or (refresh_every > 0 and time.monotonic() - _count_refreshed_at > refresh_every)
+        )
+        if stale:
+            count = get_collection().count()
+            # Re-ingested by another process (e.g. a scrape job)?
+            if not _check_kb_revision() and _collection_count is not None and count != _collection_count:
+                # Written outside ingest_documents (e.g. seed_data.py)
+                _kb_version += 1
+            _collection_count = count
+            _count_refreshed_at = time.monotonic()
+        return _collection_count
+
+def note_chunks_changed(delta: int, lexical_index: Optional[LexicalIndex] = None):
+    """
+    Adjust the tracked collection size after an ingest in this process
+    
+    Also bumps the persisted KB revision so other processes see the change.
+    
+    Args:
+        delta: Change in the number of chunks
+        lexical_index: The loaded lexical index, if the ingest applied its
+            writes to it as well (it then stays current instead of being rebuilt)
+    """
+    global _collection_count, _kb_version, _kb_revision
+    try:
+        revision = bump_kb_revision()
+    except OSError as e:
+        logger.error(f"Could not persist the KB revision: {e}")
+        revision = None
+    with _count_lock:
+        # Another process ingested since we last looked: the index missed its writes
+        missed = revision is None or _kb_revision is None or revision != _kb_revision + 1
+        if revision is not None:
+            _kb_revision = revision
+        in_sync = not missed and lexical_index is not None and lexical_index is _lexical_index and lexical_index.version == _kb_version
+        _kb_version += 1
+        if in_sync:
+            lexical_index.version = _kb_version
+        if _collection_count is not None:
+            _collection_count = max(0, _collection_count + delta)
+
+def get_kb_version() -> int:
+    """Knowledge base version, incremented on every change to the indexed chunks"""
+    return _kb_version
+
+def get_loaded_lexical_index() -> Optional[LexicalIndex]:
+    """The lexical index if it has been built in this process (ingest keeps it in sync)"""
+    return _lexical_index
+
+def get_lexical_index() -> LexicalIndex:
+    """
+    Get the BM25 index over the collection's chunks
+    
+    Built from Chroma on first use, and rebuilt when the knowledge base
+    version moved without the index being updated. The persisted KB revision
+    is re-read on every call (one small file read), so an ingest in another
+    process that kept the chunk count is noticed right away rather than at
+    the next collection count refresh.
+    """
+    global _lexical_index
+    refresh_kb_version()
+    index = _lexical_index
+    if index is not None and index.version == _kb_version:
+        return index
+    with _lexical_lock:
+        if _lexical_index is not None and _lexical_index.version == _kb_version:
+            return _lexical_index
+        start = time.perf_counter()
+        version = _kb_version
+        index = LexicalIndex()
+        collection = get_collection()
+        offset = 0
+        while True:
+            page = collection.get(include=["documents", "metadatas"], limit=_LEXICAL_PAGE_SIZE, offset=offset)
+            if not page["ids"]:
+                break
+            index.upsert(page["ids"], page["documents"], page["metadatas"])
+            offset += len(page["ids"])
+        index.version = version
+        index.built_at = time.time()
+        _lexical_index = index
+        logger.info(f"Lexical index built: {len(index)} chunks in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return index
+
+def get_lexical_stats() -> Dict:
+    """Lexical index size and search latency (empty if not built yet)"""
+    index = _lexical_index
+    stats = {"mode": settings.RETRIEVAL_MODE, "loaded": index is not None}
+    if index is not None:
+        stats.update(index.stats())
+        stats["current"] = index.version == _kb_version
+    return stats
+
+def get_answer_cache() -> SemanticAnswerCache:
+    """Get or create the semantic answer cache"""
+    global _answer_cache
+    if _answer_cache is None:
+        _answer_cache = SemanticAnswerCache(
+            max_size=settings.ANSWER_CACHE_SIZE,
+            similarity_threshold=settings.ANSWER_CACHE_SIMILARITY,
+            ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS
+        )
+    return _answer_cache
+
+def where_clause(filters: Optional[Dict]) -> Optional[Dict]:
+    """
+    Chroma `where` clause for retrieval filters
+    
+    Args:
+        filters: Metadata key -> value, or list of accepted values
+            (e.g. {"source": "CEIR", "topic": ["telecom", "general"]});
+            None/empty values are ignored
+    """
+    conditions = []
+    for key, wanted in (filters or {}).items():
+        if wanted is None or wanted == "" or wanted == []:
+            continue
+        if isinstance(wanted, (list, tuple, set)):
+            wanted = list(wanted)
+            conditions.append({key: wanted[0]} if len(wanted) == 1 else {key: {"$in": wanted}})
+        else:
+            conditions.append({key: wanted})
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+def _dense_search_many(collection, query_embeddings: np.ndarray, n_results: int, filters: Optional[Dict] = None) -> List[List[Dict]]:
+    """
+    Nearest chunks to each query embedding row: exact search over the vector
+    snapshot when RETRIEVAL_ENGINE is "snapshot" and one exists, otherwise
+    one ChromaDB query for all rows (with the filters as its where clause)
+    """
+    if settings.RETRIEVAL_ENGINE == "snapshot":
+        snapshot = get_vector_snapshot()
+        if snapshot is not None:
+            return snapshot.search_many(query_embeddings, n_results, filters)
+    
+    results = collection.query(
+        query_embeddings=query_embeddings,
+        n_results=n_results,
+        where=where_clause(filters),
+        include=["documents", "metadatas", "distances"]
+    )
+    
+    all_chunks = []
+    for q in range(len(query_embeddings)):
+        chunks = []
+        if results["ids"] and len(results["ids"][q]) > 0:
+            for i in range(len(results["ids"][q])):
+                chunk = {
+                    "id": results["ids"][q][i],
+                    "content": results["documents"][q][i],
+                    "metadata": results["metadatas"][q][i] if results["metadatas"] else {},
+                    "distance": results["distances"][q][i] if results["distances"] else 0.0
+                }
+                chunks.append(chunk)
+        all_chunks.append(chunks)
+    return all_chunks
+
+def _dense_search(collection, query: str, n_results: int, filters: Optional[Dict] = None) -> List[Dict]:
+    """Nearest chunks to the query's embedding"""
+    return _dense_search_many(collection, embed_query(query)[np.newaxis, :], n_results, filters)[0]
+
+def _fuse(dense: List[Dict], lexical: List, index: LexicalIndex, top_k: int) -> List[Dict]:
+    """Reciprocal rank fusion of dense hits and (id, BM25 score) lexical hits"""
+    by_id = {chunk["id"]: chunk for chunk in dense}
+    fused = reciprocal_rank_fusion(
+        [[chunk["id"] for chunk in dense], [chunk_id for chunk_id, _ in lexical]],
+        k=settings.RRF_K
+    )
+    chunks = []
+    for chunk_id, score in fused:
+        chunk = by_id.get(chunk_id)
+        if chunk is None:
+            stored = index.get(chunk_id)
+            if stored is None:  # removed since the search
+                continue
+            chunk = {"id": chunk_id, "content": stored[0], "metadata": stored[1], "distance": None}
+        chunks.append(dict(chunk, score=score))
+        if len(chunks) == top_k:
+            break
+    return chunks
+
+def retrieve_relevant_chunks(query: str, top_k: int = 5, filters: Optional[Dict] = None) -> List[Dict]:
     """
     Retrieve most relevant document chunks for a query
     
+    In "hybrid" mode (settings.RETRIEVAL_MODE) the Chroma results are fused
+    with BM25 hits from the in-process lexical index, which catches exact
+    tokens such as "1930", "CEIR" or a UTR number that embeddings blur.
+    
     Args:
         query: User's question
         top_k: Number of top results to return
+        filters: Optional metadata filters (source, section, category, language,
+            topic; see where_clause), applied by Chroma and the lexical index
         
     Returns:
-        List of document chunks with metadata
+        List of document chunks with metadata, most relevant first
+        ("distance" is None for chunks only the lexical index found)
     """
     try:
         collection = get_collection()
         
-        # Check if collection has any documents
-        count = collection.count()
+        # Check if collection has any documents (tracked in-process, no extra Chroma round-trip)
+        count = get_collection_count()
         if count == 0:
             logger.warning("ChromaDB collection is empty. No documents indexed yet.")
             return []
         
-        logger.info(f"Searching {count} documents for query: {query[:50]}...")
-        
-        # Generate query embedding
-        query_embedding = embed_text([query])[0]
-        
-        # Search in ChromaDB
-        results = collection.query(
-            query_embeddings=[query_embedding],
-            n_results=min(top_k, count),
-            include=["documents", "metadatas", "distances"]
-        )
+        where = where_clause(filters)
+        logger.info(f"Searching {count} documents for query: {query[:50]}..." + (f" (where {where})" if where else ""))
         
-        # Format results
-        chunks = []
-        if results["ids"] and len(results["ids"][0]) > 0:
-            for i in range(len(results["ids"][0])):
-                chunk = {
-                    "id": results["ids"][0][i],
-                    "content": results["documents"][0][i],
-                    "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                    "distance": results["distances"][0][i] if results["distances"] else 0.0
-                }
-                chunks.append(chunk)
+        if settings.RETRIEVAL_MODE != "hybrid":
+            chunks = _dense_search(collection, query, min(top_k, count), filters)
+        else:
+            candidates = max(top_k, settings.RETRIEVAL_CANDIDATES)
+            dense = _dense_search(collection, query, min(candidates, count), filters)
+            index = get_lexical_index()
+            lexical = index.search(query, candidates, filters if where else None)
+            chunks = _fuse(dense, lexical, index, top_k)
                 
         logger.info(f"Retrieved {len(chunks)} relevant chunks")
         return chunks
@@ -91,53 +358,95 @@ def retrieve_relevant_chunks(query: str, top_k: int = 5) -> List[Dict]:
         return []
 
 
-def build_prompt(user_message: str, chunks: List[Dict], language: str = "English", extra_context: str = "") -> str:
+def retrieve_batch(queries: List[str], top_k: int = 5, filters: Optional[Dict] = None) -> List[List[Dict]]:
     """
-    Build a prompt for the LLM with context from retrieved chunks
+    Retrieve chunks for many queries at once (offline evaluation, bulk triage)
+    
+    All queries are embedded in one batched encode (bypassing the query
+    embedding cache) and searched with one multi-query collection.query (or
+    snapshot matrix product); in hybrid mode each result is fused with its
+    BM25 hits as in retrieve_relevant_chunks. No intent filtering or
+    reranking, so results show what the index itself returns. Errors are
+    raised rather than returned as empty results.
     
     Args:
-        user_message: User's question
-        chunks: Retrieved document chunks
-        language: Target language for the response
-        extra_context: Additional context (e.g., OCR text from image)
+        queries: Query texts
+        top_k: Results per query
+        filters: Optional metadata filters applied to every query (see where_clause)
         
     Returns:
-        Complete prompt string
+        One chunk list per query, in input order
     """
-    context_str = ""
+    if not queries:
+        return []
+    collection = get_collection()
+    count = get_collection_count()
+    if count == 0:
+        return [[] for _ in queries]
     
-    # Add extra context if provided
-    if extra_context:
-        context_str += f"Context from uploaded image/screenshot:\n{extra_context}\n\n"
+    hybrid = settings.RETRIEVAL_MODE == "hybrid"
+    candidates = max(top_k, settings.RETRIEVAL_CANDIDATES) if hybrid else top_k
+    embeddings = embed_text(queries)
+    dense = _dense_search_many(collection, embeddings, min(candidates, count), filters)
+    if not hybrid:
+        return dense
     
-    # Build context from chunks
-    if chunks:
-        context_parts = []
-        for i, chunk in enumerate(chunks, 1):
-            source = chunk["metadata"].get("source", "Unknown Source")
-            title = chunk["metadata"].get("title", "")
-            section = chunk["metadata"].get("section", "")
-            
-            header = f"[Source {i}: {source}"
-            if title:
-                header += f" - {title}"
-            if section:
-                header += f" - {section}"
-            header += "]"
-            
-            context_parts.append(f"{header}\n{chunk['content']}\n")
-        
-        context_str += "Context from official sources:\n" + "\n".join(context_parts)
-    else:
-        context_str += "No specific official documents found for this query. Use general cyber safety knowledge."
+    index = get_lexical_index()
+    lexical_filters = filters if where_clause(filters) else None
+    return [_fuse(hits, index.search(query, candidates, lexical_filters), index, top_k) for query, hits in zip(queries, dense)]
+
+def retrieve_for_query(query: str, top_k: int = 5) -> List[Dict]:
+    """
+    Retrieve chunks, narrowed to the query's topic when it has a clear one
     
-    # Build prompt with context
-    system_role_instruction = f"You are an expert Indian Cyber-SOP Assistant. Your role is to guide victims of cybercrime."
+    The keyword intent classifier maps the query to a topic (telecom,
+    financial, ...); the search is then limited to that topic's chunks plus
+    general ones. If that yields fewer than RETRIEVAL_FILTER_MIN_RESULTS
+    chunks, the unfiltered search is used instead.
     
-    # If image/OCR context is present, shift persona to Fraud Analyst
-    if extra_context:
-        system_role_instruction = f"You are an expert Cyber Fraud Analyst. The user has uploaded an image which you must analyze for scams, fraud, or phishing."
+    With RERANK_ENABLED, RERANK_CANDIDATES chunks are retrieved and the
+    cross-encoder picks the top_k (within its time budget).
+    """
+    candidates = max(top_k, settings.RERANK_CANDIDATES) if settings.RERANK_ENABLED else top_k
+    filters = intent_filters(query) if settings.RETRIEVAL_INTENT_FILTER else None
+    with _intent_lock:
+        _intent_stats["queries"] += 1
+        if filters:
+            _intent_stats["filtered"] += 1
     
+    chunks = retrieve_relevant_chunks(query, candidates, filters) if filters else retrieve_relevant_chunks(query, candidates)
+    if filters and len(chunks) < min(top_k, settings.RETRIEVAL_FILTER_MIN_RESULTS):
+        logger.info(f"Only {len(chunks)} chunks for {filters}, retrying without filters")
+        with _intent_lock:
+            _intent_stats["fallbacks"] += 1
+        chunks = retrieve_relevant_chunks(query, candidates)
+    
+    if settings.RERANK_ENABLED:
+        return rerank(query, chunks, top_k)
+    return chunks
+
+def get_intent_stats() -> Dict:
+    """How often queries were narrowed to a topic, and how often that fell back"""
+    with _intent_lock:
+        stats = dict(_intent_stats)
+    stats["enabled"] = settings.RETRIEVAL_INTENT_FILTER
+    return stats
+
+
+def build_system_prompt(language: str = "English") -> str:
+    """
+    Build the static system instructions for a response language
+    
+    The text depends only on the language, so the LLM can keep it as a cached
+    prompt prefix (Ollama keeps its KV cache while the model stays loaded);
+    everything that varies per request goes into build_user_prompt.
+    
+    Args:
+        language: Target language for the response
+        
+    Returns:
+        System prompt string
+    """
     # Language Specific Rules
     language_rules = ""
     if "tamil" in language.lower():
@@ -157,7 +466,7 @@ HINDI GENERATION RULES:
 3. Use formal and respectful phrasing ("Aap", not "Tu").
 """
 
-    system = f"""{system_role_instruction}
+    system = f"""You are an expert Indian Cyber-SOP Assistant. Your role is to guide victims of cybercrime.
 
 STRICT SCOPE ENFORCEMENT:
 You are a specialized Cyber Security Assistant. You DO NOT answer general questions (like 'I love you', 'sing a song', 'tell me a joke', 'recipe', 'history', etc.).
@@ -188,11 +497,51 @@ CRITICAL INSTRUCTION - LANGUAGE:
 You MUST respond in {language}. The entire response must be in {language} script.
 {language_rules}
 """
+    return system
 
-
-    prompt = f"""{system}
-
-CONTEXT FROM OFFICIAL KNOWLEDGE BASE:
+def build_user_prompt(user_message: str, chunks: List[Dict], language: str = "English", extra_context: str = "") -> str:
+    """
+    Build the per-request part of the prompt: retrieved context and the query
+    
+    Args:
+        user_message: User's question
+        chunks: Retrieved document chunks
+        language: Target language for the response
+        extra_context: Additional context (e.g., OCR text from image)
+        
+    Returns:
+        User prompt string
+    """
+    context_str = ""
+    
+    # If image/OCR context is present, shift persona to Fraud Analyst
+    if extra_context:
+        context_str += "ROLE FOR THIS QUERY: Act as an expert Cyber Fraud Analyst. The user has uploaded an image which you must analyze for scams, fraud, or phishing.\n\n"
+        context_str += f"Context from uploaded image/screenshot:\n{extra_context}\n\n"
+    
+    # Build context from chunks: overlapping neighbours merged, trimmed to the token budget
+    chunks = pack_chunks(chunks)
+    if chunks:
+        context_parts = []
+        for i, chunk in enumerate(chunks, 1):
+            source = chunk["metadata"].get("source", "Unknown Source")
+            title = chunk["metadata"].get("title", "")
+            section = chunk["metadata"].get("section", "")
+            
+            header = f"[Source {i}: {source}"
+            if title:
+                header += f" - {title}"
+            if section:
+                header += f" - {section}"
+            header += "]"
+            
+            context_parts.append(f"{header}\n{chunk['content']}\n")
+        
+        context_str += "Context from official sources:\n" + "\n".join(context_parts)
+    else:
+        context_str += "No specific official documents found for this query. Use general cyber safety knowledge."
+    
+    return f"""CONTEXT FROM OFFICIAL KNOWLEDGE BASE:
 {context_str}
 
 USER QUERY:
@@ -200,21 +549,75 @@ USER QUERY:
 
 RESPONSE ({language}):
 Provide a clear, actionable, step-by-step response in {language}."""
+
+def build_prompt(user_message: str, chunks: List[Dict], language: str = "English", extra_context: str = "") -> str:
+    """
+    Build a single-string prompt (system instructions followed by the user part)
+    
+    Kept for callers that cannot send a separate system message.
+    
+    Returns:
+        Complete prompt string
+    """
+    system = build_system_prompt(language)
+    return f"{system}\n\n{build_user_prompt(user_message, chunks, language, extra_context)}"
+
+def encode_frame(frame: Dict) -> str:
+    """Serialize one NDJSON frame (orjson when installed; non-ASCII text is not escaped)"""
+    if orjson is not None:
+        return orjson.dumps(frame, option=orjson.OPT_APPEND_NEWLINE).decode()
+    return json.dumps(frame, ensure_ascii=False) + "\n"
+
+def _retrieve_and_build_prompt(retrieval_query: str, user_message: str, language: str, extra_context: str):
+    """
+    Retrieve chunks and assemble the prompt (blocking: search and token counting)
     
-    return prompt
+    Returns:
+        (chunks, system prompt, user prompt)
+    """
+    chunks = retrieve_for_query(retrieval_query, 5)
+    # A stable per-language system prefix plus the per-request context and query
+    system = build_system_prompt(language)
+    prompt = build_user_prompt(user_message, chunks, language, extra_context)
+    prompt_tokens = count_tokens(system) + count_tokens(prompt)
+    record_prompt_tokens(prompt_tokens)
+    logger.info(f"Prompt size: {prompt_tokens} tokens")
+    return chunks, system, prompt
 
-def answer_query_stream(user_message: str, language: str = "English", extra_context: str = "", chat_id: int = None):
+async def answer_query_stream(user_message: str, language: str = "English", extra_context: str = "", chat_id: int = None, is_disconnected=None, on_content: Optional[Callable[[str], None]] = None):
     """
     RAG pipeline with streaming response
     
+    Async generator. Embedding and vector search are CPU/disk bound and run
+    in worker threads; the LLM stream is consumed asynchronously.
+    
+    Upstream tokens are coalesced into larger content frames: the buffer is
+    flushed once it holds STREAM_FLUSH_MAX_CHARS characters or its oldest
+    text is STREAM_FLUSH_INTERVAL_MS old (on a timer, so a stalled upstream
+    does not hold buffered text back), and at the end of the answer.
+    
     Args:
         user_message: User's question
         language: Language to respond in
         extra_context: Additional context from OCR etc.
+        is_disconnected: Optional coroutine function reporting client disconnects;
+            generation stops (and nothing is cached) once it returns True
+        on_content: Optional callback receiving the raw answer text of every
+            content frame sent, so callers need not parse the frames again
+            (and any text still buffered when the stream is abandoned)
         
     Yields:
-        Dict with answer chunks or source metadata
+        NDJSON lines with answer chunks or source metadata
     """
+    buffer = []
+    
+    def flush() -> str:
+        text = "".join(buffer)
+        buffer.clear()
+        if on_content is not None:
+            on_content(text)
+        return encode_frame({"type": "content", "data": text})
+    
     try:
         # Combine user message and extra context for better retrieval?
         # Actually, retrieving based on just the message is usually safer, 
@@ -224,11 +627,10 @@ def answer_query_stream(user_message: str, language: str = "English", extra_cont
         if len(user_message.split()) < 5 and extra_context:
             retrieval_query = f"{user_message} {extra_context[:200]}"
             
-        # Retrieve relevant chunks
-        chunks = retrieve_relevant_chunks(retrieval_query, top_k=5)
-        
-        # Build prompt with context
-        prompt = build_prompt(user_message, chunks, language, extra_context)
+        # Retrieval and prompt packing (tokenizer-bound) run in a worker thread, off the event loop
+        chunks, system, prompt = await asyncio.to_thread(
+            _retrieve_and_build_prompt, retrieval_query, user_message, language, extra_context
+        )
         
         # Format source references
         sources = []
@@ -241,27 +643,100 @@ def answer_query_stream(user_message: str, language: str = "English", extra_cont
             })
             
         # Yield chat_id first for continuity
-        import json
         if chat_id:
-            yield json.dumps({"type": "meta", "chat_id": chat_id}) + "\n"
+            yield encode_frame({"type": "meta", "chat_id": chat_id})
+
+        # Semantic answer cache (skipped for image uploads, whose answer depends on the OCR text)
+        use_cache = settings.ANSWER_CACHE_ENABLED and not extra_context
+        if use_cache:
+            cache = get_answer_cache()
+            query_embedding = await asyncio.to_thread(embed_query, retrieval_query)  # served from the query embedding cache
+            chunk_ids = tuple(chunk["id"] for chunk in chunks)
+            kb_version = get_kb_version()
+            cached = cache.lookup(query_embedding, language, chunk_ids, kb_version)
+            if cached:
+                logger.info(f"Answer cache hit (similarity {cached['similarity']:.3f})")
+                yield encode_frame({"type": "sources", "data": cached["sources"]})
+                buffer.append(cached["answer"])
+                yield flush()
+                return
 
-        yield json.dumps({"type": "sources", "data": sources}) + "\n"
+        yield encode_frame({"type": "sources", "data": sources})
         
         # Stream answer using LLM
         from .llm_client import generate_streaming_response
-        for text_chunk in generate_streaming_response(prompt, language=language):
-            yield json.dumps({"type": "content", "data": text_chunk}) + "\n"
+        answer_parts = []
+        buffered_chars = 0
+        buffered_since = 0.0
+        max_chars = settings.STREAM_FLUSH_MAX_CHARS
+        interval = settings.STREAM_FLUSH_INTERVAL_MS / 1000
+        stream = generate_streaming_response(prompt, language=language, is_disconnected=is_disconnected, system=system)
+        # The next token is awaited in a task, so a stalled upstream can be waited on with a
+        # deadline (the buffer's flush time) without cancelling the generator mid-token
+        next_token = None
+        try:
+            while True:
+                if next_token is None:
+                    next_token = asyncio.ensure_future(stream.__anext__())
+                timeout = max(0.0, buffered_since + interval - time.monotonic()) if buffer else None
+                done, _ = await asyncio.wait({next_token}, timeout=timeout)
+                if not done:
+                    # Upstream stalled: send what is buffered instead of holding it until the next token
+                    buffered_chars = 0
+                    yield flush()
+                    continue
+                try:
+                    text_chunk = next_token.result()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    next_token = None
+                answer_parts.append(text_chunk)
+                if not buffer:
+                    buffered_since = time.monotonic()
+                buffer.append(text_chunk)
+                buffered_chars += len(text_chunk)
+                if buffered_chars >= max_chars or time.monotonic() - buffered_since >= interval:
+                    buffered_chars = 0
+                    yield flush()
+        finally:
+            if next_token is not None:
+                next_token.cancel()
+                await asyncio.gather(next_token, return_exceptions=True)
+            await stream.aclose()
+        if buffer:
+            yield flush()
+
+        # Only reached when the stream completed: failures raise GenerationFailed
+        # (handled below), so partial or error answers are never cached
+        answer = "".join(answer_parts)
+        if use_cache and answer.strip():
+            cache.store(query_embedding, language, chunk_ids, kb_version, sources, answer)
             
+    except GenerationAbandoned:
+        # Client is gone: no error frame, and the partial answer must not be cached
+        return
+    except LLMQueueFull as e:
+        # Queue filled up after the pre-stream check: the response has started, so no 503
+        logger.warning(f"answer_query_stream: {e}")
+        yield encode_frame({"type": "error", "error": str(e), "retry_after": e.retry_after})
     except Exception as e:
         logger.error(f"Error in answer_query_stream: {str(e)}")
-        yield json.dumps({"type": "error", "error": str(e)}) + "\n"
+        if buffer:
+            yield flush()
+        yield encode_frame({"type": "error", "error": str(e)})
+    finally:
+        # Disconnected or cancelled with text still buffered: no frame can be sent,
+        # but on_content still gets it so the saved partial answer is complete
+        if buffer and on_content is not None:
+            on_content("".join(buffer))
+            buffer.clear()
 
 
 def get_collection_stats() -> Dict:
     """Get statistics about the vector store"""
     try:
-        collection = get_collection()
-        count = collection.count()
+        count = get_collection_count(force_refresh=True)
         return {
             "total_chunks": count,
             "collection_name": "cyber_sop",
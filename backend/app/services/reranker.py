@@ -0,0 +1,204 @@
+"""
+Reranker - Cross-encoder rescoring of retrieved chunks within a latency budget
+Falls back to the retrieval order when scoring would not finish in time
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, List, Optional, Tuple
+from ..config import settings
+from .embedding_cache import normalize_query
+import hashlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Query + one ~128-token chunk fit comfortably
+_MAX_LENGTH = 256
+
+_cross_encoder = None
+_model_lock = threading.Lock()
+_executor = None
+_score_cache = None
+
+_stats_lock = threading.Lock()
+_inflight = 0
+_stats = {"requests": 0, "reranked": 0, "over_budget": 0, "busy": 0, "errors": 0, "pairs_scored": 0, "total_ms": 0.0}
+
+
+class RerankScoreCache:
+    """Thread-safe LRU of cross-encoder scores keyed by (normalized query, chunk text hash)"""
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[float]:
+        with self._lock:
+            score = self._entries.get(key)
+            if score is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return score
+
+    def put(self, key: Tuple[str, str], score: float):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = score
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def get_cross_encoder():
+    """Lazy load the cross-encoder model"""
+    global _cross_encoder
+    if _cross_encoder is None:
+        with _model_lock:
+            if _cross_encoder is None:
+                from sentence_transformers import CrossEncoder
+                logger.info(f"Loading reranker model: {settings.RERANK_MODEL}")
+                _cross_encoder = CrossEncoder(settings.RERANK_MODEL, max_length=_MAX_LENGTH)
+                logger.info("Reranker model loaded")
+    return _cross_encoder
+
+
+def get_score_cache() -> RerankScoreCache:
+    global _score_cache
+    if _score_cache is None:
+        _score_cache = RerankScoreCache(settings.RERANK_CACHE_SIZE)
+    return _score_cache
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.RERANK_WORKERS, thread_name_prefix="rerank")
+    return _executor
+
+
+def _chunk_key(chunk: Dict) -> str:
+    content_hash = (chunk.get("metadata") or {}).get("content_hash")
+    return content_hash or hashlib.sha256(chunk["content"].encode("utf-8")).hexdigest()[:32]
+
+
+def _score(query: str, pairs: List[Tuple[Tuple[str, str], str]]) -> Dict[Tuple[str, str], float]:
+    """Score (cache key, chunk text) pairs in batches, caching every score"""
+    global _inflight
+    try:
+        model = get_cross_encoder()
+        cache = get_score_cache()
+        scores = {}
+        batch_size = settings.RERANK_BATCH_SIZE
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            predicted = model.predict([(query, text) for _, text in batch], batch_size=len(batch), show_progress_bar=False)
+            for (key, _), score in zip(batch, predicted):
+                scores[key] = float(score)
+                cache.put(key, float(score))
+        with _stats_lock:
+            _stats["pairs_scored"] += len(pairs)
+        return scores
+    finally:
+        with _stats_lock:
+            _inflight -= 1
+
+
+def rerank(query: str, chunks: List[Dict], top_k: int, budget_ms: Optional[float] = None) -> List[Dict]:
+    """
+    Reorder chunks by cross-encoder relevance to the query
+
+    Cached (query, chunk) scores are reused; the rest are scored in batches
+    of RERANK_BATCH_SIZE on the reranker's own worker threads. The caller
+    waits at most `budget_ms` (default RERANK_BUDGET_MS): if scoring is not
+    done by then, or every worker is busy, the retrieval order is kept.
+    Late scores still land in the cache for the next request.
+
+    Args:
+        query: User's question
+        chunks: Retrieved chunks, in retrieval order
+        top_k: Number of chunks to return
+        budget_ms: Time budget for this call
+
+    Returns:
+        Top `top_k` chunks, with a "rerank_score" when reranked
+    """
+    global _inflight
+    if len(chunks) <= 1:
+        return chunks[:top_k]
+    start = time.perf_counter()
+    budget = (settings.RERANK_BUDGET_MS if budget_ms is None else budget_ms) / 1000
+    normalized = normalize_query(query)
+    cache = get_score_cache()
+
+    scores = {}
+    missing = []
+    for chunk in chunks:
+        key = (normalized, _chunk_key(chunk))
+        score = cache.get(key)
+        if score is None:
+            missing.append((key, chunk["content"]))
+        else:
+            scores[key] = score
+
+    outcome = "reranked"
+    if missing:
+        with _stats_lock:
+            busy = _inflight >= settings.RERANK_WORKERS
+            if not busy:
+                _inflight += 1
+        if busy:
+            outcome = "busy"
+        else:
+            future = _get_executor().submit(_score, query, missing)
+            try:
+                scores.update(future.result(timeout=max(0.0, budget - (time.perf_counter() - start))))
+            except FutureTimeout:
+                outcome = "over_budget"
+            except Exception as e:
+                logger.error(f"Reranking failed: {e}")
+                outcome = "errors"
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    with _stats_lock:
+        _stats["requests"] += 1
+        _stats[outcome] += 1
+        _stats["total_ms"] += elapsed_ms
+    if outcome != "reranked":
+        logger.info(f"Rerank skipped ({outcome}, {elapsed_ms:.0f} ms); keeping retrieval order")
+        return chunks[:top_k]
+
+    ranked = sorted(
+        ((scores[(normalized, _chunk_key(chunk))], position, chunk) for position, chunk in enumerate(chunks)),
+        key=lambda item: (-item[0], item[1])
+    )
+    return [dict(chunk, rerank_score=score) for score, _, chunk in ranked[:top_k]]
+
+
+def get_rerank_stats() -> Dict:
+    """Reranked vs fallen-back requests, average time and score cache usage"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["avg_ms"] = round(stats.pop("total_ms") / stats["requests"], 1) if stats["requests"] else 0.0
+    stats["enabled"] = settings.RERANK_ENABLED
+    stats["model"] = settings.RERANK_MODEL
+    stats["cache"] = get_score_cache().stats()
+    return stats
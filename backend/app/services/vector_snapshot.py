@@ -0,0 +1,281 @@
+"""
+Vector Snapshot - Exact in-memory nearest-neighbour search over all chunks
+Embeddings are kept in a memory-mapped float32 matrix written at ingest time
+"""
+from typing import Dict, List, Optional
+from ..config import settings
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Pointer file naming the active snapshot directory (replaced atomically)
+_CURRENT_FILE = "CURRENT"
+# Chunks read per collection.get() page when building
+_PAGE_SIZE = 5000
+# Snapshot directories kept (older ones may still be mapped by other processes)
+_KEEP_SNAPSHOTS = 2
+# Upper bound on the (queries x chunks) distance block computed at once in search_many
+_MAX_BLOCK_ELEMENTS = 32_000_000
+# Distinct filters whose masked norms are kept (intent filters have few combinations)
+_MAX_CACHED_FILTERS = 64
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+_checked_at = 0.0
+
+
+class VectorSnapshot:
+    """
+    Read-only snapshot of the collection
+
+    Files in the snapshot directory:
+        embeddings.npy  float32 (n, dim), memory-mapped
+        sq_norms.npy    float32 (n,) squared row norms
+        documents.bin   chunk texts as concatenated UTF-8, memory-mapped
+        offsets.npy     int64 (n + 1,) byte offsets into documents.bin
+        chunks.json     ids and metadatas
+
+    Distances are squared L2 like Chroma's default space, so results and
+    distances match a Chroma query.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.embeddings = np.load(os.path.join(path, "embeddings.npy"), mmap_mode="r")
+        self.sq_norms = np.load(os.path.join(path, "sq_norms.npy"))
+        self.offsets = np.load(os.path.join(path, "offsets.npy"))
+        documents_path = os.path.join(path, "documents.bin")
+        if os.path.getsize(documents_path):
+            self._documents = np.memmap(documents_path, dtype=np.uint8, mode="r")
+        else:
+            self._documents = np.zeros(0, dtype=np.uint8)
+        with open(os.path.join(path, "chunks.json"), encoding="utf-8") as f:
+            chunks = json.load(f)
+        self.ids: List[str] = chunks["ids"]
+        self.metadatas: List[Dict] = chunks["metadatas"]
+        self.created_at = chunks.get("created_at", 0.0)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._filtered_norms: Dict[str, tuple] = {}
+        self.searches = 0
+        self.search_ms_total = 0.0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def document(self, i: int) -> str:
+        return bytes(self._documents[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def _mask(self, filters: Dict) -> np.ndarray:
+        """Rows whose metadata matches the filters (per-key value columns are cached)"""
+        mask = np.ones(len(self.ids), dtype=bool)
+        for key, wanted in filters.items():
+            if wanted is None or wanted == "" or wanted == []:
+                continue
+            column = self._columns.get(key)
+            if column is None:
+                column = np.array([meta.get(key) for meta in self.metadatas], dtype=object)
+                self._columns[key] = column
+            wanted = list(wanted) if isinstance(wanted, (list, tuple, set)) else [wanted]
+            mask &= np.isin(column, wanted)
+        return mask
+
+    def _norms_for(self, filters: Dict) -> tuple:
+        """
+        Squared norms with non-matching rows set to inf, and the match count
+
+        Non-matching rows then never reach the top k, so filtered searches run
+        over the whole memory-mapped matrix instead of copying a subset of it.
+        """
+        key = json.dumps(filters, sort_keys=True, default=sorted)
+        cached = self._filtered_norms.get(key)
+        if cached is None:
+            mask = self._mask(filters)
+            cached = (np.where(mask, self.sq_norms, np.float32(np.inf)), int(np.count_nonzero(mask)))
+            if len(self._filtered_norms) >= _MAX_CACHED_FILTERS:
+                self._filtered_norms.pop(next(iter(self._filtered_norms)), None)
+            self._filtered_norms[key] = cached
+        return cached
+
+    def search(self, query_embedding: np.ndarray, top_k: int, filters: Optional[Dict] = None) -> List[Dict]:
+        """
+        Exact top-k by squared L2 distance with one matrix-vector product
+
+        Args:
+            query_embedding: Query vector (same model as the snapshot)
+            top_k: Number of results
+            filters: Optional metadata filters (as rag.where_clause)
+
+        Returns:
+            Chunks (id, content, metadata, distance), nearest first
+        """
+        return self.search_many(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1), top_k, filters)[0]
+
+    def search_many(self, query_embeddings: np.ndarray, top_k: int, filters: Optional[Dict] = None) -> List[List[Dict]]:
+        """
+        Exact top-k for several queries, one matrix product per block of queries
+
+        Returns:
+            One result list (as search) per query row
+        """
+        start = time.perf_counter()
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        n = len(self.sq_norms)
+        sq_norms, matches = self._norms_for(filters) if filters else (self.sq_norms, n)
+
+        top_k = min(top_k, matches)
+        if top_k == 0:
+            return [[] for _ in queries]
+
+        results = []
+        block = max(1, _MAX_BLOCK_ELEMENTS // n)
+        for begin in range(0, len(queries), block):
+            q = queries[begin:begin + block]
+            distances = sq_norms[np.newaxis, :] - 2.0 * (q @ self.embeddings.T) + np.einsum("ij,ij->i", q, q)[:, np.newaxis]
+            if top_k < n:
+                top = np.argpartition(distances, top_k - 1, axis=1)[:, :top_k]
+            else:
+                top = np.broadcast_to(np.arange(n), (len(q), n))
+            for row_distances, candidates in zip(distances, top):
+                candidates = candidates[np.argsort(row_distances[candidates])]
+                chunks = []
+                for i in candidates:
+                    chunks.append({
+                        "id": self.ids[i],
+                        "content": self.document(i),
+                        "metadata": self.metadatas[i],
+                        "distance": max(0.0, float(row_distances[i]))
+                    })
+                results.append(chunks)
+        self.searches += len(queries)
+        self.search_ms_total += (time.perf_counter() - start) * 1000
+        return results
+
+    def stats(self) -> Dict:
+        return {
+            "path": self.path,
+            "chunks": len(self.ids),
+            "dim": int(self.embeddings.shape[1]) if self.embeddings.ndim == 2 else 0,
+            "size_mb": round(self.embeddings.nbytes / 1e6, 1),
+            "created_at": self.created_at,
+            "searches": self.searches,
+            "avg_search_ms": round(self.search_ms_total / self.searches, 3) if self.searches else 0.0
+        }
+
+
+def write_snapshot(directory: str, ids: List[str], embeddings: np.ndarray, documents: List[str], metadatas: List[Dict]) -> str:
+    """
+    Write a snapshot into a new subdirectory of `directory` and make it current
+
+    Returns:
+        Path of the new snapshot
+    """
+    os.makedirs(directory, exist_ok=True)
+    name = f"snapshot-{time.time_ns()}"
+    path = os.path.join(directory, name)
+    os.makedirs(path)
+
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32).reshape(len(ids), -1)
+    np.save(os.path.join(path, "embeddings.npy"), embeddings)
+    np.save(os.path.join(path, "sq_norms.npy"), np.einsum("ij,ij->i", embeddings, embeddings))
+    encoded = [text.encode("utf-8") for text in documents]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    np.save(os.path.join(path, "offsets.npy"), offsets)
+    with open(os.path.join(path, "documents.bin"), "wb") as f:
+        f.write(b"".join(encoded))
+    with open(os.path.join(path, "chunks.json"), "w", encoding="utf-8") as f:
+        json.dump({"ids": ids, "metadatas": metadatas, "created_at": time.time()}, f, ensure_ascii=False)
+
+    pointer = os.path.join(directory, _CURRENT_FILE)
+    with open(pointer + ".tmp", "w") as f:
+        f.write(name)
+    os.replace(pointer + ".tmp", pointer)
+
+    # Drop old snapshots
+    old = sorted(d for d in os.listdir(directory) if d.startswith("snapshot-") and d != name)
+    for stale in old[:max(0, len(old) - (_KEEP_SNAPSHOTS - 1))]:
+        shutil.rmtree(os.path.join(directory, stale), ignore_errors=True)
+    return path
+
+
+def build_snapshot(collection=None, directory: Optional[str] = None) -> Dict:
+    """
+    Snapshot every chunk of the collection (default: the app's collection)
+
+    Returns:
+        Chunk count, path and build time
+    """
+    from .rag import get_collection
+    collection = collection or get_collection()
+    directory = directory or settings.VECTOR_SNAPSHOT_DIR
+    start = time.perf_counter()
+
+    ids, documents, metadatas, blocks = [], [], [], []
+    offset = 0
+    while True:
+        page = collection.get(include=["embeddings", "documents", "metadatas"], limit=_PAGE_SIZE, offset=offset)
+        if not page["ids"]:
+            break
+        ids.extend(page["ids"])
+        documents.extend(text or "" for text in page["documents"])
+        metadatas.extend(page["metadatas"])
+        blocks.append(np.asarray(page["embeddings"], dtype=np.float32))
+        offset += len(page["ids"])
+    embeddings = np.concatenate(blocks) if blocks else np.zeros((0, 0), dtype=np.float32)
+
+    path = write_snapshot(directory, ids, embeddings, documents, metadatas)
+    elapsed = time.perf_counter() - start
+    logger.info(f"Vector snapshot written: {len(ids)} chunks in {elapsed:.1f}s ({path})")
+    _reload(directory)
+    return {"chunks": len(ids), "path": path, "seconds": round(elapsed, 2)}
+
+
+def _current_path(directory: str) -> Optional[str]:
+    try:
+        with open(os.path.join(directory, _CURRENT_FILE)) as f:
+            return os.path.join(directory, f.read().strip())
+    except FileNotFoundError:
+        return None
+
+
+def _reload(directory: str):
+    global _snapshot, _checked_at
+    with _snapshot_lock:
+        path = _current_path(directory)
+        _checked_at = time.monotonic()
+        if path is None or (_snapshot is not None and _snapshot.path == path):
+            return
+        try:
+            _snapshot = VectorSnapshot(path)
+            logger.info(f"Vector snapshot loaded: {len(_snapshot)} chunks from {path}")
+        except Exception as e:
+            logger.error(f"Could not load vector snapshot {path}: {e}")
+
+
+def get_vector_snapshot() -> Optional[VectorSnapshot]:
+    """
+    The current snapshot, or None if none has been built
+
+    The CURRENT pointer is re-checked at most every VECTOR_SNAPSHOT_CHECK_SECONDS,
+    so snapshots written by an ingest in another process are picked up.
+    """
+    if _checked_at == 0.0 or time.monotonic() - _checked_at > settings.VECTOR_SNAPSHOT_CHECK_SECONDS:
+        _reload(settings.VECTOR_SNAPSHOT_DIR)
+    return _snapshot
+
+
+def get_snapshot_stats() -> Dict:
+    """Engine in use and the loaded snapshot's size and search latency"""
+    snapshot = _snapshot
+    return {
+        "engine": settings.RETRIEVAL_ENGINE,
+        "loaded": snapshot is not None,
+        **(snapshot.stats() if snapshot is not None else {})
+    }
@@ -0,0 +1,161 @@
+"""
+Warm-up Service - Preloads models and stores so the first request is fast
+Tracks readiness for the /api/ready endpoint
+"""
+from typing import Dict
+from ..config import settings
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_state = {
+    "ready": False,
+    "started_at": None,
+    "finished_at": None,
+    "steps": {},
+    "retries": 0,
+    "error": None
+}
+
+def _record_step(name: str, start: float, ok: bool, detail: str):
+    with _lock:
+        _state["steps"][name] = {
+            "ok": ok,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            "detail": detail
+        }
+
+def _run_step(name: str, fn) -> bool:
+    """Run one blocking warm-up step, recording its duration and outcome"""
+    start = time.perf_counter()
+    try:
+        detail, ok = fn(), True
+    except Exception as e:
+        logger.error(f"Warm-up step '{name}' failed: {e}")
+        detail, ok = str(e), False
+    _record_step(name, start, ok, detail)
+    return ok
+
+async def _run_async_step(name: str, fn) -> bool:
+    """Run one async warm-up step on the event loop"""
+    start = time.perf_counter()
+    try:
+        detail, ok = await fn(), True
+    except Exception as e:
+        logger.error(f"Warm-up step '{name}' failed: {e}")
+        detail, ok = str(e), False
+    _record_step(name, start, ok, detail)
+    return ok
+
+def _warm_embedding_model():
+    from .embedding_client import get_embedding_model, embed_text
+    get_embedding_model()
+    # Dummy encode so tokenizer, kernels and thread pools are initialised
+    embed_text(["How do I report a UPI fraud?", "मेरा फोन चोरी हो गया"])
+    return "loaded"
+
+def _warm_vector_store():
+    from .rag import get_collection, get_collection_count, get_lexical_index
+    from .vector_snapshot import build_snapshot, get_vector_snapshot
+    get_collection()
+    count = get_collection_count(force_refresh=True)
+    if settings.RETRIEVAL_ENGINE == "snapshot" and get_vector_snapshot() is None and count > 0:
+        # First start with the snapshot engine: take one from the collection
+        build_snapshot()
+    if settings.RETRIEVAL_MODE == "hybrid":
+        # Build the BM25 index now rather than on the first query
+        get_lexical_index()
+        return f"{count} chunks (lexical index built)"
+    return f"{count} chunks"
+
+def _warm_reranker():
+    from .reranker import get_cross_encoder
+    get_cross_encoder().predict([("How do I report a UPI fraud?", "Call 1930 immediately.")], show_progress_bar=False)
+    return "loaded"
+
+async def _ping_llm():
+    # Also opens the first pooled connection to Ollama
+    from .llm_client import check_ollama_health
+    return (await check_ollama_health()).get("status", "unknown")
+
+# Steps that must succeed before the service is ready
+_REQUIRED_STEPS = {
+    "embedding_model": _warm_embedding_model,
+    "vector_store": _warm_vector_store
+}
+
+async def _run_required(names) -> list:
+    """Run the named required steps in a worker thread; returns those that failed"""
+    failed = []
+    for name in names:
+        # Model loading and Chroma are blocking
+        if not await asyncio.to_thread(_run_step, name, _REQUIRED_STEPS[name]):
+            failed.append(name)
+    return failed
+
+def _set_ready(failed: list):
+    with _lock:
+        _state["finished_at"] = time.time()
+        _state["ready"] = not failed
+        _state["error"] = f"Warm-up failed ({', '.join(failed)}); retrying" if failed else None
+
+async def run_warmup():
+    """
+    Preload the embedding model, open the Chroma collection and ping Ollama
+    
+    The service is marked ready once the embedding model and vector store
+    are usable. Ollama is only reported on, since non-English traffic and
+    playground calls can still be served through OpenRouter.
+    
+    Required steps that fail (e.g. Chroma not reachable yet) are retried with
+    exponential backoff, from WARMUP_RETRY_INITIAL_SECONDS up to
+    WARMUP_RETRY_MAX_SECONDS, until they succeed or the app shuts down.
+    """
+    with _lock:
+        _state["started_at"] = time.time()
+    logger.info("Warming up embedding model, vector store and LLM...")
+
+    failed = await _run_required(list(_REQUIRED_STEPS))
+    if settings.RERANK_ENABLED:
+        # Not required for readiness: reranking falls back to retrieval order
+        await asyncio.to_thread(_run_step, "reranker", _warm_reranker)
+    await _run_async_step("llm", _ping_llm)
+    _set_ready(failed)
+    logger.info(f"Warm-up finished (ready={_state['ready']})")
+
+    delay = settings.WARMUP_RETRY_INITIAL_SECONDS
+    while failed:
+        logger.warning(f"Warm-up steps failed ({', '.join(failed)}); retrying in {delay:.0f}s")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, settings.WARMUP_RETRY_MAX_SECONDS)
+        failed = await _run_required(failed)
+        with _lock:
+            _state["retries"] += 1
+        _set_ready(failed)
+        if not failed:
+            logger.info(f"Warm-up recovered after {_state['retries']} retries (ready=True)")
+
+def mark_ready():
+    """Mark the service ready without warming up (lazy loading on first request)"""
+    with _lock:
+        _state["ready"] = True
+
+def is_ready() -> bool:
+    return _state["ready"]
+
+def get_warmup_state() -> Dict:
+    """Snapshot of warm-up progress"""
+    with _lock:
+        return {
+            "ready": _state["ready"],
+            "warmup_enabled": settings.WARMUP_ON_STARTUP,
+            "started_at": _state["started_at"],
+            "finished_at": _state["finished_at"],
+            "steps": dict(_state["steps"]),
+            "retries": _state["retries"],
+            "error": _state["error"]
+        }
@@ -0,0 +1,87 @@
+"""
+Batch Retrieval Benchmark
+Compares one retrieve_relevant_chunks call per query with retrieve_batch
+(one batched encode and one multi-query search per batch) on the live collection
+
+Usage:
+    python scripts/benchmark_batch_retrieval.py [--queries 2000] [--batch-size 256]
+"""
+import sys
+import argparse
+import random
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.config import settings
+from app.services.embedding_client import embed_text, get_query_cache
+from app.services.rag import get_collection_count, retrieve_batch, retrieve_relevant_chunks
+
+TEMPLATES = [
+    "Someone took {amount} rupees from my account through {channel}, what should I do?",
+    "I got a call from a fake {org} officer asking for my OTP",
+    "My phone was stolen in {city}, how do I block the IMEI?",
+    "A {channel} link asked me to pay a fee for a job offer",
+    "How do I check how many SIM cards are registered on my Aadhaar in {city}?",
+    "My computer files were encrypted and they want {amount} rupees in bitcoin",
+    "Fake profile of me on {channel} is asking my friends for money",
+]
+FILLS = {
+    "amount": ["5000", "25,000", "1 lakh", "800"],
+    "channel": ["UPI", "WhatsApp", "Instagram", "SMS", "Telegram"],
+    "org": ["bank", "customs", "CBI", "electricity board"],
+    "city": ["Pune", "Chennai", "Delhi", "Bengaluru"],
+}
+
+
+def synthetic_complaints(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(**{key: rng.choice(values) for key, values in FILLS.items()}) + f" (case {i})"
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-query vs batched retrieval")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=settings.RETRIEVE_BATCH_SIZE)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    count = get_collection_count(force_refresh=True)
+    if count == 0:
+        print("Collection is empty. Run the ingestion scripts first.")
+        return
+    queries = synthetic_complaints(args.queries)
+    print(f"Collection size: {count} chunks, {len(queries)} unique queries, mode {settings.RETRIEVAL_MODE}\n")
+
+    # Load the model (and lexical index) outside the timed runs; unique queries keep the cache cold
+    embed_text(["warm up"])
+    retrieve_batch(["warm up"], args.top_k)
+    get_query_cache().clear()
+
+    start = time.perf_counter()
+    single = [retrieve_relevant_chunks(query, args.top_k) for query in queries]
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = []
+    for offset in range(0, len(queries), args.batch_size):
+        batched.extend(retrieve_batch(queries[offset:offset + args.batch_size], args.top_k))
+    batched_s = time.perf_counter() - start
+
+    same = sum(
+        [c["id"] for c in a] == [c["id"] for c in b] for a, b in zip(single, batched)
+    )
+    print(f"{'per query':<22} {single_s:8.2f} s | {len(queries) / single_s:8.1f} queries/sec")
+    print(f"{f'batched ({args.batch_size})':<22} {batched_s:8.2f} s | {len(queries) / batched_s:8.1f} queries/sec")
+    print(f"\nSpeed-up: {single_s / batched_s:.1f}x; identical results for {same}/{len(queries)} queries")
+    print(f"Projected for 50k queries: {50000 / (len(queries) / batched_s) / 60:.1f} min batched vs {50000 / (len(queries) / single_s) / 60:.1f} min per query")
+
+
+if __name__ == "__main__":
+    main()
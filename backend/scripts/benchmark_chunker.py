@@ -0,0 +1,157 @@
+"""
+Chunker Benchmark
+Compares the fixed 1000-char chunker with the sentence/token-aware chunker:
+chunk counts, tokens per chunk (and how many exceed the model's limit and
+get truncated), chunking + embedding time, and retrieval hit rate
+
+Retrieval is exact cosine search in memory, so neither Chroma nor the
+database is needed.
+
+Usage:
+    python scripts/benchmark_chunker.py [--top-k 3] [--repeat 20]
+"""
+import sys
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.config import settings
+from app.services.chunker import chunk_text, count_embedding_tokens
+from app.services.embedding_client import embed_query, embed_text
+
+DOCUMENTS = {
+    "financial": (
+        "Citizen Financial Cyber Fraud Reporting. If money has been debited from your account through UPI, card or net banking fraud, act within the golden hour. "
+        "1. Call the national helpline 1930 immediately and give your bank name, account number and transaction id (UTR). "
+        "2. The helpline raises a ticket with the bank and the payment intermediary so the money can be put on hold. "
+        "3. Note the acknowledgement number sent by SMS. "
+        "4. Within 24 hours, complete the complaint on https://cybercrime.gov.in under 'Financial Fraud' using the same acknowledgement number. "
+        "5. Upload the bank statement showing the debit and screenshots of the fraudster's messages. "
+        "6. Visit your bank branch with a written request to block the card and to dispute the transaction. "
+        "Banks must reverse unauthorised electronic transactions reported within three working days under RBI's zero liability rules. "
+        "Never share your UPI PIN: it is only needed to send money, never to receive it."
+    ),
+    "lost_phone": (
+        "Lost or stolen mobile phone. The Central Equipment Identity Register (CEIR) blocks a phone's IMEI across all Indian networks. "
+        "1. File a police complaint online or at the nearest station and keep a copy of the FIR or complaint number. "
+        "2. Get a duplicate SIM for your lost number from your telecom operator, since OTPs will be sent to it. "
+        "3. Open https://ceir.sancharsaathi.gov.in and choose 'Block Stolen/Lost Mobile'. "
+        "4. Enter the IMEI numbers, which are printed on the phone's box and invoice. "
+        "5. Upload the police complaint and the purchase invoice, then submit. "
+        "6. Keep the request id: it is needed to unblock the phone if you find it. "
+        "If the phone is recovered, use 'Un-Block Found Mobile' on the same portal with the request id."
+    ),
+    "sim_check": (
+        "Checking mobile connections registered in your name. Fraudsters often use SIM cards issued on someone else's identity documents. "
+        "1. Visit the TAFCOP portal at https://tafcop.sancharsaathi.gov.in. "
+        "2. Enter your mobile number and the captcha, then validate with the OTP. "
+        "3. The dashboard lists every number issued against your identity. "
+        "4. Select numbers that are not yours and choose 'Not my number' to have them disconnected. "
+        "5. Choose 'Not required' for old numbers you no longer use. "
+        "Each person may hold at most nine mobile connections across all operators."
+    ),
+    "ransomware": (
+        "Ransomware incident handling. Ransomware encrypts files and demands payment for the key. "
+        "1. Disconnect the infected computer from Wi-Fi and the network cable immediately to stop it spreading. "
+        "2. Do not switch off the machine: memory may hold keys useful to investigators. "
+        "3. Do not pay the ransom, it does not guarantee decryption and funds further crime. "
+        "4. Report the incident to CERT-In at incident@cert-in.org.in with the ransom note and affected systems. "
+        "5. Restore data from offline backups after the system has been cleaned. "
+        "6. Check the No More Ransom project for free decryption tools for known families."
+    ),
+    "hindi_upi": (
+        "यूपीआई धोखाधड़ी होने पर तुरंत कार्रवाई करें। "
+        "1. तुरंत 1930 हेल्पलाइन पर कॉल करें और लेनदेन आईडी बताएं। "
+        "2. अपने बैंक को सूचित करें और कार्ड या खाता ब्लॉक करवाएं। "
+        "3. https://cybercrime.gov.in पर वित्तीय धोखाधड़ी की शिकायत दर्ज करें। "
+        "4. धोखेबाज़ के संदेशों और भुगतान के स्क्रीनशॉट सबूत के रूप में सुरक्षित रखें। "
+        "5. किसी को भी अपना यूपीआई पिन या ओटीपी न बताएं॥ "
+        "पैसे प्राप्त करने के लिए कभी भी पिन की आवश्यकता नहीं होती।"
+    ),
+    "tamil_phone": (
+        "உங்கள் கைபேசி தொலைந்துவிட்டால் உடனே நடவடிக்கை எடுக்கவும். "
+        "1. அருகிலுள்ள காவல் நிலையத்தில் புகார் அளித்து புகார் எண்ணைப் பெறுங்கள். "
+        "2. உங்கள் தொலைத்தொடர்பு நிறுவனத்திடம் மாற்று சிம் அட்டையைப் பெறுங்கள். "
+        "3. https://ceir.sancharsaathi.gov.in இணையதளத்தில் IMEI எண்ணை முடக்க கோரிக்கை சமர்ப்பிக்கவும். "
+        "4. கோரிக்கை எண்ணை பாதுகாப்பாக வைத்திருங்கள்."
+    ),
+}
+
+# (query, document, phrase the retrieved chunk must contain)
+QUERIES = [
+    ("Within how many days must the bank reverse an unauthorised UPI transaction?", "financial", "three working days"),
+    ("Do I need my UPI PIN to receive money?", "financial", "never to receive"),
+    ("Where do I upload the bank statement for a financial fraud complaint?", "financial", "bank statement"),
+    ("Where can I find the IMEI number of my lost phone?", "lost_phone", "box and invoice"),
+    ("How do I unblock my phone after I found it?", "lost_phone", "Un-Block Found Mobile"),
+    ("Why do I need a duplicate SIM after losing my phone?", "lost_phone", "duplicate SIM"),
+    ("How many SIM cards can one person have?", "sim_check", "nine mobile connections"),
+    ("How do I disconnect a number someone registered on my ID?", "sim_check", "Not my number"),
+    ("Should I switch off a computer hit by ransomware?", "ransomware", "Do not switch off"),
+    ("Are there free ransomware decryption tools?", "ransomware", "No More Ransom"),
+    ("यूपीआई धोखाधड़ी के सबूत क्या रखें?", "hindi_upi", "स्क्रीनशॉट"),
+    ("क्या पैसे पाने के लिए पिन चाहिए?", "hindi_upi", "कभी भी पिन"),
+    ("தொலைந்த கைபேசிக்கு மாற்று சிம் எப்படி பெறுவது?", "tamil_phone", "மாற்று சிம்"),
+]
+
+
+def evaluate(strategy: str, top_k: int, repeat: int) -> dict:
+    # Chunking time (averaged) and embedding time for the whole corpus
+    start = time.perf_counter()
+    for _ in range(repeat):
+        corpus = [(name, chunk) for name, text in DOCUMENTS.items() for chunk in chunk_text(text, strategy)]
+    chunk_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    texts = [chunk for _, chunk in corpus]
+    start = time.perf_counter()
+    embeddings = embed_text(texts, normalize=True)
+    embed_ms = (time.perf_counter() - start) * 1000
+
+    tokens = np.array(count_embedding_tokens(texts)) + 2
+    limit = settings.CHUNK_MAX_TOKENS
+
+    hits = 0
+    for query, doc_name, phrase in QUERIES:
+        scores = embeddings @ embed_query(query, normalize=True)
+        top = np.argsort(-scores)[:top_k]
+        if any(corpus[i][0] == doc_name and phrase in corpus[i][1] for i in top):
+            hits += 1
+
+    return {
+        "chunks": len(texts),
+        "avg_tokens": float(tokens.mean()),
+        "truncated": int((tokens > limit).sum()),
+        "chunk_ms": chunk_ms,
+        "embed_ms": embed_ms,
+        "hit_rate": hits / len(QUERIES)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the fixed and sentence chunkers")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20, help="chunking repetitions for timing")
+    args = parser.parse_args()
+
+    # Load the embedding model outside the timed runs
+    embed_text(["warm up"])
+
+    print(f"{len(DOCUMENTS)} documents, {len(QUERIES)} queries, model limit {settings.CHUNK_MAX_TOKENS} tokens\n")
+    print(f"{'chunker':<10} {'chunks':>7} {'avg tok':>8} {'>limit':>7} {'chunk ms':>9} {'embed ms':>9} {f'hit@{args.top_k}':>7}")
+    for strategy in ("fixed", "sentence"):
+        r = evaluate(strategy, args.top_k, args.repeat)
+        print(
+            f"{strategy:<10} {r['chunks']:>7} {r['avg_tokens']:>8.1f} {r['truncated']:>7} "
+            f"{r['chunk_ms']:>9.2f} {r['embed_ms']:>9.1f} {r['hit_rate']:>7.2f}"
+        )
+    print("\n'>limit' chunks are cut off by the embedding model; their tail text is never embedded.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Embedding Backend Benchmark
+Measures per-query and per-batch latency for the PyTorch and ONNX backends
+
+Usage:
+    python scripts/benchmark_embeddings.py [--runs 50] [--batch-size 32] [--quantization avx512_vnni]
+"""
+import sys
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.services.embedding_client import load_embedding_model
+
+QUERIES = [
+    "UPI fraud what to do",
+    "how to report 1930",
+    "lost phone block IMEI",
+    "fake loan app harassment",
+    "मेरे बैंक खाते से पैसे कट गए",
+    "என் மொபைல் தொலைந்துவிட்டது",
+]
+
+CHUNK = (
+    "For immediate financial fraud reporting (UPI fraud, credit card fraud), call 1930 immediately. "
+    "This connects to the Citizen Financial Cyber Fraud Reporting Management System (CFCFRMS). "
+    "Speed is critical to freeze the money. Alternatively, file a complaint at cybercrime.gov.in."
+)
+
+
+def time_ms(fn, runs: int) -> list:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def describe(samples: list) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1] if len(ordered) > 1 else ordered[0]
+    return f"p50 {statistics.median(ordered):8.2f} ms | p95 {p95:8.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding backends")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--quantization", default="avx512_vnni", help="int8 config to include ('' to skip)")
+    args = parser.parse_args()
+
+    backends = [("torch", ""), ("onnx", "")]
+    if args.quantization:
+        backends.append(("onnx", args.quantization))
+
+    batch = [CHUNK] * args.batch_size
+    print(f"{'backend':<24} {'single query':<36} {'batch of ' + str(args.batch_size):<36} {'chunks/sec':>10}")
+    for backend, quantization in backends:
+        label = f"{backend} {quantization or 'fp32'}"
+        model = load_embedding_model(backend, quantization)
+
+        # Warm-up so lazy initialisation is not measured
+        model.encode(QUERIES, convert_to_numpy=True)
+
+        query_samples = time_ms(lambda: model.encode([QUERIES[0]], convert_to_numpy=True), args.runs)
+        batch_samples = time_ms(lambda: model.encode(batch, convert_to_numpy=True), max(5, args.runs // 5))
+        throughput = args.batch_size / (statistics.median(batch_samples) / 1000)
+        print(f"{label:<24} {describe(query_samples):<36} {describe(batch_samples):<36} {throughput:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
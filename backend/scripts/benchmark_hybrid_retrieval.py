@@ -0,0 +1,160 @@
+"""
+Hybrid Retrieval Benchmark
+Compares dense-only retrieval with BM25 and with dense + BM25 fused by
+reciprocal rank fusion: recall@k on labelled queries (semantic questions and
+the exact tokens users type, like "1930", "CEIR", "UTR") and per-query latency
+
+The advisories from benchmark_chunker.py are mixed with synthetic look-alike
+advisories, and dense search is exact cosine in memory, so neither Chroma
+nor the database is needed.
+
+Usage:
+    python scripts/benchmark_hybrid_retrieval.py [--top-k 5] [--distractors 300] [--runs 50]
+"""
+import sys
+import argparse
+import random
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.config import settings
+from app.services.chunker import chunk_text
+from app.services.embedding_client import embed_query, embed_text
+from app.services.lexical_index import LexicalIndex, reciprocal_rank_fusion
+
+from benchmark_chunker import DOCUMENTS, QUERIES
+
+# Topical filler: close to the real advisories in meaning, without their specifics
+DISTRACTOR_PHRASES = [
+    "Cyber fraudsters keep changing their methods, so stay alert while banking online.",
+    "Report suspicious calls and messages to the authorities as early as possible.",
+    "Keep your phone's software updated and install apps only from official stores.",
+    "Banks never ask customers for passwords or PINs over a call.",
+    "Victims of online fraud should preserve all evidence before filing a complaint.",
+    "Lost devices can expose personal data, so use a screen lock and remote wipe.",
+    "Mobile numbers linked to your bank account receive alerts for every transaction.",
+    "Call the helpline 1930 for financial fraud and keep your complaint number.",
+    "Fake customer care numbers found through search engines are a common trap.",
+    "Use strong, unique passwords and turn on two-factor authentication.",
+    "Malware can arrive through email attachments and pirated software.",
+    "Police cyber cells investigate complaints registered on the national portal.",
+]
+
+# (query, document, phrase the retrieved chunk must contain): exact-token lookups
+EXACT_QUERIES = [
+    ("1930", "financial", "helpline 1930"),
+    ("CEIR", "lost_phone", "Central Equipment Identity Register"),
+    ("UTR", "financial", "(UTR)"),
+    ("TAFCOP", "sim_check", "TAFCOP portal"),
+    ("IMEI block", "lost_phone", "blocks a phone's IMEI"),
+    ("incident@cert-in.org.in", "ransomware", "incident@cert-in.org.in"),
+    ("Un-Block Found Mobile", "lost_phone", "Un-Block Found Mobile"),
+    ("RBI zero liability", "financial", "zero liability"),
+]
+
+
+def build_corpus(distractors: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    corpus = [(name, chunk) for name, text in DOCUMENTS.items() for chunk in chunk_text(text)]
+    for i in range(distractors):
+        text = " ".join(rng.choice(DISTRACTOR_PHRASES) for _ in range(rng.randint(4, 12)))
+        corpus.extend((f"distractor_{i}", chunk) for chunk in chunk_text(text))
+    return corpus
+
+
+def percentiles(samples: list) -> tuple:
+    samples = sorted(samples)
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    return statistics.median(samples), p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare dense, BM25 and hybrid retrieval")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--distractors", type=int, default=300, help="synthetic look-alike advisories")
+    parser.add_argument("--candidates", type=int, default=settings.RETRIEVAL_CANDIDATES, help="hits per retriever before fusion")
+    parser.add_argument("--runs", type=int, default=50, help="timed repetitions per query")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.distractors)
+    ids = [str(i) for i in range(len(corpus))]
+    texts = [chunk for _, chunk in corpus]
+
+    start = time.perf_counter()
+    embeddings = embed_text(texts, normalize=True)
+    embed_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = LexicalIndex()
+    index.upsert(ids, texts, [{} for _ in texts])
+    index_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{len(corpus)} chunks ({len(DOCUMENTS)} advisories + {args.distractors} distractors)")
+    print(f"Embedded in {embed_s:.1f} s, BM25 index built in {index_ms:.1f} ms ({index.stats()['terms']} terms)\n")
+
+    def dense(query_embedding, n):
+        scores = embeddings @ query_embedding
+        return [ids[i] for i in np.argsort(-scores)[:n]]
+
+    def lexical(query, n):
+        return [chunk_id for chunk_id, _ in index.search(query, n)]
+
+    def hybrid(query, query_embedding, n):
+        fused = reciprocal_rank_fusion([dense(query_embedding, args.candidates), lexical(query, args.candidates)], k=settings.RRF_K)
+        return [chunk_id for chunk_id, _ in fused[:n]]
+
+    def relevant(chunk_ids, doc_name, phrase):
+        return any(corpus[int(i)][0] == doc_name and phrase in corpus[int(i)][1] for i in chunk_ids)
+
+    query_sets = {"semantic": QUERIES, "exact token": EXACT_QUERIES}
+    hits = {mode: {name: 0 for name in query_sets} for mode in ("dense", "bm25", "hybrid")}
+    timings = {"embed query": [], "dense search": [], "bm25 search": [], "rrf fusion": []}
+
+    for set_name, queries in query_sets.items():
+        for query, doc_name, phrase in queries:
+            query_embedding = embed_query(query, normalize=True)
+            hits["dense"][set_name] += relevant(dense(query_embedding, args.top_k), doc_name, phrase)
+            hits["bm25"][set_name] += relevant(lexical(query, args.top_k), doc_name, phrase)
+            hits["hybrid"][set_name] += relevant(hybrid(query, query_embedding, args.top_k), doc_name, phrase)
+
+            for _ in range(args.runs):
+                t0 = time.perf_counter()
+                embed_text([query], normalize=True)  # uncached, as for a new question
+                t1 = time.perf_counter()
+                dense_ids = dense(query_embedding, args.candidates)
+                t2 = time.perf_counter()
+                lexical_ids = lexical(query, args.candidates)
+                t3 = time.perf_counter()
+                reciprocal_rank_fusion([dense_ids, lexical_ids], k=settings.RRF_K)
+                t4 = time.perf_counter()
+                timings["embed query"].append((t1 - t0) * 1000)
+                timings["dense search"].append((t2 - t1) * 1000)
+                timings["bm25 search"].append((t3 - t2) * 1000)
+                timings["rrf fusion"].append((t4 - t3) * 1000)
+
+    total = sum(len(queries) for queries in query_sets.values())
+    print(f"{'retrieval':<10} {'semantic':>10} {'exact token':>12} {f'recall@{args.top_k}':>10}")
+    for mode, by_set in hits.items():
+        print(
+            f"{mode:<10} {by_set['semantic'] / len(QUERIES):>10.2f} "
+            f"{by_set['exact token'] / len(EXACT_QUERIES):>12.2f} {sum(by_set.values()) / total:>10.2f}"
+        )
+
+    print(f"\n{'stage':<14} {'p50 ms':>9} {'p95 ms':>9}")
+    for stage, samples in timings.items():
+        p50, p95 = percentiles(samples)
+        print(f"{stage:<14} {p50:>9.3f} {p95:>9.3f}")
+    dense_total = [e + d for e, d in zip(timings["embed query"], timings["dense search"])]
+    hybrid_total = [sum(parts) for parts in zip(*timings.values())]
+    print(f"\nPer query p50: dense-only {percentiles(dense_total)[0]:.3f} ms, hybrid {percentiles(hybrid_total)[0]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
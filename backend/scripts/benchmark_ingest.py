@@ -0,0 +1,98 @@
+"""
+Ingestion Throughput Benchmark
+Compares one-document-at-a-time ingestion with the cross-document batched pipeline
+
+Uses synthetic advisories and throw-away Chroma collections in a temporary
+directory, so the real index and database are not touched.
+
+Usage:
+    python scripts/benchmark_ingest.py [--documents 500] [--embed-batch 256]
+"""
+import sys
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import chromadb
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.services.embedding_client import embed_text
+from app.services.ingest import chroma_max_batch_size, chunk_text, ingest_document, ingest_documents
+
+PHRASES = [
+    "Report the fraud on https://cybercrime.gov.in or call 1930 immediately.",
+    "Do not share OTPs, UPI PINs or card details with anyone claiming to be from your bank.",
+    "Keep screenshots of the chat, the transaction id (UTR) and the fraudster's number as evidence.",
+    "Block a lost or stolen phone's IMEI on the CEIR portal after filing a police complaint.",
+    "Check the mobile connections registered in your name on the TAFCOP portal.",
+    "Disconnect an infected computer from the network and report ransomware to CERT-In.",
+    "Never install screen sharing apps at the request of unknown callers.",
+    "Verify job offers and investment schemes before paying any registration fee.",
+]
+
+
+def synthetic_documents(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    docs = []
+    for i in range(count):
+        # 1-6 KB per advisory, like scraped pages
+        content = " ".join(rng.choice(PHRASES) for _ in range(rng.randint(12, 80)))
+        docs.append(SimpleNamespace(
+            id=i + 1, source="Benchmark", title=f"Advisory {i + 1}", section="", url="", content=content
+        ))
+    return docs
+
+
+def run(label: str, ingest, total_chunks: int) -> float:
+    start = time.perf_counter()
+    ingest()
+    elapsed = time.perf_counter() - start
+    rate = total_chunks / elapsed
+    print(f"{label:<36} {elapsed:8.2f} s | {rate:9.1f} chunks/sec")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark document ingestion throughput")
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--embed-batch", type=int, default=256)
+    args = parser.parse_args()
+
+    docs = synthetic_documents(args.documents)
+    total_chunks = sum(len(chunk_text(doc.content)) for doc in docs)
+    print(f"{len(docs)} documents, {total_chunks} chunks\n")
+
+    # Load the embedding model outside the timed runs
+    embed_text(["warm up"])
+
+    tmp_dir = tempfile.mkdtemp(prefix="ingest-bench-")
+    try:
+        client = chromadb.PersistentClient(path=tmp_dir)
+        write_batch = chroma_max_batch_size(client)
+
+        per_doc = client.create_collection("per_document")
+        baseline = run("per document (ingest_document)", lambda: [ingest_document(doc, collection=per_doc) for doc in docs], total_chunks)
+
+        batched = client.create_collection("batched")
+        pipelined = run(
+            f"batched (embed {args.embed_batch}, write {write_batch})",
+            lambda: ingest_documents(docs, collection=batched, embed_batch_size=args.embed_batch, write_batch_size=write_batch),
+            total_chunks
+        )
+
+        refresh = run("re-ingest unchanged (batched)", lambda: ingest_documents(docs, collection=batched, write_batch_size=write_batch), total_chunks)
+
+        print(f"\nSpeed-up: {pipelined / baseline:.2f}x (unchanged refresh: {refresh / baseline:.1f}x)")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Prompt Prefix Benchmark
+Compares Ollama prompt evaluation for the old single-string prompt against
+the stable system message + per-request user message layout
+
+Needs a running Ollama (LLM_ENDPOINT). Retrieved chunks are synthetic, so
+the vector store is not required.
+
+Usage:
+    python scripts/benchmark_prompt_prefix.py [--requests 10] [--language English]
+"""
+import sys
+import argparse
+import statistics
+from pathlib import Path
+
+import httpx
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.config import settings
+from app.services.llm_client import _ollama_payload
+from app.services.rag import build_system_prompt, build_user_prompt
+
+QUERIES = [
+    ("I lost 20000 rupees in a UPI scam, what should I do?", ""),
+    ("Is this message genuine?", "Dear customer, your KYC has expired. Click http://bit.ly/kyc-upd to avoid account block within 24 hours."),
+    ("How do I report a fake loan app harassing me?", ""),
+    ("Check this", "Congratulations! You have won Rs 25,00,000 in the KBC lottery. Pay Rs 5000 processing fee to claim."),
+    ("Someone hacked my Instagram account", ""),
+    ("My SIM card stopped working suddenly and I got bank OTPs", ""),
+]
+
+FRAUD_PERSONA = "You are an expert Cyber Fraud Analyst. The user has uploaded an image which you must analyze for scams, fraud, or phishing."
+
+
+def fake_chunks(i: int) -> list:
+    return [
+        {
+            "content": f"Official guidance #{i}.{n}: report the incident on https://cybercrime.gov.in or call 1930 within the golden hour. "
+                       "Keep screenshots, transaction ids and the fraudster's phone number as evidence. " * 3,
+            "metadata": {"source": "https://cybercrime.gov.in", "title": "Citizen Manual", "section": f"Step {n}"}
+        }
+        for n in range(1, 4)
+    ]
+
+
+def legacy_payload(query: str, chunks: list, language: str, extra_context: str) -> dict:
+    """What the client sent before: one /api/generate prompt whose first tokens varied per request"""
+    system = build_system_prompt(language)
+    if extra_context:
+        system = FRAUD_PERSONA + system[system.index("\n"):]
+    prompt = f"{system}\n\n{build_user_prompt(query, chunks, language, extra_context)}"
+    if language.lower() not in ["english", "en"]:
+        prompt = f"[SYSTEM: Respond strictly in {language} language.]\n\n{prompt}"
+    return {"model": settings.LLM_MODEL, "prompt": prompt, "stream": False, "options": {"temperature": 0.2, "num_predict": 1}}
+
+
+def prefix_payload(query: str, chunks: list, language: str, extra_context: str) -> dict:
+    """Stable system message first, only the context and query change"""
+    return _ollama_payload(
+        build_user_prompt(query, chunks, language, extra_context),
+        temperature=0.2, max_tokens=1, language=language, stream=False,
+        system=build_system_prompt(language)
+    )
+
+
+def run(client: httpx.Client, label: str, path: str, build, requests: int, language: str):
+    samples = []
+    for i in range(requests + 1):
+        query, extra = QUERIES[i % len(QUERIES)]
+        response = client.post(f"{settings.LLM_ENDPOINT}{path}", json=build(query, fake_chunks(i), language, extra))
+        response.raise_for_status()
+        result = response.json()
+        if i == 0:
+            continue  # first request loads the model and fills the cache
+        samples.append((result.get("prompt_eval_count", 0), result.get("prompt_eval_duration", 0) / 1e6))
+
+    tokens = statistics.mean(t for t, _ in samples)
+    ms = statistics.mean(d for _, d in samples)
+    print(f"{label:<28} prompt tokens evaluated {tokens:8.1f} | prompt eval {ms:9.1f} ms/request")
+    return ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Ollama prompt prefix reuse")
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--language", default="English")
+    args = parser.parse_args()
+
+    print(f"Model: {settings.LLM_MODEL} at {settings.LLM_ENDPOINT}, {args.requests} requests per layout\n")
+    with httpx.Client(timeout=settings.OLLAMA_READ_TIMEOUT) as client:
+        legacy_ms = run(client, "single prompt (/api/generate)", "/api/generate", legacy_payload, args.requests, args.language)
+        prefix_ms = run(client, "system prefix (/api/chat)", "/api/chat", prefix_payload, args.requests, args.language)
+
+    print(f"\nPrompt eval time saved per request: {legacy_ms - prefix_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Retrieval Hot-Path Benchmark
+Measures what collection.count() used to add to every retrieval
+
+Usage:
+    python scripts/benchmark_retrieval.py [--runs 200]
+"""
+import sys
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.services.embedding_client import embed_query
+from app.services.rag import get_collection, get_collection_count
+
+
+def time_ms(fn, runs: int) -> list:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)
+
+
+def report(label: str, samples: list):
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    print(f"{label:<40} p50 {statistics.median(samples):8.3f} ms | p95 {p95:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the retrieval hot path")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--query", default="UPI fraud what to do")
+    args = parser.parse_args()
+
+    collection = get_collection()
+    count = get_collection_count(force_refresh=True)
+    if count == 0:
+        print("Collection is empty. Run the ingestion scripts first.")
+        return
+    print(f"Collection size: {count} chunks, {args.runs} runs\n")
+
+    query_embedding = embed_query(args.query)[None, :]
+
+    def search(n_results):
+        return collection.query(
+            query_embeddings=query_embedding,
+            n_results=n_results,
+            include=["documents", "metadatas", "distances"]
+        )
+
+    def count_then_search():
+        n = collection.count()
+        search(min(5, n))
+
+    def tracked_count_then_search():
+        search(min(5, get_collection_count()))
+
+    report("collection.count() alone", time_ms(collection.count, args.runs))
+    report("get_collection_count() alone", time_ms(get_collection_count, args.runs))
+    before = time_ms(count_then_search, args.runs)
+    after = time_ms(tracked_count_then_search, args.runs)
+    report("count() + query (previous)", before)
+    report("tracked count + query (current)", after)
+    print(f"\nSaved per query (p50): {statistics.median(before) - statistics.median(after):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
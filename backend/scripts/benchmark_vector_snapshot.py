@@ -0,0 +1,147 @@
+"""
+Vector Snapshot Benchmark
+Compares exact search over the memory-mapped vector snapshot with a Chroma
+(HNSW) query at several corpus sizes: load time, per-query latency and
+Chroma's recall@k against the exact result, unfiltered and with a topic
+filter like the one intent filtering adds
+
+Uses synthetic clustered embeddings in a temporary directory, so the real
+index is not touched. Building a Chroma collection of a million chunks takes
+a long time; sizes above --chroma-max are measured for the snapshot only.
+
+Usage:
+    python scripts/benchmark_vector_snapshot.py [--sizes 10000,100000,1000000] [--chroma-max 100000]
+
+"+filter" rows search only chunks whose topic is in FILTERS.
+"""
+import sys
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.services.vector_snapshot import VectorSnapshot, write_snapshot
+
+TOPICS = ["financial_fraud", "identity_theft", "social_media", "cyber_bullying", "hacking", "ransomware", "job_scam", "general"]
+# Matches about a quarter of the chunks
+FILTERS = {"topic": ["financial_fraud", "general"]}
+
+
+def synthetic_embeddings(count: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    # Clustered like real sentence embeddings rather than uniform noise
+    centers = rng.standard_normal((256, dim), dtype=np.float32)
+    embeddings = np.empty((count, dim), dtype=np.float32)
+    for start in range(0, count, 100_000):
+        end = min(count, start + 100_000)
+        labels = rng.integers(0, len(centers), end - start)
+        embeddings[start:end] = centers[labels] + 0.6 * rng.standard_normal((end - start, dim), dtype=np.float32)
+    return embeddings
+
+
+def percentiles(samples: list) -> tuple:
+    samples = sorted(samples)
+    return statistics.median(samples), samples[max(0, int(len(samples) * 0.95) - 1)]
+
+
+def chunk_metadata(i: int) -> dict:
+    return {"doc_id": i, "topic": TOPICS[i % len(TOPICS)]}
+
+
+def bench_snapshot(directory: str, queries: np.ndarray, top_k: int, filters: dict = None) -> tuple:
+    start = time.perf_counter()
+    snapshot = VectorSnapshot(directory)
+    load_ms = (time.perf_counter() - start) * 1000
+    results, samples = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = snapshot.search(query, top_k, filters)
+        samples.append((time.perf_counter() - start) * 1000)
+        results.append([hit["id"] for hit in hits])
+    return load_ms, samples, results
+
+
+def bench_chroma(directory: str, ids: list, embeddings: np.ndarray, queries: np.ndarray, top_k: int) -> tuple:
+    """Build a collection and query it unfiltered and filtered; returns the build time and both runs"""
+    import chromadb
+
+    client = chromadb.PersistentClient(path=directory)
+    collection = client.create_collection("bench")
+    batch = client.get_max_batch_size()
+    start = time.perf_counter()
+    for i in range(0, len(ids), batch):
+        collection.add(
+            ids=ids[i:i + batch],
+            embeddings=embeddings[i:i + batch],
+            documents=[f"chunk {j}" for j in range(i, min(len(ids), i + batch))],
+            metadatas=[chunk_metadata(j) for j in range(i, min(len(ids), i + batch))]
+        )
+    build_s = time.perf_counter() - start
+    runs = []
+    for where in (None, {"topic": {"$in": FILTERS["topic"]}}):
+        results, samples = [], []
+        for query in queries:
+            start = time.perf_counter()
+            hits = collection.query(query_embeddings=query[np.newaxis, :], n_results=top_k, where=where, include=["documents", "metadatas", "distances"])
+            samples.append((time.perf_counter() - start) * 1000)
+            results.append(hits["ids"][0])
+        runs.append((samples, results))
+    return build_s, runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vector snapshot against Chroma")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="comma-separated chunk counts")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--chroma-max", type=int, default=100000, help="largest size also loaded into Chroma")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    print(f"dim {args.dim}, {args.queries} queries, top-{args.top_k}\n")
+    print(f"{'chunks':>9} {'engine':<9} {'build/load':>12} {'p50 ms':>9} {'p95 ms':>9} {f'recall@{args.top_k}':>10}")
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        embeddings = synthetic_embeddings(size, args.dim, rng)
+        ids = [f"c{i}" for i in range(size)]
+        picks = rng.integers(0, size, args.queries)
+        queries = embeddings[picks] + 0.3 * rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+
+        tmp_dir = tempfile.mkdtemp(prefix="snapshot-bench-")
+        try:
+            start = time.perf_counter()
+            path = write_snapshot(tmp_dir, ids, embeddings, [f"chunk {i}" for i in range(size)], [chunk_metadata(i) for i in range(size)])
+            write_s = time.perf_counter() - start
+            load_ms, samples, exact = bench_snapshot(path, queries, args.top_k)
+            p50, p95 = percentiles(samples)
+            print(f"{size:>9} {'snapshot':<9} {f'{write_s:.1f}s/{load_ms:.0f}ms':>12} {p50:>9.3f} {p95:>9.3f} {1.0:>10.3f}")
+            _, samples, exact_filtered = bench_snapshot(path, queries, args.top_k, FILTERS)
+            p50, p95 = percentiles(samples)
+            print(f"{size:>9} {'+filter':<9} {'':>12} {p50:>9.3f} {p95:>9.3f} {1.0:>10.3f}")
+
+            if size <= args.chroma_max:
+                build_s, runs = bench_chroma(f"{tmp_dir}/chroma", ids, embeddings, queries, args.top_k)
+                for label, (samples, approx), expected in zip(("chroma", "+filter"), runs, (exact, exact_filtered)):
+                    recall = np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(approx, expected)])
+                    p50, p95 = percentiles(samples)
+                    load = f"{build_s:.1f}s" if label == "chroma" else ""
+                    print(f"{size:>9} {label:<9} {load:>12} {p50:>9.3f} {p95:>9.3f} {recall:>10.3f}")
+            else:
+                print(f"{size:>9} {'chroma':<9} {'skipped (--chroma-max)':>12}")
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        del embeddings
+
+    print(f"\nSnapshot memory: {args.dim * 4} bytes per chunk (memory-mapped, shared between worker processes).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Re-index Documents
+Runs every stored document through the incremental ingest, so chunks pick up
+metadata added since they were indexed (category, language, topic) and the
+current chunker. Unchanged chunks are skipped and stored embeddings reused.
+
+Usage:
+    python scripts/reindex_documents.py [--source CEIR]
+"""
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models import Document
+from app.services.ingest import ingest_documents
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-ingest stored documents into ChromaDB")
+    parser.add_argument("--source", help="only documents from this source")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        query = db.query(Document).order_by(Document.id)
+        if args.source:
+            query = query.filter(Document.source == args.source)
+        stats = ingest_documents(query.yield_per(settings.INGEST_SQL_BATCH_SIZE))
+    finally:
+        db.close()
+
+    logger.info(
+        f"Re-indexed {stats['documents']} documents: {stats['added']} added, {stats['updated']} updated, "
+        f"{stats['removed']} removed, {stats['unchanged']} unchanged chunks ({stats['embedded']} embedded)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,15 @@
 import sys
+import asyncio
 from pathlib import Path
-import requests
-from bs4 import BeautifulSoup
 import logging
-import time
-import urllib3
 
 # Add backend directory to path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
+from app.config import settings
 from app.db import SessionLocal
 from app.models import Document
+from app.services.crawler import ValidatorCache, crawl, extract_text
 from app.services.ingest import ingest_document
 
 logging.basicConfig(level=logging.INFO)
@@ -45,69 +44,76 @@ URLS_TO_SCRAPE = [
     }
 ]
 
-def scrape_url(url: str) -> str:
-    try:
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=30, verify=False)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-            
-        text = soup.get_text()
-        
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        
-        return text
-    except Exception as e:
-        logger.error(f"Error scraping {url}: {e}")
-        return ""
-
 def main():
+    cache = ValidatorCache(settings.CRAWLER_CACHE_PATH)
+    cache.load()
     db = SessionLocal()
+    totals = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0, "embedded": 0}
     try:
+        existing_docs = {doc.source: doc for doc in db.query(Document).filter(Document.source.in_([item['source'] for item in URLS_TO_SCRAPE]))}
+        # Pages whose document is missing must be downloaded in full, even if unchanged upstream
+        force_urls = [item['url'] for item in URLS_TO_SCRAPE if item['source'] not in existing_docs]
+        
+        results = {r['url']: r for r in asyncio.run(crawl([item['url'] for item in URLS_TO_SCRAPE], cache, force_urls))}
+        
+        texts = {}
+        failed_urls = set()
         for item in URLS_TO_SCRAPE:
-            logger.info(f"Scraping {item['url']}...")
-            content = scrape_url(item['url'])
+            result = results[item['url']]
+            if result['status'] == "unchanged":
+                logger.info(f"{item['url']} unchanged. Skipping {item['source']}.")
+                continue
+            if result['status'] == "error":
+                failed_urls.add(item['url'])
+                continue
+            
+            # Parse each changed page once, even when several sources share it
+            if item['url'] not in texts:
+                texts[item['url']] = extract_text(result['html'])
+            content = texts[item['url']]
             
             if content:
-                logger.info(f"Extracted {len(content)} chars. Indexing...")
+                logger.info(f"Extracted {len(content)} chars from {item['url']}. Indexing...")
                 
                 # Check for existing
-                existing = db.query(Document).filter(Document.source == item['source']).first()
+                existing = existing_docs.get(item['source'])
                 if existing:
                     logger.info("Updating existing document...")
-                    # In real app, we might update. Here we skip or update content.
                     existing.content = content
                     db.commit()
-                    # Re-ingest chunks? Skipping for speed in this demo
-                    continue
-
-                doc = Document(
-                    source=item['source'],
-                    url=item['url'],
-                    category=item['category'],
-                    content=content,
-                    title=f"Scraped content from {item['source']}"
-                )
-                db.add(doc)
-                db.commit()
-                db.refresh(doc)
-                
-                ingest_document(doc)
+                    # Incremental: only new/changed chunks are embedded, vanished ones are deleted
+                    stats = ingest_document(existing)
+                else:
+                    doc = Document(
+                        source=item['source'],
+                        url=item['url'],
+                        category=item['category'],
+                        content=content,
+                        title=f"Scraped content from {item['source']}"
+                    )
+                    db.add(doc)
+                    db.commit()
+                    db.refresh(doc)
+                    existing_docs[item['source']] = doc
+                    
+                    stats = ingest_document(doc)
                 
+                if stats:
+                    for key in totals:
+                        totals[key] += stats[key]
+                else:
+                    failed_urls.add(item['url'])
             else:
                 logger.warning(f"No content found for {item['url']}")
-            
-            time.sleep(1) 
+        
+        # Validators are kept for pages that were fully processed or unchanged
+        cache.record_results(results.values(), skip=failed_urls)
+        cache.save()
+        
+        logger.info(
+            f"Index refresh: {totals['added']} added, {totals['updated']} updated, {totals['removed']} removed, "
+            f"{totals['unchanged']} unchanged chunks ({totals['embedded']} embedded)"
+        )
             
     except Exception as e:
         logger.error(f"Global error: {e}")
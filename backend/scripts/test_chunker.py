@@ -0,0 +1,64 @@
+"""
+Chunker Test
+Checks sentence splitting (abbreviations, danda, numbered steps) and that
+every chunk fits the embedding model's token limit, long unbroken words included
+
+Usage:
+    python scripts/test_chunker.py
+"""
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.config import settings
+from app.services.chunker import chunk_text, count_embedding_tokens, split_sentences
+
+SPLITS = [
+    ("Pay Rs. 500 now. Then call 1930.", ["Pay Rs. 500 now.", "Then call 1930."]),
+    ("Use a trusted app, e.g. BHIM. Never share the OTP, i.e. the one-time code.",
+     ["Use a trusted app, e.g. BHIM.", "Never share the OTP, i.e. the one-time code."]),
+    ("Quote FIR No. 12 under Sec. 66C. Keep a copy.", ["Quote FIR No. 12 under Sec. 66C.", "Keep a copy."]),
+    ("Dr. Rao and Mr. Shah were informed. Case closed.", ["Dr. Rao and Mr. Shah were informed.", "Case closed."]),
+    ("Was the money returned? The answer is no. Report again.", ["Was the money returned?", "The answer is no.", "Report again."]),
+    ("पैसे कट गए हैं। 1930 पर कॉल करें॥ Report online", ["पैसे कट गए हैं।", "1930 पर कॉल करें॥", "Report online"]),
+    ("1. Open the portal 2. Enter the UTR. 3) Submit", ["1. Open the portal", "2. Enter the UTR.", "3) Submit"]),
+]
+
+LONG_TEXTS = {
+    "one 5000-char word": "x" * 5000,
+    "URL without spaces": "Visit https://cybercrime.gov.in/" + "a1b2/" * 800 + " now.",
+    "UTR list without spaces": "UTRs " + ",".join(str(10 ** 11 + i) for i in range(400)),
+}
+
+
+def check(name: str, ok: bool) -> bool:
+    print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return ok
+
+
+def main():
+    results = []
+    for text, expected in SPLITS:
+        sentences = split_sentences(text)
+        ok = check(f"split: {text[:40]}", sentences == expected)
+        if not ok:
+            print(f"       got {sentences}")
+        results.append(ok)
+
+    budget = settings.CHUNK_MAX_TOKENS - 2  # [CLS]/[SEP]
+    for name, text in LONG_TEXTS.items():
+        chunks = chunk_text(text, strategy="sentence")
+        longest = max(count_embedding_tokens(chunks))
+        results.append(check(f"{name}: {len(chunks)} chunks, longest {longest} <= {budget} tokens", longest <= budget))
+        results.append(check(f"{name}: no characters lost", "".join(chunks).replace(" ", "") == text.replace(" ", "")))
+
+    if not all(results):
+        sys.exit(1)
+    print("All chunker checks passed.")
+
+
+if __name__ == "__main__":
+    main()
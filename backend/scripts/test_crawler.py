@@ -0,0 +1,180 @@
+"""
+Crawler Test
+Runs the knowledge crawler against a local HTTP fixture server and checks
+conditional requests, the validator cache and per-host concurrency
+
+Usage:
+    python scripts/test_crawler.py
+"""
+import sys
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.config import settings
+from app.services.crawler import ValidatorCache, crawl, extract_text
+
+LAST_MODIFIED = formatdate(time.time() - 3600, usegmt=True)
+PAGES = {
+    "/etag": '<html><body><h1>Report fraud</h1><p>Call 1930</p><script>var x = 1;</script></body></html>',
+    "/last-modified": "<html><body><p>Block a stolen phone on CEIR</p></body></html>",
+    "/plain": "<html><body><p>No validators on this page</p></body></html>",
+    # Same body, but the server rotates its ETag (fixture.etag_version)
+    "/rotating": "<html><body><p>Helpline 1930</p></body></html>",
+}
+PAGES.update({f"/slow/{i}": f"<html><body><p>Advisory {i}</p></body></html>" for i in range(6)})
+
+
+class FixtureState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.etag_version = 1
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    state: FixtureState = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        state = self.state
+        with state.lock:
+            state.active += 1
+            state.max_active = max(state.max_active, state.active)
+            state.requests.append((self.path, self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since")))
+        try:
+            if self.path.startswith("/slow/"):
+                time.sleep(0.1)
+            body = PAGES.get(self.path)
+            if body is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            etag = f'"{abs(hash(body))}"' if self.path != "/rotating" else f'"rot-{state.etag_version}"'
+            if self.path == "/rotating" and self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            if self.path == "/etag" and self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            if self.path == "/last-modified" and self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                self.send_response(304)
+                self.end_headers()
+                return
+
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            if self.path in ("/etag", "/rotating"):
+                self.send_header("ETag", etag)
+            if self.path == "/last-modified":
+                self.send_header("Last-Modified", LAST_MODIFIED)
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            with state.lock:
+                state.active -= 1
+
+
+def start_fixture():
+    state = FixtureState()
+    handler = type("Handler", (FixtureHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def check(name: str, ok: bool) -> bool:
+    print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return ok
+
+
+def main():
+    settings.CRAWLER_HOST_DELAY_SECONDS = 0
+    settings.CRAWLER_PER_HOST_CONCURRENCY = 2
+
+    server, state = start_fixture()
+    base = f"http://127.0.0.1:{server.server_port}"
+    urls = [f"{base}{path}" for path in ["/etag", "/last-modified", "/plain", "/etag", "/missing", "/rotating"]]
+    slow_urls = [f"{base}/slow/{i}" for i in range(6)]
+    cache_path = os.path.join(tempfile.mkdtemp(), "crawler_cache.json")
+    results = []
+
+    try:
+        # First run: everything is new
+        cache = ValidatorCache(cache_path)
+        first = {r["url"]: r for r in asyncio.run(crawl(urls, cache))}
+        results.append(check("duplicate URLs fetched once", len(first) == 5 and len(state.requests) == 5))
+        results.append(check("new pages reported as changed", all(first[u]["status"] == "changed" for u in urls[:3])))
+        results.append(check("fetch errors reported, not raised", first[urls[4]]["status"] == "error"))
+        text = extract_text(first[urls[0]]["html"])
+        results.append(check("scripts stripped from extracted text", "Call 1930" in text and "var x" not in text))
+
+        cache.record_results(first.values())
+        cache.save()
+
+        # Second run with the persisted cache: validators are sent, nothing needs parsing.
+        # The rotating page comes back in full with a new ETag but an identical body.
+        state.etag_version = 2
+        state.requests.clear()
+        cache = ValidatorCache(cache_path)
+        cache.load()
+        second = {r["url"]: r for r in asyncio.run(crawl(urls, cache))}
+        sent = {path: (inm, ims) for path, inm, ims in state.requests}
+        results.append(check("If-None-Match sent for ETag page", bool(sent["/etag"][0])))
+        results.append(check("If-Modified-Since sent for Last-Modified page", sent["/last-modified"][1] == LAST_MODIFIED))
+        results.append(check("unchanged pages skipped", all(second[u]["status"] == "unchanged" for u in urls[:3])))
+        results.append(check("unchanged pages carry no HTML", all("html" not in second[u] for u in urls[:3])))
+        results.append(check("rotated-ETag page unchanged by body hash", second[urls[5]]["status"] == "unchanged"))
+
+        # Third run: the validators of unchanged pages were kept, so the new ETag is sent
+        cache.record_results(second.values())
+        cache.save()
+        state.requests.clear()
+        cache = ValidatorCache(cache_path)
+        cache.load()
+        third = {r["url"]: r for r in asyncio.run(crawl(urls, cache))}
+        sent = {path: (inm, ims) for path, inm, ims in state.requests}
+        results.append(check("new If-None-Match sent after an unchanged fetch", sent["/rotating"][0] == '"rot-2"'))
+        results.append(check("rotated-ETag page answered with 304", third[urls[5]]["status"] == "unchanged" and third[urls[5]]["validators"]["etag"] == '"rot-2"'))
+
+        # Forced URLs ignore validators
+        state.requests.clear()
+        forced = {r["url"]: r for r in asyncio.run(crawl(urls[:1], cache, force_urls=urls[:1]))}
+        results.append(check("forced URL fetched in full", forced[urls[0]]["status"] == "changed" and state.requests[0][1] is None))
+
+        # Per-host concurrency bound
+        state.max_active = 0
+        start = time.perf_counter()
+        asyncio.run(crawl(slow_urls, ValidatorCache()))
+        elapsed = time.perf_counter() - start
+        results.append(check(f"per-host concurrency <= 2 (max seen {state.max_active}, {elapsed:.2f}s)", state.max_active <= 2))
+    finally:
+        server.shutdown()
+
+    if not all(results):
+        sys.exit(1)
+    print("All crawler checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Embedding Backend Parity Test
+Checks that the ONNX Runtime backends produce the same vectors as PyTorch
+
+Usage:
+    python scripts/test_embedding_parity.py [--quantization avx512_vnni]
+"""
+import sys
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.services.embedding_client import load_embedding_model
+
+SAMPLE_TEXTS = [
+    "UPI fraud what to do",
+    "how to report 1930",
+    "My phone was stolen, how do I block the IMEI?",
+    "Someone is blackmailing me with my photos",
+    "मेरे बैंक खाते से पैसे कट गए, क्या करूँ?",
+    "என் மொபைல் தொலைந்துவிட்டது, எப்படி புகார் செய்வது?",
+    "To block a lost/stolen mobile: 1. File a police complaint and keep the FIR number. 2. Visit ceir.sancharsaathi.gov.in.",
+]
+
+# fp32 ONNX should be numerically identical; int8 quantization loses a little precision
+FP32_MIN_COSINE = 0.999
+INT8_MIN_COSINE = 0.97
+
+
+def cosine_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return np.sum(a * b, axis=1)
+
+
+def check(name: str, reference: np.ndarray, candidate: np.ndarray, threshold: float) -> bool:
+    cos = cosine_rows(reference, candidate)
+    ok = bool(cos.min() >= threshold)
+    status = "PASS" if ok else "FAIL"
+    print(f"[{status}] {name}: min cosine {cos.min():.5f}, mean {cos.mean():.5f} (threshold {threshold})")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ONNX embeddings against PyTorch")
+    parser.add_argument("--quantization", default="avx512_vnni", help="int8 config to test ('' to skip)")
+    args = parser.parse_args()
+
+    print("Encoding with PyTorch backend...")
+    reference = load_embedding_model("torch").encode(SAMPLE_TEXTS, convert_to_numpy=True)
+
+    print("Encoding with ONNX backend (fp32)...")
+    onnx_fp32 = load_embedding_model("onnx").encode(SAMPLE_TEXTS, convert_to_numpy=True)
+    results = [check("onnx fp32", reference, onnx_fp32, FP32_MIN_COSINE)]
+
+    if args.quantization:
+        print(f"Encoding with ONNX backend (int8, {args.quantization})...")
+        onnx_int8 = load_embedding_model("onnx", args.quantization).encode(SAMPLE_TEXTS, convert_to_numpy=True)
+        results.append(check(f"onnx int8 {args.quantization}", reference, onnx_int8, INT8_MIN_COSINE))
+
+    if not all(results):
+        sys.exit(1)
+    print("All backends within tolerance.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+KB Version Test
+Re-ingests a document from a separate process with edited text but the same
+chunk ids and count, and checks that this process notices it: the knowledge
+base version moves, cached answers stop matching and the lexical index is
+rebuilt (even before the next collection count refresh)
+
+Uses a temporary Chroma directory, so the real index is not touched.
+
+Usage:
+    python scripts/test_kb_version.py
+"""
+import sys
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.config import settings
+
+ORIGINAL = "Pay the registration fee of Rs 500 at the cyber cell counter"
+EDITED = "Pay the registration fee of Rs 900 at the district cyber cell"
+
+
+def check(name: str, ok: bool) -> bool:
+    print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return ok
+
+
+def ingest(text: str):
+    from app.services.ingest import ingest_documents
+    doc = SimpleNamespace(id=1, source="KB version test", title="Fees", section="", url="", category="", content=text)
+    ingest_documents([doc])
+
+
+def ingest_in_subprocess(chroma_dir: str, text: str):
+    # Another process, like scrape_and_index.py or reindex_documents.py
+    env = dict(os.environ, CHROMA_DIR=chroma_dir, RETRIEVAL_ENGINE="chroma")
+    subprocess.run([sys.executable, __file__, "--ingest", text], env=env, check=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check cross-process KB version invalidation")
+    parser.add_argument("--ingest", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.ingest is not None:
+        ingest(args.ingest)
+        return
+
+    chroma_dir = tempfile.mkdtemp(prefix="kb-version-test-")
+    settings.CHROMA_DIR = chroma_dir
+    settings.RETRIEVAL_ENGINE = "chroma"
+    from app.services import rag
+    from app.services.answer_cache import SemanticAnswerCache
+
+    results = []
+    try:
+        ingest_in_subprocess(chroma_dir, ORIGINAL)
+        count = rag.get_collection_count(force_refresh=True)
+        version = rag.get_kb_version()
+        index = rag.get_lexical_index()
+        chunk_ids = tuple(chunk_id for chunk_id, _ in index.search("registration fee", 5))
+
+        cache = SemanticAnswerCache()
+        embedding = np.ones(8, dtype=np.float32)
+        cache.store(embedding, "English", chunk_ids, version, [], "The fee is Rs 500.")
+        results.append(check("cached answer served before the edit", cache.lookup(embedding, "English", chunk_ids, version) is not None))
+
+        ingest_in_subprocess(chroma_dir, EDITED)
+        results.append(check("edit keeps the chunk count", rag.get_collection_count(force_refresh=True) == count))
+        new_version = rag.get_kb_version()
+        results.append(check("KB version moved after the out-of-process edit", new_version != version))
+        results.append(check("stale answer no longer served", cache.lookup(embedding, "English", chunk_ids, new_version) is None))
+
+        index = rag.get_lexical_index()
+        texts = " ".join(index.get(chunk_id)[0] for chunk_id in chunk_ids)
+        results.append(check("lexical index rebuilt with the edited text", "Rs 900" in texts and "Rs 500" not in texts))
+
+        # The lexical index re-checks the revision itself, without waiting for a count refresh
+        ingest_in_subprocess(chroma_dir, ORIGINAL)
+        index = rag.get_lexical_index()
+        texts = " ".join(index.get(chunk_id)[0] for chunk_id in chunk_ids)
+        results.append(check("lexical index notices the edit on its own", "Rs 500" in texts and "Rs 900" not in texts))
+
+        new_version = rag.get_kb_version()
+        ingest(EDITED)
+        results.append(check("in-process ingest moves the KB version", rag.get_kb_version() != new_version))
+        results.append(check("lexical index kept current in-process", rag.get_lexical_stats().get("current") is True))
+    finally:
+        shutil.rmtree(chroma_dir, ignore_errors=True)
+
+    if not all(results):
+        sys.exit(1)
+    print("All KB version checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 
 import sys
 import os
+import asyncio
 from pathlib import Path
 
 # Add backend directory to path
@@ -12,7 +13,7 @@ from app.services.llm_client import generate_response
 if __name__ == "__main__":
     print("Testing LLM connection...")
     try:
-        response = generate_response("Hello, are you ready for cybercrime assistance?")
+        response = asyncio.run(generate_response("Hello, are you ready for cybercrime assistance?"))
         print(f"LLM Response: {response}")
     except Exception as e:
         print(f"LLM Test Failed: {e}")
@@ -0,0 +1,103 @@
+"""
+Stream Abandon Stats Test
+Checks that only generations the client walked away from are counted as
+abandoned: upstream failures must not add to estimated_tokens_saved
+
+Usage:
+    python scripts/test_stream_abandon.py
+"""
+import sys
+import asyncio
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.config import settings
+from app.services import llm_client
+from app.services.llm_client import GenerationAbandoned, GenerationFailed, generate_streaming_response, get_abandon_stats
+
+
+def check(name: str, ok: bool) -> bool:
+    print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return ok
+
+
+async def consume(stream, limit: int = None) -> list:
+    tokens = []
+    async for token in stream:
+        tokens.append(token)
+        if limit is not None and len(tokens) >= limit:
+            break
+    await stream.aclose()
+    return tokens
+
+
+async def disconnected() -> bool:
+    return True
+
+
+async def run_checks() -> list:
+    results = []
+    settings.DISCONNECT_POLL_INTERVAL_MS = 0
+
+    # Ollama unreachable: a failure, not an abandon
+    settings.LLM_ENDPOINT = "http://127.0.0.1:1"
+    before = get_abandon_stats()
+    try:
+        await consume(generate_streaming_response("hello", max_tokens=4000))
+        raised = False
+    except GenerationFailed:
+        raised = True
+    after = get_abandon_stats()
+    results.append(check("unreachable Ollama raises GenerationFailed", raised))
+    results.append(check("failed generation counted as failed", after["failed_generations"] == before["failed_generations"] + 1))
+    results.append(check("failed generation is not abandoned", after["abandoned_generations"] == before["abandoned_generations"]))
+    results.append(check("failed generation saves no tokens", after["estimated_tokens_saved"] == before["estimated_tokens_saved"]))
+
+    async def fake_stream(*args):
+        for i in range(50):
+            yield f"t{i} "
+
+    original = llm_client._generate_stream
+    llm_client._generate_stream = fake_stream
+    try:
+        # Disconnect detected between tokens
+        before = get_abandon_stats()
+        try:
+            await consume(generate_streaming_response("hello", max_tokens=100, is_disconnected=disconnected))
+            raised = False
+        except GenerationAbandoned:
+            raised = True
+        after = get_abandon_stats()
+        results.append(check("disconnect raises GenerationAbandoned", raised))
+        results.append(check("disconnect counted as abandoned", after["abandoned_generations"] == before["abandoned_generations"] + 1))
+        results.append(check("disconnect saves the remaining tokens", after["estimated_tokens_saved"] == before["estimated_tokens_saved"] + 100))
+
+        # Response closed early (aclose after a few tokens)
+        before = get_abandon_stats()
+        await consume(generate_streaming_response("hello", max_tokens=100), limit=3)
+        after = get_abandon_stats()
+        results.append(check("closed stream counted as abandoned", after["abandoned_generations"] == before["abandoned_generations"] + 1))
+
+        # Completed stream
+        before = get_abandon_stats()
+        await consume(generate_streaming_response("hello", max_tokens=100))
+        after = get_abandon_stats()
+        results.append(check("completed stream counted as completed", after["completed_generations"] == before["completed_generations"] + 1
+                             and after["abandoned_generations"] == before["abandoned_generations"]))
+    finally:
+        llm_client._generate_stream = original
+    return results
+
+
+def main():
+    results = asyncio.run(run_checks())
+    if not all(results):
+        sys.exit(1)
+    print("All stream abandon checks passed.")
+
+
+if __name__ == "__main__":
+    main()